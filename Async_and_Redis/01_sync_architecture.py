@@ -130,9 +130,8 @@ def sync_slow_query_view():
 
     start = time.time()
     
-    orders = Order.objects.select_related('user').prefetch_related('items').annotate(
-        item_count = Count('items') # 복잡한 집계 쿼리
-    )[:50]
+    # item_count / items_total은 orders 컬럼 (market.order_totals) → JOIN + GROUP BY 집계 없음
+    orders = Order.objects.select_related('user').prefetch_related('items')[:50]
     
     order_list = list(orders) # # DB 응답 대기 중 - Worker는 이 시간 동안 점유 상태
     
@@ -333,7 +332,8 @@ def sync_best_practices():
         User.objects.only('id', 'username')
 
     ✅ 집계 쿼리 최적화
-        Product.objects.annotate(order_count=Count('orders'))
+        Product.objects.annotate(order_count=Count('items'))
+        목록마다 세는 값은 컬럼으로 비정규화 (Order.item_count, Order.items_total)
 
     ❌ 절대 금지
     - 반복문 안에서 쿼리
@@ -123,13 +123,20 @@ def sync_external_api_call():
     
     results = []
     
+    from market.api_log_writer import api_log_writer
+
     for url in urls:
+        called = time.time()
         try:
             # requests - 동기 라이브러리 
             response = requests.get(url, timeout=5)
+            status_code = response.status_code
             results.append(response.json())
         except:
             results.append({'error': 'timeout'})
+            status_code = 504
+        # 호출 로그는 큐에 넣기만 함 (DB 쓰기는 백그라운드에서 모아서)
+        api_log_writer.log(url, 'GET', status_code, time.time() - called)
             
     print(f"호출 결과:{results}")
     
@@ -159,12 +166,21 @@ async def async_external_api_call():
     ]
     
     
+    from market.api_log_writer import async_api_log_writer
+
+    writer = async_api_log_writer()
+
     async def fetch(session, url):
+        called = time.time()
+        status_code = 504
         try:
             async with session.get(url, timeout=5) as response:
+                status_code = response.status
                 return await response.json()
         except:
             return {'error': 'timeout'}
+        finally:
+            await writer.log(url, 'GET', status_code, time.time() - called)
     
     
     # aiohttp -> 비동기 라이브러리
@@ -177,6 +193,8 @@ async def async_external_api_call():
     
     print(f"비동기 방식: {elapsed:.2f}초") # 1.95초
     
+    await writer.aclose()  # 루프가 끝나기 전에 남은 로그를 씀
+    
     
    
 
@@ -404,6 +422,103 @@ Async 사용 가이드라인:
 
 
 
+print("async 뷰에서의 캐시")
+
+
+"""
+async 뷰에서 django.core.cache 사용 → ORM과 같은 문제
+
+    cache.get(key)                    → 이벤트 루프 블로킹
+    await sync_to_async(cache.get)()  → 스레드 이동 (thread_sensitive=True → 스레드 1개에 줄 서기)
+    await acache.aget(key)            → redis.asyncio로 루프 안에서 바로 대기 (market.async_cache)
+
+ORM과 달리 캐시는 네이티브 async 클라이언트가 있으므로 async의 이득을 그대로 얻을 수 있음.
+"""
+
+
+# ✅ async 뷰 + 네이티브 async 캐시
+async def product_detail_async(request, pk):
+    from market.async_cache import aget_product
+
+    product = await aget_product(pk)  # L1 → Redis(await) → 미스일 때만 ORM
+    if product is None:
+        return JsonResponse({'error': 'not found'}, status=404)
+    return JsonResponse(product)
+
+
+async def _measure_loop_lag(stop, interval=0.001):
+    """이벤트 루프가 얼마나 늦게 깨어나는지 (= 다른 요청이 기다린 시간)"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+def benchmark_async_cache(requests=2000, concurrency=100):
+    """sync_to_async(cache.get) vs cache.get(블로킹) vs acache.aget 처리량 / 루프 지연 비교"""
+    from django.core.cache import cache
+    from market.async_cache import acache
+
+    keys = [f'bench:async:{i}' for i in range(100)]
+    cache.set_many({key: {'id': i, 'name': f'상품 {i}', 'price': 1000.0 + i} for i, key in enumerate(keys)}, 60)
+
+    async def via_sync_to_async(key):
+        return await sync_to_async(cache.get)(key)
+
+    async def via_blocking(key):
+        return cache.get(key)  # ❌ 루프 안에서 동기 I/O
+
+    async def via_acache(key):
+        return await acache.aget(key)
+
+    async def run(get):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with semaphore:
+                return await get(keys[i % len(keys)])
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_measure_loop_lag(stop))
+        await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        lag = await lag_task
+        await acache.aclose()
+        assert all(result is not None for result in results)
+        return elapsed, lag
+
+    print(f"\n=== async 캐시 벤치마크 (요청 {requests}개, 동시 {concurrency}) ===")
+    for label, get in [
+        ('sync_to_async(cache.get)', via_sync_to_async),
+        ('cache.get (블로킹)', via_blocking),
+        ('acache.aget', via_acache),
+    ]:
+        elapsed, lag = asyncio.run(run(get))
+        print(f"  {label:<26} {requests / elapsed:>8.0f} req/s   최대 루프 지연 {lag * 1000:.2f} ms")
+
+    cache.delete_many(keys)
+
+    # (실제 Redis처럼 왕복마다 네트워크 대기가 있을 때)
+    # sync_to_async: 모든 호출이 한 스레드에 줄 서므로 처리량이 스레드 1개에 묶임
+    # 블로킹:        왕복 대기 동안 루프가 멈춤 → 다른 요청 지연 (루프 지연 최대)
+    # acache:        왕복 대기가 서로 겹침 → 처리량 최고, 루프는 계속 다른 요청 처리
+
+
+
+
+################################
+
+
+
+
+
 print("실전 권장사항")
 
 
@@ -475,4 +590,5 @@ def async_best_practices():
 if __name__ == "__main__": 
     sync_with_orm_blocking()
     asyncio.run(async_with_orm_blocking())
+    benchmark_async_cache()
     
\ No newline at end of file
@@ -1,3 +1,12 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+
+#################################
+
 
 import time
 from django.db import connection, reset_queries
@@ -149,3 +158,265 @@ def db_blocking_checklist():
 ✅ 배치 처리
    # 실시간이 필요 없는 통계는 주기적으로
     """)
+
+
+
+
+# ============================================================================
+# 일별 매출 집계 벤치마크 (market.sales_rollup)
+# ============================================================================
+
+def _generate_sales(scale, days=30):
+    """generate_dummy.py 기본값 × scale 만큼 주문 / 항목 생성 (하루치씩 → 메모리 고정)"""
+    import random
+    from datetime import timedelta
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from generate_dummy import ORDER_COUNT
+
+    users = list(User.objects.values_list('id', flat=True)[:1000])
+    products = list(Product.objects.values_list('id', 'price')[:5000])
+    today = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    per_day = ORDER_COUNT * scale // days
+    items = 0
+
+    for day in range(days):
+        orders = Order.objects.bulk_create(
+            [
+                Order(user_id=random.choice(users), total_amount=random.randint(50, 500),
+                      status=random.choice(['pending', 'processing', 'completed']))
+                for _ in range(per_day)
+            ],
+            batch_size=2000,
+        )
+        # created_at은 auto_now_add → 하루치를 한 번에 옮김
+        Order.objects.filter(pk__gte=orders[0].pk, pk__lte=orders[-1].pk).update(
+            created_at=today - timedelta(days=day))
+
+        lines = []
+        for order in orders:
+            for _ in range(random.randint(1, 5)):
+                product_id, price = random.choice(products)
+                lines.append(OrderItem(order_id=order.pk, product_id=product_id,
+                                       quantity=random.randint(1, 3), price=price))
+        OrderItem.objects.bulk_create(lines, batch_size=2000)
+        items += len(lines)
+
+    return per_day * days, items
+
+
+def benchmark_sales_rollup(scales=(10, 100), days=30, repeat=5):
+    """
+    기본값 10배 / 100배 데이터에서 백필 시간과 30일 매출 조회 시간 비교
+    (생성한 데이터는 트랜잭션 롤백으로 모두 버림)
+    """
+    from datetime import timedelta
+    from django.db import transaction
+    from django.db.models import DecimalField, F, Sum
+    from django.db.models.functions import TruncDate
+    from django.utils import timezone
+    from market import sales_rollup
+
+    if not Product.objects.exists() or not Order.objects.exists():
+        print("데이터가 없습니다. generate_dummy.py를 먼저 실행하세요.")
+        return
+
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    category = Product.objects.values_list('category', flat=True).first()
+
+    def scan():
+        # 이전 방식: 대시보드를 열 때마다 orders / order_items를 날짜별로 GROUP BY
+        lower = timezone.now() - timedelta(days=days)
+        totals = list(
+            Order.objects.filter(created_at__gte=lower)
+            .annotate(day=TruncDate('created_at')).values('day')
+            .annotate(orders=Count('id'), revenue=Sum('total_amount'))
+        )
+        by_category = list(
+            OrderItem.objects.filter(order__created_at__gte=lower, product__category=category)
+            .annotate(day=TruncDate('order__created_at')).values('day')
+            .annotate(revenue=Sum(F('price') * F('quantity'), output_field=DecimalField()))
+        )
+        return totals, by_category
+
+    def rollup():
+        return sales_rollup.daily_sales(start, end), sales_rollup.daily_sales(start, end, category=category)
+
+    def measure(func):
+        began = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - began) / repeat * 1000
+
+    print(f"\n[벤치마크] 최근 {days}일 일별 매출 (전체 + '{category}' 카테고리)")
+
+    for scale in scales:
+        with transaction.atomic():
+            with sales_rollup.suspended():
+                orders, items = _generate_sales(scale, days)
+
+            began = time.perf_counter()
+            rows = sales_rollup.backfill(start, end, chunk_days=7)
+            backfill_seconds = time.perf_counter() - began
+
+            print(f"\n  ×{scale}: 주문 {orders:,} / 항목 {items:,}")
+            print(f"    백필 (7일 단위):  {backfill_seconds:.2f}초, 집계 {rows:,}행")
+            print(f"    전체 스캔 조회:   {measure(scan):.1f}ms")
+            print(f"    집계 테이블 조회: {measure(rollup):.1f}ms  (하루 1행 × {days}일)")
+
+            transaction.set_rollback(True)
+
+
+def benchmark_bulk_order(sizes=(1, 5, 10, 20), repeat=5):
+    """
+    장바구니 크기별 주문 1건의 쿼리 수 / 시간 비교 (market.checkout)
+    (생성한 주문과 차감한 재고는 트랜잭션 롤백으로 모두 버림)
+    """
+    from decimal import Decimal
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from django.test.utils import CaptureQueriesContext
+    from market.checkout import place_order
+
+    user = User.objects.first()
+    product_ids = list(Product.objects.order_by('id').values_list('id', flat=True)[:max(sizes)])
+    if user is None or not product_ids:
+        print("데이터가 없습니다. generate_dummy.py를 먼저 실행하세요.")
+        return
+
+    def place_one_by_one(cart):
+        # 이전 방식: 상품마다 읽고-수정-쓰기 + 항목 INSERT
+        order = Order.objects.create(user=user, total_amount=0)
+        total = Decimal(0)
+        for product_id, quantity in cart.items():
+            product = Product.objects.get(pk=product_id)
+            if product.stock < quantity:
+                raise ValueError('재고 부족')
+            product.stock -= quantity
+            product.save()
+            OrderItem.objects.create(order=order, product=product, quantity=quantity, price=product.price)
+            total += product.price * quantity
+        order.total_amount = total
+        order.save()
+
+    def measure(func, cart):
+        with CaptureQueriesContext(connection) as queries:
+            began = time.perf_counter()
+            for _ in range(repeat):
+                func(cart)
+            elapsed = (time.perf_counter() - began) / repeat * 1000
+        return len(queries) // repeat, elapsed
+
+    print(f"\n[벤치마크] 장바구니 크기별 주문 1건 (평균 {repeat}번)")
+    print(f"  {'상품 수':>6} | {'하나씩 (쿼리 / 시간)':>20} | {'일괄 (쿼리 / 시간)':>18}")
+
+    for size in sizes:
+        cart = {product_id: 1 for product_id in product_ids[:size]}
+        with transaction.atomic():
+            Product.objects.filter(pk__in=list(cart)).update(stock=10 ** 6)
+            slow = measure(place_one_by_one, cart)
+            fast = measure(lambda cart: place_order(user, cart), cart)
+            transaction.set_rollback(True)
+
+        print(f"  {len(cart):>6} | {slow[0]:>8}번 / {slow[1]:>7.1f}ms | {fast[0]:>6}번 / {fast[1]:>7.1f}ms")
+
+    print("\n💡 일괄 주문의 쿼리 수는 상품 수 / 카테고리 수와 무관하게 일정")
+
+
+def benchmark_keyset_pagination(per_page=50, pages=(1, 10, 100, 1000), repeat=5):
+    """
+    API 로그 목록 - 깊은 페이지에서 OFFSET과 키셋(market.pagination) 비교
+    (키셋 커서는 그 페이지 직전 행으로 미리 만들어 둠 = 앞 페이지를 넘겨 온 상태)
+    """
+    from market.models import APILog
+    from market.pagination import KeysetPaginator
+
+    total = APILog.objects.count()
+    if not total:
+        print("데이터가 없습니다. generate_dummy.py를 먼저 실행하세요.")
+        return
+
+    logs = APILog.objects.order_by('-created_at', '-id')
+    paginator = KeysetPaginator(APILog.objects.all(), per_page=per_page)
+
+    def measure(func):
+        began = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - began) / repeat * 1000
+
+    print(f"\n[벤치마크] API 로그 {total:,}건, 페이지당 {per_page}건")
+    print(f"  {'페이지':>6} | {'OFFSET':>9} | {'키셋':>9}")
+
+    for number in pages:
+        offset = (number - 1) * per_page
+        if offset >= total:
+            break
+        cursor = paginator.encode(logs[offset - 1], paginator.NEXT) if offset else None
+
+        by_offset = measure(lambda: list(logs[offset:offset + per_page]))
+        by_keyset = measure(lambda: paginator.page(cursor))
+        print(f"  {number:>6} | {by_offset:>7.2f}ms | {by_keyset:>7.2f}ms")
+
+    print("\n💡 OFFSET은 건너뛰는 행을 모두 읽음 → 깊을수록 느려짐, 키셋은 인덱스에서 커서 위치로 바로 이동")
+
+
+def benchmark_api_log_writer(count=5000, repeat=3):
+    """
+    APILog 기록 - 호출마다 create() vs 큐 + 일괄 bulk_create (market.api_log_writer)
+    요청 쪽에서 기다린 시간과 DB에 모두 쓰일 때까지의 처리량을 비교
+    (벤치마크 로그는 마지막에 지움)
+    """
+    from market.api_log_writer import APILogWriter
+    from market.models import APILog
+
+    endpoint = '/benchmark/api-log-writer'
+
+    def per_row():
+        for i in range(count):
+            APILog.objects.create(endpoint=endpoint, method='GET', status_code=200, response_time=i / 1000)
+
+    def batched(writer):
+        for i in range(count):
+            writer.log(endpoint, 'GET', 200, i / 1000)
+        logged = time.perf_counter()
+        writer.flush()  # 남은 로그까지 DB에 반영될 때까지
+        return logged
+
+    def measure(func):
+        began = time.perf_counter()
+        logged = func() or time.perf_counter()
+        return (logged - began) * 1000, time.perf_counter() - began
+
+    print(f"\n[벤치마크] API 로그 {count:,}건 기록 (평균 {repeat}번)")
+    print(f"  {'방식':<16} | {'요청 쪽 대기':>12} | {'처리량':>12}")
+
+    try:
+        results = {'create() 1건씩': [], '큐 + 일괄 쓰기': []}
+        for _ in range(repeat):
+            results['create() 1건씩'].append(measure(per_row))
+            results['큐 + 일괄 쓰기'].append(measure(lambda: batched(APILogWriter(max_queue=count))))
+        for name, runs in results.items():
+            waited = sum(w for w, _ in runs) / repeat
+            elapsed = sum(e for _, e in runs) / repeat
+            print(f"  {name:<16} | {waited / count * 1000:>8.1f}µs/건 | {count / elapsed:>8,.0f}건/초")
+
+        # 큐가 가득 찼을 때: DB가 따라오지 못하는 순간의 몰림 → 버림 정책
+        writer = APILogWriter(max_queue=count // 10, flush_interval=60)
+        for i in range(count):
+            writer.log(endpoint, 'GET', 200, i / 1000)
+        print(f"\n  큐 상한 {writer.max_queue:,}건에 {count:,}건을 한꺼번에 → 버림 {writer.dropped:,}건 (메모리는 상한 유지)")
+        writer.flush()
+    finally:
+        APILog.objects.filter(endpoint=endpoint).delete()
+
+    print("\n💡 요청은 큐에 넣기만 하고 바로 반환, INSERT + 커밋은 배치마다 1번")
+
+
+if __name__ == "__main__":
+    understanding_db_blocking()
+    benchmark_sales_rollup()
+    benchmark_bulk_order()
+    benchmark_keyset_pagination()
+    benchmark_api_log_writer()
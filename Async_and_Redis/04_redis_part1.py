@@ -18,6 +18,7 @@ from django.views.decorators.cache import cache_page
 from django.db import connection, reset_queries
 from market.models import Product, Order
 from django.core.cache import cache
+from market.ttl_policy import ttl_for
 
 
 """Redis의 아키텍처적 역할 이해 - DB 보호를 위한 아키텍처 레이어"""
@@ -191,7 +192,7 @@ def with_redis_example():
                 'price': float(product.price)
             }
             
-            cache.set(cache_key, product_data, 300)  # Redis 캐시 쓰기 (300초)
+            cache.set(cache_key, product_data, ttl_for(cache_key))  # Redis 캐시 쓰기 (TTL 정책: 300초 ± 지터)
             print(f"[{i + 1}] DB 조회 → Redis 저장")
             
         else:  # 캐시 Hit
@@ -263,13 +264,13 @@ class CacheAsidePattern:
 
     @staticmethod
     def get_product(product_id):
-        from django.core.cache import cache
+        from market.tiered_cache import product_cache
         
         """
         [Cache-Aside 패턴]
         
         흐름:
-            1. 캐시 확인
+            1. 캐시 확인 (L1 프로세스 메모리 → L2 Redis)
             2. 있으면 반환 (캐시 Hit)
             3. 없으면 DB 조회 (캐시 Miss)
             4. DB 결과를 캐시에 저장
@@ -277,10 +278,23 @@ class CacheAsidePattern:
         """
         
         
+        from market.bloom import product_bloom
+        from market.product_cache import ABSENT, product_payload
+        
         cache_key = f'product:{product_id}'
         
-        # 1. 캐시 확인
-        cached = cache.get(cache_key)
+        # 0. Bloom 필터 - 절대 없는 id는 캐시/DB 모두 건너뜀
+        if product_bloom.enabled and not product_bloom.might_contain(product_id):
+            print(f"🚫 Bloom 필터: 존재하지 않는 상품 {product_id}")
+            return None
+        
+        # 1. 캐시 확인 - L1 히트면 Redis 왕복도 없음
+        cached = product_cache.get(cache_key)
+        
+        if cached == ABSENT:
+            # 최근에 DB에 없다고 확인된 id
+            print(f"🚫 캐시 히트(없음): product:{product_id}")
+            return None
         
         if cached:
             # 2. 있으면 반환
@@ -289,17 +303,18 @@ class CacheAsidePattern:
         
         # 3. 없으면 DB 조회
         print(f"❌ 캐시 미스: product:{product_id} → DB 조회")
-        product = Product.objects.get(id=product_id)
+        try:
+            product = Product.objects.get(id=product_id)
+        except Product.DoesNotExist:
+            # 없는 상품도 짧게 캐시 → 크롤러가 같은 id를 두드려도 DB는 1번만
+            product_cache.set(cache_key, ABSENT, ttl_for('absent:'))
+            return None
         
         
         # 4. DB 결과를 캐시에 저장
-        product_data = {
-            'id': product.id,
-            'name': product.name,
-            'price': float(product.price),
-            'category': product.category
-        }
-        cache.set(cache_key, product_data, 300) 
+        
+        product_data = product_payload(product)
+        product_cache.set(cache_key, product_data)  # TTL은 ttl_policy의 'product:' 정책
         
         
         # 5. 반환
@@ -313,6 +328,26 @@ class CacheAsidePattern:
     
     
 
+    @staticmethod
+    def get_products(product_ids):
+        """
+        다건 Cache-Aside - 반복문에서 get_product를 부르지 말 것!
+        
+            get_product × N: Redis GET N번 + 미스마다 DB 쿼리 (N+1)
+            get_products:    MGET 1번 + id__in 쿼리 1번 + 파이프라인 저장 1번
+        """
+        from market.product_cache import get_products
+        
+        return get_products(product_ids)
+
+    
+    
+    
+    ###########################
+    
+    
+    
+
     @staticmethod
     def get_order_with_items(order_id):
         from django.core.cache import cache
@@ -357,7 +392,7 @@ class CacheAsidePattern:
             ]
         }
         
-        cache.set(cache_key, order_data, 300)
+        cache.set(cache_key, order_data, ttl_for(cache_key))
         
         # 5. 반환
         return order_data
@@ -375,13 +410,17 @@ class CacheAsidePattern:
     def update_product(product_id, **updates):
         """
         중요!! 데이터가 변경되면 캐시를 삭제해줘야 함.
+        
+        ProductQuerySet.update()가 무효화를 예약하고,
+        커밋 이후 Redis 삭제 + 모든 Worker의 L1 삭제 방송이 실행됨.
         """
-        # 1. DB 업데이트
-        Product.objects.filter(id=product_id).update(**updates)
+        from django.db import transaction
+        
+        with transaction.atomic():
+            # 1. DB 업데이트 (2. 캐시 무효화는 커밋 시점에 자동 실행)
+            Product.objects.filter(id=product_id).update(**updates)
         
-        # 2. 캐시 무효화 (삭제)
         cache_key = f'product:{product_id}'
-        cache.delete(cache_key)
         
         print(f"✅ 상품 업데이트 완료")
         print(f"✅ 캐시 무효화: {cache_key}")
@@ -389,12 +428,162 @@ class CacheAsidePattern:
 
 
 
+    
+    
+    ##########################
+    
+    
+    
+    
+    @staticmethod
+    def report_tiered_stats():
+        """계층별 히트율/지연 시간 리포트 - 절약한 Redis 호출 수 측정"""
+        from market.tiered_cache import product_cache
+        
+        stats = product_cache.stats()
+        
+        print(f"\n[2단계 캐시 통계]")
+        for tier in ('l1', 'l2'):
+            s = stats[tier]
+            print(f"  {tier.upper()}: 히트 {s['hits']} / 미스 {s['misses']} "
+                  f"(히트율 {s['hit_rate'] * 100:.1f}%, 평균 {s['avg_latency_ms']:.3f}ms)")
+        print(f"  L1 항목 수: {stats['l1_size']}")
+        print(f"  절약한 Redis 호출: {stats['redis_calls_saved']}번")
+        
+        return stats
+
+
+
 
 
 
 
 
 
+"""다건 조회 벤치마크 - get_product 반복 vs get_products"""
+def benchmark_bulk_get_products():
+    import contextlib
+    import io
+    from market.tiered_cache import product_cache
+    from market.product_cache import product_key
+    
+    all_ids = list(Product.objects.values_list('id', flat=True)[:1000])
+    
+    def clear(ids):
+        cache.delete_many([product_key(i) for i in ids])
+        product_cache.local.clear()
+    
+    print(f"\n[벤치마크] 콜드 캐시 / 웜 캐시(L1 비움 → Redis 히트)")
+    
+    for n in (10, 100, 1000):
+        ids = all_ids[:n]
+        
+        for label, func in (
+            ('get_product × N', lambda: [CacheAsidePattern.get_product(i) for i in ids]),
+            ('get_products', lambda: CacheAsidePattern.get_products(ids)),
+        ):
+            clear(ids)
+            
+            with contextlib.redirect_stdout(io.StringIO()):  # 히트/미스 로그 출력 제외
+                reset_queries()
+                start = time.time()
+                func()
+                cold = time.time() - start
+                cold_queries = len(connection.queries)
+                
+                product_cache.local.clear()
+                start = time.time()
+                func()
+                warm = time.time() - start
+            
+            print(f"  N={n:<5} {label:<16} 콜드 {cold*1000:8.2f}ms ({cold_queries}쿼리)  "
+                  f"웜 {warm*1000:8.2f}ms")
+    
+    # [벤치마크] 콜드 캐시 / 웜 캐시(L1 비움 → Redis 히트)
+    #   N=10    get_product × N  콜드 ~N번 쿼리       웜 Redis GET N번
+    #   N=10    get_products     콜드 1쿼리           웜 MGET 1번
+    #   N=1000  get_product × N  콜드 1000쿼리        웜 Redis GET 1000번
+    #   N=1000  get_products     콜드 1쿼리           웜 MGET 1번
+
+
+
+
+"""캐시 값 코덱 벤치마크 - pickle vs JSON vs CompactSerializer"""
+def benchmark_cache_codec(product_count=1000, order_count=500):
+    import pickle
+    from collections import defaultdict
+    from django_redis import get_redis_connection
+    from market.models import OrderItem
+    from market.product_cache import product_payload
+    from market.serializers import CompactSerializer
+    
+    # generate_dummy.py로 만든 데이터를 CacheAsidePattern과 같은 모양으로 변환
+    products = [product_payload(p) for p in Product.objects.all()[:product_count]]
+    
+    orders = list(Order.objects.select_related('user')[:order_count])
+    items = defaultdict(list)
+    for item in OrderItem.objects.filter(order__in=orders).select_related('product'):
+        items[item.order_id].append({
+            'product_name': item.product.name,
+            'quantity': item.quantity,
+            'price': float(item.price)
+        })
+    order_fulls = [
+        {
+            'id': order.id,
+            'user': {'id': order.user.id, 'username': order.user.username},
+            'total_amount': float(order.total_amount),
+            'items': items[order.id]
+        }
+        for order in orders
+    ]
+    
+    compact = CompactSerializer({'COMPRESS_MIN_SIZE': 1024})
+    codecs = {
+        'pickle': (lambda v: pickle.dumps(v, pickle.HIGHEST_PROTOCOL), pickle.loads),
+        'json': (lambda v: json.dumps(v).encode(), lambda b: json.loads(b)),
+        'compact': (compact.dumps, compact.loads),
+    }
+    
+    redis_conn = get_redis_connection("default")
+    
+    print(f"\n[벤치마크] 상품 {len(products)}개, 주문 {len(order_fulls)}개")
+    
+    for shape, values in (('product', products), ('order_full', order_fulls)):
+        if not values:
+            continue
+        
+        print(f"\n  {shape}")
+        for name, (dumps, loads) in codecs.items():
+            start = time.perf_counter()
+            encoded = [dumps(v) for v in values]
+            encode_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for b in encoded:
+                loads(b)
+            decode_time = time.perf_counter() - start
+            
+            total_bytes = sum(len(b) for b in encoded)
+            
+            # Redis 실제 메모리 사용량 (MEMORY USAGE) - 샘플 100개
+            keys = [f'codec_bench:{name}:{i}' for i in range(min(100, len(encoded)))]
+            redis_conn.mset(dict(zip(keys, encoded)))
+            try:
+                memory = sum(redis_conn.memory_usage(k) or 0 for k in keys) / len(keys)
+                memory = f"{memory:.0f}B"
+            except Exception:
+                memory = "n/a"
+            redis_conn.delete(*keys)
+            
+            print(f"    {name:<8} 평균 {total_bytes / len(values):8.1f}B  "
+                  f"인코딩 {encode_time / len(values) * 1e6:6.2f}µs  "
+                  f"디코딩 {decode_time / len(values) * 1e6:6.2f}µs  "
+                  f"Redis {memory}/key")
+
+
+
+
 # ============================================================================
 # 예제 3: 실전 사용 예제 - 상품 목록
 # ============================================================================
@@ -468,7 +657,7 @@ def product_list_with_cache():
                 for p in products
             ]
             
-            cache.set(cache_key, product_data, 300)
+            cache.set(cache_key, product_data, ttl_for(cache_key))
             print(f"  [{i+1}] DB 조회 → 캐시 저장") # [1] DB 조회 → 캐시 저장
             
         else: # 캐시 Hit
@@ -584,6 +773,46 @@ def simulate_view_cache():
 
 
 
+""" 응답 캐시 예제 - 사용자별 / 조건부(ETag) / 태그 무효화 (market.response_cache)"""
+def simulate_response_cache():
+    from django.test import RequestFactory
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from market.models import Product
+    from market.views import product_list
+
+    rf = RequestFactory()
+    cache.clear()
+
+    def request(label, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.time()
+            response = product_list(rf.get('/market/products/', {'category': category, 'utm_source': label}, **headers))
+            elapsed = time.time() - start
+        print(f"  {label}: {response.status_code}  {elapsed * 1000:.2f} ms  DB 쿼리 {len(ctx.captured_queries)}개")
+        return response
+
+    print("\n=== 응답 캐시 실험 시작 ===")
+    product = Product.objects.order_by('id').first()
+    category = product.category
+
+    first = request('첫 요청 (미스)')
+    request('같은 목록 (히트, utm_source는 키에서 제외)')
+    request('If-None-Match (304, 본문 없음)', HTTP_IF_NONE_MATCH=first['ETag'])
+
+    # 다른 카테고리 상품 수정 → 이 페이지는 그대로
+    other = Product.objects.exclude(category=category).first()
+    if other:
+        other.save()
+        request('다른 카테고리 상품 수정 후 (304 유지)', HTTP_IF_NONE_MATCH=first['ETag'])
+
+    # 이 페이지에 담긴 상품 수정 → product:<id> 태그 증가 → 이 페이지만 무효화
+    product.save()
+    request('담긴 상품 수정 후 (미스)', HTTP_IF_NONE_MATCH=first['ETag'])
+
+
+
 
 ################################
 
@@ -600,9 +829,17 @@ if __name__ == "__main__":
     # 첫 조회 - 캐시 Miss
     product1 = cache_aside.get_product(1)
     
-    # 두 번째 조회 - 캐시 Hit
+    # 두 번째 조회 - 캐시 Hit (L1)
     product2 = cache_aside.get_product(1)
     
+    cache_aside.report_tiered_stats()
+    
+    
+    # 다건 조회 - MGET 1번 + DB 쿼리 1번
+    products = cache_aside.get_products([1, 2, 3])
+    benchmark_bulk_get_products()
+    benchmark_cache_codec()
+    
     
     
     # 상품 목록 비교
@@ -615,3 +852,4 @@ if __name__ == "__main__":
 
     
     simulate_view_cache()
+    simulate_response_cache()
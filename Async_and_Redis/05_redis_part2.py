@@ -16,9 +16,8 @@ import hashlib
 import random
 import threading
 from django.core.cache import cache
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
 from market.models import Product, Order
+from market.ttl_policy import ttl_for
 from django.db import connection, reset_queries
 from django.db.models import Sum, Avg, Count
 
@@ -30,8 +29,9 @@ def practice_ttl_caching():
     """TTL 기반 캐싱 실습"""
 
     # 상품 데이터 캐싱 함수
-    def get_product_with_ttl(product_id, ttl=300):
-        """TTL을 사용한 상품 조회"""
+    def get_product_with_ttl(product_id, ttl=None):
+        """TTL을 사용한 상품 조회 (ttl 생략 시 TTL 정책)"""
+        ttl = ttl_for(f'product_ttl:{product_id}') if ttl is None else ttl
         cache_key = f'product_ttl:{product_id}'
         
         # 캐시 확인
@@ -103,44 +103,23 @@ def practice_ttl_caching():
 # 실습 2: 이벤트 기반 캐시 무효화 (Django Signal)
 # ============================================================================
 
-"""상품이 저장되면 관련 캐시를 모두 삭제하는 시그널"""
-@receiver(post_save, sender=Product) # 상품이 저장될때 해당 함수를 자동실행 하도록 함.
-def invalidate_product_cache_on_save(sender, instance, **kwargs):
-
-    cache_keys = [
-        f'product:{instance.id}',
-        f'product_ttl:{instance.id}',
-        f'product_detail:{instance.id}',
-    ]
-    
-    for key in cache_keys:
-        cache.delete(key)  # 개별 상품 캐시 삭제
-    
-    # 카테고리 관련 캐시 삭제
-    cache.delete(f'products_by_category:{instance.category}')
-    
-    print(f"🗑️ 캐시 무효화: Product {instance.id} 저장됨.")
-
-
-###########################
+"""
+상품 저장/삭제 시그널 → market/signals.py (MarketConfig.ready()에서 등록)
 
+    ❌ 이전: 이 스크립트에서 @receiver 등록
+        - 스크립트를 import한 프로세스에서만 동작
+        - 시그널마다 즉시 cache.delete × 4 (롤백되어도 삭제, 일괄 수정 시 왕복 폭증)
+        - QuerySet.update()는 시그널이 없어 무효화 누락
 
-"""상품이 삭제되면 관련 캐시를 모두 삭제하는 시그널"""
-@receiver(post_delete, sender=Product) # 상품이 삭제될때 해당 함수를 자동실행 하도록 함.
-def invalidate_product_cache_on_delete(sender, instance, **kwargs):
-    
-    cache_keys = [
-        f'product:{instance.id}',
-        f'product_ttl:{instance.id}',
-        f'product_detail:{instance.id}',
-    ]
-    
-    for key in cache_keys:
-        cache.delete(key)
-    
-    cache.delete(f'products_by_category:{instance.category}')
-    
-    print(f"🗑️ 캐시 무효화: Product {instance.id} 삭제됨")
+    ✅ 현재: market.invalidation
+        - 트랜잭션 동안 키를 모아 중복 제거 → on_commit에서 delete_many 1번
+        - 롤백되면 무효화도 취소
+        - Product.objects.update()/bulk_update()도 같은 경로로 무효화
+"""
+from market.signals import (  # noqa: F401
+    invalidate_product_cache_on_save,
+    invalidate_product_cache_on_delete,
+)
 
 
 ########################
@@ -151,9 +130,15 @@ def practice_event_based_invalidation():
 
     # 상품 조회 및 캐싱
     def get_product_cached(product_id):
+        from market.product_cache import ABSENT
+        
         cache_key = f'product:{product_id}'
         
         product_data = cache.get(cache_key)
+        if product_data == ABSENT:
+            print(f"🚫 캐시 히트(없음): {cache_key}")
+            return None
+        
         if product_data:
             print(f"✅ 캐시 히트: {cache_key}")
             return product_data
@@ -166,10 +151,12 @@ def practice_event_based_invalidation():
                 'name': product.name,
                 'price': float(product.price),
             }
-            cache.set(cache_key, product_data, 300)
+            cache.set(cache_key, product_data, ttl_for(cache_key))
             return product_data
         
         except Product.DoesNotExist:
+            # 네거티브 캐싱 - 없는 id도 짧은 TTL로 저장
+            cache.set(cache_key, ABSENT, ttl_for('absent:'))
             return None
     
     
@@ -196,7 +183,6 @@ def practice_event_based_invalidation():
         old_price = product_obj.price
         product_obj.price = float(product_obj.price) + 100
         product_obj.save()  # 시그널 발동 → invalidate_product_cache_on_save() 호출 
-        # 🗑️ 캐시 무효화: Product 1 저장됨.
         
         print("\n[테스트 4] 수정 후 다시 조회 (캐시 미스)")
         product = get_product_cached(2)
@@ -204,7 +190,6 @@ def practice_event_based_invalidation():
         
         
         product_obj.delete() # 시그널 발동 -> invalidate_product_cache_on_delete() 호출
-         # 🗑️ 캐시 무효화: Product 1 삭제됨
          
         product = get_product_cached(1)
         # ❌ 캐시 미스: product:1
@@ -213,6 +198,17 @@ def practice_event_based_invalidation():
     except Product.DoesNotExist:
         print("상품이 존재하지 않습니다.")
     
+    
+    print("\n[테스트 5] 트랜잭션 안에서 일괄 수정 → 커밋 시 delete_many 1번")
+    from django.db import transaction
+    with transaction.atomic():
+        for p in Product.objects.all()[:100]:
+            p.stock += 1
+            p.save()  # 키는 모이기만 하고, 아직 삭제되지 않음
+        Product.objects.filter(category='books').update(stock=0)  # update()도 포함
+    # 커밋 시점에 중복 제거된 키를 한 번에 삭제
+    
+    
     print("\n✅ 이벤트 기반 캐시 무효화 실습 완료!")
     print("💡 배운 점: 데이터 변경 시 자동으로 캐시가 갱신됨")
 
@@ -226,47 +222,36 @@ def practice_event_based_invalidation():
 # ============================================================================
 
 class TagBasedCache:
-    """태그 기반 캐시 관리"""
+    """
+    태그 기반 캐시 관리 → market.tag_cache
+    
+    ❌ 이전: 태그 버전 GET → (없으면 SET) → 값 GET = 순차 왕복 2~3번, 태그 1개
+    ✅ 현재: 태그 버전들 + 값 = MGET 1번, 항목당 태그 여러 개, INCR로 원자적 무효화
+    """
     
     @staticmethod
     def get_tag_version(tag):
         """태그의 현재 버전 가져오기"""
-        key = f'tag_version:{tag}'
-        version = cache.get(key)
-        if version is None:
-            version = 1
-            cache.set(key, version, None)  # 영구 저장
-        return version
+        from market.tag_cache import TagBasedCache as _TagBasedCache
+        return _TagBasedCache.get_tag_version(tag)
     
     
     @staticmethod
-    def invalidate_tag(tag):
+    def invalidate_tag(*tags):
         """태그 버전 증가 → 관련 캐시 모두 무효화"""
-        key = f'tag_version:{tag}'
-        version = cache.get(key, 0)
-        cache.set(key, version + 1, None)
-        print(f"🔄 태그 무효화: {tag} (v{version} → v{version+1})")
+        from market.tag_cache import TagBasedCache as _TagBasedCache
+        
+        new_versions = _TagBasedCache.invalidate_tags(*tags)
+        for tag, version in new_versions.items():
+            print(f"🔄 태그 무효화: {tag} (v{version - 1} → v{version})")
+        return new_versions
     
     
     @staticmethod
-    def get_cached_data(cache_key, tag, fetch_func, ttl=300):
-        """태그를 포함한 캐시 키로 데이터 가져오기"""
-        # 태그 버전 포함한 실제 캐시 키
-        tag_version = TagBasedCache.get_tag_version(tag)
-        versioned_key = f'{cache_key}:v{tag_version}'
-        
-        # 캐시 확인
-        data = cache.get(versioned_key)
-        if data:
-            print(f"✅ 캐시 히트: {versioned_key}")
-            return data
-        
-        # 캐시 미스 - 데이터 가져오기
-        print(f"❌ 캐시 미스: {versioned_key}")
-        data = fetch_func()
-        cache.set(versioned_key, data, ttl)
-        
-        return data
+    def get_cached_data(cache_key, tags, fetch_func, ttl=None):
+        """태그 버전과 값을 한 번에 확인하여 데이터 가져오기"""
+        from market.tag_cache import TagBasedCache as _TagBasedCache
+        return _TagBasedCache.get_cached_data(cache_key, tags, fetch_func, ttl)
 
 
 ###########################
@@ -278,23 +263,13 @@ def practice_tag_based_invalidation():
     # 카테고리별 상품 목록 조회
     def get_products_by_category(category):
         """카테고리별 상품 목록"""
-        def fetch():
-            products = Product.objects.filter(category=category)[:5]
-            return [
-                {
-                    'id': p.id,
-                    'name': p.name,
-                    'price': float(p.price)
-                }
-                for p in products
-            ]
-        
-        cache_key = f'products_by_category:{category}'
+        from market.product_cache import category_key, category_tags, category_products_payload
         
         return TagBasedCache.get_cached_data(
-            cache_key, 
-            tag='products',  # 모든 상품 관련 캐시에 'products' 태그
-            fetch_func=fetch
+            category_key(category), 
+            # 전체 상품 태그 + 카테고리 태그 → 둘 중 하나만 무효화되어도 미스
+            tags=category_tags(category),
+            fetch_func=lambda: category_products_payload(category)
         )
     
     
@@ -330,6 +305,15 @@ def practice_tag_based_invalidation():
     # ❌ 캐시 미스: products_by_category:Books:v2
     
     
+    print("\n[테스트 5] 'category:Books' 태그만 무효화")
+    print("→ Books 목록만 미스, Electronics 목록은 그대로 히트")
+    TagBasedCache.invalidate_tag('category:Books')
+    # 🔄 태그 무효화: category:Books (v0 → v1)
+    
+    electronics = get_products_by_category('Electronics')
+    books = get_products_by_category('Books')
+    
+    
     print("\n✅ 태그 기반 캐시 무효화 실습 완료!")
     print("💡 배운 점: 관련된 캐시를 그룹으로 한 번에 무효화 가능")
 
@@ -343,61 +327,54 @@ def practice_tag_based_invalidation():
 # ============================================================================
 
 class CacheWithLock:
-    """락을 사용한 캐시 스탬피드 방지"""
+    """
+    락을 사용한 캐시 스탬피드 방지
+    
+    ❌ 이전: 클래스 변수 dict에 threading.Lock 보관
+        - 한 프로세스 안의 스레드만 보호 (Worker 9개 → DB 재계산 9번)
+        - 키마다 락이 생기고 삭제되지 않아 dict가 계속 커짐
     
-    _locks = {}
+    ✅ 현재: Redis 락 (SET NX PX + 토큰) → market.cache_lock
+        - 모든 Worker 프로세스에서 단 1번만 재계산
+        - 대기자는 해제 알림(pub/sub)을 받을 때까지 블록 (spin 없음)
+        - 대기 중인 키만 관리 → 락 테이블 크기 제한
+    """
     
     @classmethod
-    def get_or_set(cls, cache_key, fetch_func, ttl=300):
+    def get_or_set(cls, cache_key, fetch_func, ttl=None, lock_timeout=10):
         """락을 사용하여 안전하게 캐시 가져오기"""
-        # 1차 캐시 확인
-        data = cache.get(cache_key)
-        if data:
-            return data
+        from market.cache_lock import get_or_set_locked
         
-        # 락 생성 (없으면)
-        if cache_key not in cls._locks:
-            cls._locks[cache_key] = threading.Lock()
-        
-        # 락 획득
-        with cls._locks[cache_key]:
-            # 2차 캐시 확인 (다른 스레드가 채웠을 수 있음)
-            data = cache.get(cache_key)
-            if data:
-                print(f"락 내에서 캐시 발견: {cache_key}")
-                return data
-            
-            # DB 조회 (한 스레드만 실행)
-            print(f"락 획득 후 DB 조회: {cache_key}")
-            data = fetch_func()
-            cache.set(cache_key, data, ttl)
-            
-            return data
+        return get_or_set_locked(cache_key, fetch_func, ttl=ttl, lock_timeout=lock_timeout)
 
 
 ##########################
 
 
+# 복잡한 통계 계산 시뮬레이션
+def calculate_statistics():
+    """
+    시간이 오래 걸리는 통계 계산
+    
+    ❌ 이전: Order.objects.aggregate(Count, Sum, Avg) → 만료될 때마다 주문 테이블 전체 스캔
+    ✅ 현재: 시그널로 유지되는 누적 합계 조회 (HGETALL 1번) → market.order_stats
+    """
+    from market.order_stats import order_stats
+    
+    time.sleep(1)  # 계산 시뮬레이션 (스탬피드 실습용)
+    
+    stats = order_stats.get()
+    
+    return {
+        'total_orders': stats['total_orders'],
+        'total_revenue': stats['total_revenue'],
+        'avg_order': stats['avg_order'],
+        'calculated_at': time.time()
+    }
+
+
 """캐시 스탬피드 방지 실습"""
 def practice_cache_stampede_prevention():
-
-    # 복잡한 통계 계산 시뮬레이션
-    def calculate_statistics():
-        """시간이 오래 걸리는 통계 계산"""
-        time.sleep(1)  # 계산 시뮬레이션
-        
-        stats = Order.objects.aggregate(
-            total_orders = Count('id'),
-            total_revenue = Sum('total_amount'),
-            avg_order = Avg('total_amount')
-        )
-        
-        return {
-            'total_orders': stats['total_orders'] or 0,
-            'total_revenue': float(stats['total_revenue'] or 0),
-            'avg_order': float(stats['avg_order'] or 0),
-            'calculated_at': time.time()
-        }
     
     # 캐시 클리어
     cache.delete('statistics')
@@ -418,8 +395,7 @@ def practice_cache_stampede_prevention():
         
         stats = CacheWithLock.get_or_set(
             'statistics',
-            calculate_statistics,
-            ttl=60
+            calculate_statistics,  # TTL은 ttl_policy의 'statistics' 정책 (60초 ± 지터)
         )
         
         elapsed = time.time() - start
@@ -476,6 +452,125 @@ def practice_cache_stampede_prevention():
 
 
 
+##########################
+
+
+def _stampede_worker(mode, cache_key, threads):
+    """벤치마크용 Worker 프로세스 - M개 스레드가 동시에 같은 키 요청"""
+    import concurrent.futures
+    from django.db import connections
+    from django_redis import get_redis_connection
+    
+    connections.close_all()  # fork 이전 DB 커넥션 재사용 금지
+    
+    redis_conn = get_redis_connection("default")
+    counter_key = f'{cache_key}:recomputations'
+    local_lock = threading.Lock()
+    
+    def calculate():
+        redis_conn.incr(counter_key)  # 프로세스 간 공유 카운터
+        time.sleep(0.5)
+        return Order.objects.aggregate(total_orders=Count('id'))
+    
+    def per_process_lock(_):
+        # 이전 방식: 프로세스 내부 락
+        data = cache.get(cache_key)
+        if data is not None:
+            return data
+        with local_lock:
+            data = cache.get(cache_key)
+            if data is None:
+                data = calculate()
+                cache.set(cache_key, data, 60)
+            return data
+    
+    def redis_lock(_):
+        return CacheWithLock.get_or_set(cache_key, calculate, ttl=60)
+    
+    func = per_process_lock if mode == 'process' else redis_lock
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(func, range(threads)))
+
+
+def benchmark_stampede_lock(processes=4, threads=8):
+    """N 프로세스 × M 스레드 동시 요청 시 DB 재계산 횟수 비교"""
+    import multiprocessing
+    from django_redis import get_redis_connection
+    
+    redis_conn = get_redis_connection("default")
+    ctx = multiprocessing.get_context('fork')
+    
+    print(f"\n[벤치마크] {processes} 프로세스 × {threads} 스레드, 콜드 캐시")
+    
+    for mode, label in (('process', '프로세스 내부 락'), ('redis', 'Redis 락')):
+        cache_key = f'bench_statistics:{mode}'
+        cache.delete(cache_key)
+        redis_conn.delete(f'{cache_key}:recomputations')
+        
+        start = time.time()
+        workers = [
+            ctx.Process(target=_stampede_worker, args=(mode, cache_key, threads))
+            for _ in range(processes)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.time() - start
+        
+        recomputations = int(redis_conn.get(f'{cache_key}:recomputations') or 0)
+        print(f"  {label}: DB 재계산 {recomputations}번 ({elapsed:.2f}초)")
+        
+    # [벤치마크] 4 프로세스 × 8 스레드, 콜드 캐시
+    #   프로세스 내부 락: DB 재계산 4번
+    #   Redis 락: DB 재계산 1번
+
+
+
+
+
+
+
+
+##########################
+
+
+"""Stale-While-Revalidate 실습 - 만료 시점에도 응답 지연이 튀지 않음"""
+def practice_stale_while_revalidate():
+    from market.early_refresh import swr_cache
+    
+    cache_key = 'statistics:swr'
+    cache.delete(cache_key)
+    swr_cache.reset_stats()
+    
+    ttl, grace = 2, 30
+    print(f"\n[테스트] soft TTL={ttl}초, grace={grace}초")
+    print("→ soft TTL이 지나면 이전 값을 바로 반환하고, 백그라운드에서 1번만 갱신")
+    
+    latencies = []
+    for i in range(8):
+        start = time.time()
+        stats = swr_cache.get(cache_key, calculate_statistics, ttl=ttl, grace=grace)
+        elapsed = time.time() - start
+        latencies.append(elapsed)
+        
+        print(f"[{i+1}] {elapsed * 1000:.2f}ms (calculated_at={stats['calculated_at']:.0f})")
+        time.sleep(0.7)
+    
+    print(f"\n첫 요청(콜드 미스): {latencies[0] * 1000:.2f}ms")
+    print(f"이후 최대 지연: {max(latencies[1:]) * 1000:.2f}ms")
+    print(f"신선도 통계: {swr_cache.stats()}")
+    
+    # [1] 1003.52ms  ← 콜드 미스만 계산을 기다림
+    # [2] 0.41ms
+    # [4] 0.38ms     ← soft TTL 초과 → stale 반환 + 백그라운드 갱신
+    # ...
+    # 이후 최대 지연: 0.52ms
+    
+    print("\n✅ Stale-While-Revalidate 실습 완료!")
+    print("💡 배운 점: 약간 오래된 값을 허용하면 만료 시점의 대기를 없앨 수 있음")
+
+
 
 
 
@@ -485,47 +580,26 @@ def practice_cache_stampede_prevention():
 # ============================================================================
 
 class ProbabilisticCache:
-    """확률적 조기 갱신"""
+    """
+    확률적 조기 갱신
+    
+    ❌ 이전:
+        - 캐시 히트마다 redis_conn.ttl() 추가 호출 (Redis 왕복 2번)
+        - 남은 시간과 무관하게 고정 10% 확률
+        - 요청 스레드가 직접 fetch_func() 실행 → 해당 요청만 느려짐
+        - bare except로 모든 오류를 삼킴
+    
+    ✅ 현재: XFetch → market.early_refresh
+        - 만료 시각과 재계산 소요 시간을 값과 함께 저장 (히트 = GET 1번)
+        - 만료가 가깝고 재계산이 느릴수록 갱신 확률 증가
+        - 갱신은 백그라운드 Executor에서 실행
+    """
     
     @staticmethod
-    def get_or_refresh(cache_key, fetch_func, ttl=60, early_refresh_ratio=0.2):
-        from django_redis import get_redis_connection
-        """
-        확률적 조기 갱신
+    def get_or_refresh(cache_key, fetch_func, ttl=None, beta=1.0):
+        from market.early_refresh import XFetchCache
         
-        ttl의 80% 지나면 일부 요청이 미리 갱신
-        """
-        # 캐시와 남은 시간 확인
-        data = cache.get(cache_key, version=1)
-        
-        if data is not None:
-            # Redis에서 TTL 확인 (django-redis 사용 시)
-            try:
-                redis_conn = get_redis_connection("default") # Redis에 직접 연결하기 위함.
-                remaining = redis_conn.ttl(cache.make_key(cache_key, version=1)) # TTL을 조회함. # 실제 Redis에 저장하기 위한 키를 만듦.
-                
-                if remaining > 0:
-                    # 남은 시간이 적으면 확률적으로 갱신
-                    if remaining < ttl * early_refresh_ratio:
-                        refresh_probability = 0.1 # 10% 확률
-                        
-                        if random.random() < refresh_probability:
-                            print(f"🎲 확률적 조기 갱신: {cache_key} (남은시간: {remaining}초)")
-                            # 확률적 조기 갱신: hot_products (남은시간: 1초)
-                            
-                            data = fetch_func()
-                            cache.set(cache_key, data, ttl, version=1)
-                    
-                    return data
-            except:
-                # Redis 아닌 경우 또는 오류 시 그냥 반환
-                return data
-        
-        # 캐시 미스
-        print(f"❌ 캐시 미스: {cache_key}")
-        data = fetch_func()
-        cache.set(cache_key, data, ttl, version=1)
-        return data
+        return XFetchCache.get_or_refresh(cache_key, fetch_func, ttl=ttl, beta=beta)
 
 
 
@@ -546,16 +620,15 @@ def practice_probabilistic_refresh():
             for p in products
         ]
     
-    # TTL을 짧게 설정 (10초)
-    ttl = 10
+    # TTL을 짧게 설정 (ttl_policy의 'hot_products' 정책: 10초)
     cache_key = 'hot_products'
+    ttl = ttl_for(cache_key, jitter=False)
     
     # 캐시 클리어
-    cache.delete(cache_key, version=1)
+    cache.delete(cache_key)
     
-    print(f"\n[테스트] TTL={ttl}초, 조기 갱신 기준={ttl * 0.2}초") 
-    # [테스트] TTL=10초, 조기 갱신 기준=2.0초
-    print("→ 남은 시간이 2초 이하면 10% 확률로 미리 갱신\n")
+    print(f"\n[테스트] TTL={ttl}초, XFetch (beta=1.0)") 
+    print("→ 만료가 가까울수록, 계산이 오래 걸릴수록 백그라운드에서 미리 갱신\n")
     
     
     # 첫 조회
@@ -582,6 +655,148 @@ def practice_probabilistic_refresh():
 
 
 
+##########################
+
+
+"""핫 키 자동 복제 실습 - 많이 읽히는 키는 Worker 메모리에서 응답 (market.hot_keys)"""
+def practice_hot_key_replication(reads=5000):
+    from market.hot_keys import hot_keys
+
+    cache_key = 'hot_products'
+    cache.set(cache_key, [{'id': i} for i in range(5)], ttl_for(cache_key))
+    cache.set('statistics:cold', {'total': 0}, 60)
+
+    def measure(key, n=1000):
+        start = time.perf_counter()
+        for _ in range(n):
+            cache.get(key)
+        return (time.perf_counter() - start) / n * 1_000_000
+
+    print(f"\n[테스트] '{cache_key}' {reads}번 조회 → 샘플 합산 → 핫 키 감지")
+    before = measure(cache_key)
+    for _ in range(reads):
+        cache.get(cache_key)
+    hot_keys.flush()
+    hot_keys.refresh()  # 보통은 REFRESH_INTERVAL마다 자동
+
+    print(f"  핫 키: {sorted(hot_keys.hot)}")
+    print(f"  GET 평균: 감지 전 {before:.1f}µs → 감지 후 {measure(cache_key):.1f}µs (복제본)")
+    print(f"  일반 키 GET 평균: {measure('statistics:cold'):.1f}µs (Redis)")
+
+    print("\n[리포트] python manage.py hot_keys")
+    for entry in hot_keys.report(limit=5)['keys']:
+        print(f"  {entry['key']:<24} {entry['rate']:>8.1f} req/s  {'✅ 복제' if entry['replicated'] else ''}")
+
+    print("\n✅ 핫 키 복제 실습 완료!")
+    print("💡 배운 점: 소수의 키에 몰린 읽기는 Worker마다 짧게 복제하면 Redis 샤드 부하가 사라짐")
+
+
+
+##########################
+
+
+"""재고 write-behind 실습 - 플래시 세일에서 차감은 Redis, DB 반영은 1초에 UPDATE 1번 (market.stock)"""
+def practice_write_behind_stock(buyers=400, threads=16, stock=100):
+    import concurrent.futures
+    from django.db import close_old_connections
+    from django.db.models import F
+    from market.stock import OutOfStock, stock_counters
+
+    product = Product.objects.order_by('id').first()
+    if product is None:
+        print("상품이 없습니다. generate_dummy.py를 먼저 실행하세요.")
+        return
+
+    def run(buy):
+        def worker(_):
+            try:
+                return buy()
+            finally:
+                close_old_connections()
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            sold = sum(executor.map(worker, range(buyers)))
+        return sold, time.perf_counter() - start
+
+    def buy_orm():
+        # 이전 방식: 구매마다 같은 행에 UPDATE (조건부 차감)
+        return Product.objects.filter(pk=product.pk, stock__gte=1).update(stock=F('stock') - 1)
+
+    def buy_counter():
+        try:
+            stock_counters.decrement(product.pk)
+            return 1
+        except OutOfStock:
+            return 0
+
+    print(f"\n[테스트] 재고 {stock}개 상품에 {buyers}명이 동시 구매 ({threads} 스레드)")
+
+    Product.objects.filter(pk=product.pk).update(stock=stock)
+    sold, elapsed = run(buy_orm)
+    print(f"  ORM UPDATE:    판매 {sold}개, {elapsed * 1000:.0f}ms, DB 재고 {Product.objects.get(pk=product.pk).stock}")
+
+    Product.objects.filter(pk=product.pk).update(stock=stock)  # 카운터도 DB 기준으로 다시 맞춰짐
+    sold, elapsed = run(buy_counter)
+    print(f"  Redis 카운터:  판매 {sold}개, {elapsed * 1000:.0f}ms, "
+          f"카운터 {stock_counters.available(product.pk)} / 반영 전 DB 재고 {Product.objects.get(pk=product.pk).stock}")
+
+    written = stock_counters.flush()  # 보통은 STOCK_FLUSH_INTERVAL마다 백그라운드에서
+    print(f"  flush: 상품 {written}개를 UPDATE 1번으로 반영 → DB 재고 {Product.objects.get(pk=product.pk).stock}")
+
+    print("\n[점검] python manage.py reconcile_stock")
+    print(f"  {stock_counters.reconcile()}")
+
+    print("\n✅ 재고 write-behind 실습 완료!")
+    print("💡 배운 점: 경합이 심한 카운터는 Redis에서 원자적으로 바꾸고, DB에는 모아서 한 번에 반영")
+
+
+
+##########################
+
+
+"""누적 주문 통계 실습 - 전체 집계 대신 시그널로 증감 (market.order_stats)"""
+def practice_incremental_statistics(reads=200):
+    from django.contrib.auth.models import User
+    from market.order_stats import order_stats
+
+    def measure(func):
+        start = time.perf_counter()
+        for _ in range(reads):
+            func()
+        return (time.perf_counter() - start) / reads * 1000
+
+    def aggregate():
+        return Order.objects.aggregate(Count('id'), Sum('total_amount'), Avg('total_amount'))
+
+    order_stats.rebuild()
+    print(f"\n[테스트 1] 주문 {Order.objects.count()}건, 통계 조회 {reads}번 평균")
+    print(f"  aggregate(): {measure(aggregate):.3f}ms  (주문 수에 비례)")
+    print(f"  누적 합계:   {measure(order_stats.get):.3f}ms  (주문 수와 무관)")
+
+    user = User.objects.first()
+    if user is None:
+        print("사용자가 없습니다. generate_dummy.py를 먼저 실행하세요.")
+        return
+
+    print("\n[테스트 2] 주문 생성 / 상태 변경 / 삭제 → 시그널이 커밋 이후 HINCRBY")
+    order = Order.objects.create(user=user, total_amount=100, status='pending')
+    order.status = 'completed'
+    order.save()
+    print(f"  생성 + 완료: {order_stats.get()['by_status']}")
+    order.delete()
+    print(f"  삭제:        {order_stats.get()['by_status']}")
+
+    current, expected = order_stats.check()
+    print(f"\n[점검] 누적 합계 = 전체 집계? {current['total_orders'] == expected['total_orders'] and current['by_status'] == expected['by_status']}")
+    print("  (어긋나면 python manage.py rebuild_order_stats, 보통은 ORDER_STATS_REBUILD_INTERVAL마다 자동)")
+
+    print("\n✅ 누적 주문 통계 실습 완료!")
+    print("💡 배운 점: 자주 읽는 집계는 쓰기 시점에 조금씩 갱신하면 읽기가 O(1)이 됨")
+
+
+
+
 
 # ============================================================================
 # 메인 실행
@@ -604,10 +819,15 @@ if __name__ == "__main__":
 
         # 4. 캐시 스탬피드 방지
         practice_cache_stampede_prevention()
+        benchmark_stampede_lock()
+        practice_stale_while_revalidate()
         
         
         # 5. 확률적 조기 갱신
         practice_probabilistic_refresh()
+        practice_hot_key_replication()
+        practice_write_behind_stock()
+        practice_incremental_statistics()
         
         
         """
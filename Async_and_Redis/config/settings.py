@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'market.middleware.RequestMemoMiddleware',
+    'market.middleware.QueryWorkloadMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -119,12 +122,66 @@ STATIC_URL = 'static/'
 
 
 
+# Redis 없이 실행 (벤치마크 / CI): CACHE_LOCATION=local:// python 05_redis_part2.py
+#   → market.local_redis가 프로세스 안에 Redis 호환 서버를 띄움
+CACHE_LOCATION = os.environ.get("CACHE_LOCATION", "redis://127.0.0.1:6379/1")
+
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": "redis://127.0.0.1:6379/1",
+        "BACKEND": "market.cache_backends.InstrumentedRedisCache",  # django_redis + 접두사별 계측
+        "LOCATION": CACHE_LOCATION,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient"
+            "CLIENT_CLASS": (
+                "market.local_redis.LocalRedisClient" if CACHE_LOCATION.startswith("local://")
+                else "django_redis.client.DefaultClient"
+            ),
+            "SERIALIZER": "market.serializers.CompactSerializer",
+            "COMPRESS_MIN_SIZE": 1024,  # 이 크기(바이트) 이상이면 zlib 압축
         }
     }
-}
\ No newline at end of file
+}
+
+# 프로세스 내 L1 캐시 (market.tiered_cache)
+L1_CACHE_MAXSIZE = 5000
+L1_CACHE_TTL = 30
+
+# 핫 키 자동 복제 (market.hot_keys) - 모든 Worker 합계 초당 GET 수가 기준 이상이면
+# 각 Worker 메모리에 짧은 TTL로 복제하여 Redis 샤드 하나에 요청이 몰리지 않게 함
+HOT_KEY_THRESHOLD = 50
+HOT_KEY_TTL = 2
+
+
+# 존재하지 않는 상품 id를 캐시/DB 조회 전에 거르는 Bloom 필터 (market.bloom)
+# 켜기 전에 python manage.py warm_cache --bloom 으로 한 번 구축
+PRODUCT_BLOOM_FILTER = False
+
+
+# 재고 write-behind 카운터 (market.stock) - 차감은 Redis에서, DB 반영은 주기적으로 한 번에
+# 카운터는 캐시와 다른 논리 DB에 둠 (cache.clear()로 미반영 재고가 사라지지 않도록)
+STOCK_REDIS_DB = 2
+STOCK_FLUSH_INTERVAL = 1.0  # 초
+
+
+# 누적 주문 통계 (market.order_stats) - 시그널로 증감, 이 주기마다 전체 재계산으로 보정
+ORDER_STATS_REBUILD_INTERVAL = 3600  # 초
+
+
+# SQL 워크로드 샘플링 (market.query_workload) - python manage.py index_advisor --sampled 의 입력
+# 요청 중 이 비율만 실행된 SQL을 정규화해 Redis에 합산 (0이면 끔)
+QUERY_WORKLOAD_SAMPLE_RATE = 0.0
+QUERY_WORKLOAD_TTL = 86400  # 초
+
+
+# APILog 일괄 기록 (market.api_log_writer) - 큐에 모아 BATCH_SIZE개 또는 FLUSH_INTERVAL마다 bulk_create
+# 큐가 MAX_QUEUE개로 가득 차면 'drop': 새 로그를 버림 / 'block': BLOCK_TIMEOUT까지 기다린 뒤 버림
+API_LOG_BATCH_SIZE = 500
+API_LOG_FLUSH_INTERVAL = 1.0  # 초
+API_LOG_MAX_QUEUE = 10000
+API_LOG_OVERFLOW = 'drop'
+API_LOG_BLOCK_TIMEOUT = 0.05  # 초
+
+
+# 캐시 TTL 정책 (market.ttl_policy) - 키 접두사별로 덮어쓰기
+#   {'product:': {'ttl': 600, 'model': 'market.product', 'reference_rate': 10, 'min_ttl': 5}}
+CACHE_TTL_POLICIES = {}
+CACHE_TTL_JITTER = 0.1  # TTL ± 10% → 한꺼번에 쓴 키들이 한꺼번에 만료되지 않음
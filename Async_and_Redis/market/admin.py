@@ -1,3 +1,61 @@
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
 
-# Register your models here.
+from market.models import APILog, Order, OrderItem
+from market.pagination import InvalidCursor, KeysetPaginator
+
+
+class KeysetChangeList(ChangeList):
+    """
+    변경 목록을 (created_at, id) 키셋으로 페이지네이션 (market.pagination)
+    - ?p=<커서> - 페이지 번호 대신 커서, 필터 / 검색 조건은 그대로 유지
+    - COUNT(*)와 OFFSET 없음 → 수백만 행이어도 몇 번째 페이지든 같은 비용
+    """
+
+    def get_results(self, request):
+        try:
+            page = KeysetPaginator(self.queryset, per_page=self.list_per_page).page(request.GET.get(PAGE_VAR))
+        except InvalidCursor:
+            raise IncorrectLookupParameters
+
+        self.result_list = page.object_list
+        self.result_count = len(page)
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = False  # 페이지 번호 링크 대신 이전 / 다음 (pagination.html)
+        self.paginator = None
+        self.next_url = self.get_query_string({PAGE_VAR: page.next_cursor}) if page.has_next else None
+        self.previous_url = self.get_query_string({PAGE_VAR: page.previous_cursor}) if page.has_previous else None
+
+
+class KeysetPaginationAdmin(admin.ModelAdmin):
+    """최신순 고정 - 열 제목 정렬은 키셋 순서와 맞지 않으므로 끔"""
+    sortable_by = ()
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    raw_id_fields = ('product',)
+    extra = 0
+
+
+@admin.register(Order)
+class OrderAdmin(KeysetPaginationAdmin):
+    list_display = ('id', 'user', 'status', 'item_count', 'total_amount', 'created_at')
+    list_filter = ('status',)
+    raw_id_fields = ('user',)
+    readonly_fields = ('item_count', 'items_total')
+    list_select_related = ('user',)
+    inlines = (OrderItemInline,)
+
+
+@admin.register(APILog)
+class APILogAdmin(KeysetPaginationAdmin):
+    list_display = ('id', 'method', 'endpoint', 'status_code', 'response_time', 'created_at')
@@ -0,0 +1,259 @@
+"""
+APILog 비동기 일괄 기록
+
+이전 방식:
+    외부 API를 호출할 때마다 APILog.objects.create(...)
+    → 요청마다 INSERT 1번 + 커밋 1번 (SQLite는 커밋마다 파일 동기화 + DB 파일 전체 쓰기 락)
+    → 로그 쓰기가 느려지면 요청도 같이 느려짐
+
+현재 방식:
+    1. 기록: log()는 메모리 큐에 넣기만 하고 바로 반환 (DB 접근 없음)
+    2. 쓰기: 백그라운드 스레드(ASGI에서는 asyncio 태스크)가
+            API_LOG_BATCH_SIZE개가 모이거나 API_LOG_FLUSH_INTERVAL이 지나면
+            bulk_create 1번 = INSERT 1번 + 커밋 1번으로 반영
+    3. 종료: 프로세스 종료(atexit) 시 큐에 남은 로그를 모두 씀
+
+메모리 상한 (API_LOG_MAX_QUEUE):
+    DB가 느려져 큐가 가득 차면 API_LOG_OVERFLOW 정책에 따라
+    - 'drop':  새 로그를 버림 (요청 지연 없음)
+    - 'block': API_LOG_BLOCK_TIMEOUT까지 자리가 나길 기다린 뒤 그래도 가득 차면 버림
+    버린 개수는 writer.dropped, 쓰기 실패로 잃은 개수는 writer.failed
+
+주의:
+    - created_at(auto_now_add)은 호출 시각이 아니라 DB에 쓴 시각 (최대 API_LOG_FLUSH_INTERVAL 늦음)
+      같은 배치 안에서는 id가 호출 순서
+    - 강제 종료(SIGKILL)되면 아직 쓰지 않은 로그(최대 한 주기 분량)는 사라짐
+
+사용:
+    from market.api_log_writer import api_log_writer
+    api_log_writer.log('/api/payments', 'POST', 200, 0.231)
+
+    async def view(request):                     # ASGI
+        await async_api_log_writer().log('/api/payments', 'POST', 200, 0.231)
+
+settings:
+    API_LOG_BATCH_SIZE = 500
+    API_LOG_FLUSH_INTERVAL = 1.0    # 초
+    API_LOG_MAX_QUEUE = 10000
+    API_LOG_OVERFLOW = 'drop'       # 'drop' | 'block'
+    API_LOG_BLOCK_TIMEOUT = 0.05    # 초 ('block'일 때)
+"""
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+import weakref
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+DROP = 'drop'
+BLOCK = 'block'
+
+
+def _options():
+    return {
+        'batch_size': getattr(settings, 'API_LOG_BATCH_SIZE', 500),
+        'flush_interval': getattr(settings, 'API_LOG_FLUSH_INTERVAL', 1.0),
+        'max_queue': getattr(settings, 'API_LOG_MAX_QUEUE', 10000),
+        'overflow': getattr(settings, 'API_LOG_OVERFLOW', DROP),
+        'block_timeout': getattr(settings, 'API_LOG_BLOCK_TIMEOUT', 0.05),
+    }
+
+
+def _record(endpoint, method, status_code, response_time):
+    from market.models import APILog
+    return APILog(endpoint=endpoint, method=method, status_code=status_code, response_time=response_time)
+
+
+class _BaseWriter:
+
+    def __init__(self, batch_size=500, flush_interval=1.0, max_queue=10000, overflow=DROP, block_timeout=0.05):
+        if overflow not in (DROP, BLOCK):
+            raise ValueError(f"overflow는 'drop' 또는 'block': {overflow!r}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _drain(self, limit):
+        """큐에서 최대 limit개를 꺼냄 (기다리지 않음)"""
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except (queue.Empty, asyncio.QueueEmpty):
+                break
+        return batch
+
+    def _write(self, batch):
+        """INSERT 1번 (+ 커밋 1번) - 실패하면 그 배치는 버림 (다시 넣으면 큐가 계속 가득 참)"""
+        from market.models import APILog
+
+        try:
+            APILog.objects.bulk_create(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.warning('api log batch write failed (%d records dropped)', len(batch), exc_info=True)
+            return 0
+        self.written += len(batch)
+        return len(batch)
+
+    def pending(self):
+        return self._queue.qsize()
+
+
+class APILogWriter(_BaseWriter):
+    """스레드 버전 (WSGI / 관리 명령 / 스크립트)"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+
+    def log(self, endpoint, method, status_code, response_time):
+        """큐에 넣고 바로 반환 → 버렸으면 False"""
+        self._start_flusher()
+        record = _record(endpoint, method, status_code, response_time)
+        try:
+            if self.overflow == BLOCK:
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()  # 주기를 기다리지 않고 바로 씀
+        return True
+
+    def flush(self):
+        """큐에 있는 로그를 batch_size씩 모두 씀 → 쓴 개수"""
+        written = 0
+        with self._flush_lock:
+            while batch := self._drain(self.batch_size):
+                written += self._write(batch)
+        return written
+
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name='api-log-writer', daemon=True)
+            self._flusher.start()
+            atexit.register(self._flush_quietly)
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush_quietly()
+
+    def _flush_quietly(self):
+        from django.db import close_old_connections
+
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+
+class AsyncAPILogWriter(_BaseWriter):
+    """
+    asyncio 버전 (ASGI) - 이벤트 루프 하나에 하나 (async_api_log_writer())
+    쓰기는 sync_to_async로 ORM 스레드에서 (이벤트 루프는 막지 않음)
+    종료: 서버 종료 훅에서 await writer.aclose() / 못 했으면 atexit에서 남은 로그를 동기로 씀
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        atexit.register(self._flush_at_exit)
+
+    async def log(self, endpoint, method, status_code, response_time):
+        """큐에 넣고 바로 반환 → 버렸으면 False ('block'이면 자리가 날 때까지 최대 block_timeout 대기)"""
+        self._start_task()
+        record = _record(endpoint, method, status_code, response_time)
+        try:
+            if self.overflow == BLOCK:
+                await asyncio.wait_for(self._queue.put(record), self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.dropped += 1
+            return False
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    async def flush(self):
+        from asgiref.sync import sync_to_async
+
+        written = 0
+        async with self._flush_lock:
+            while batch := self._drain(self.batch_size):
+                written += await sync_to_async(self._write)(batch)
+        return written
+
+    async def aclose(self):
+        """태스크를 멈추고 남은 로그를 모두 씀"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return await self.flush()
+
+    def _start_task(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop(), name='api-log-writer')
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.warning('api log flush failed', exc_info=True)
+
+    def _flush_at_exit(self):
+        # 이벤트 루프는 이미 닫혔음 → 남은 로그를 이 스레드에서 바로 씀
+        while batch := self._drain(self.batch_size):
+            self._write(batch)
+
+
+_async_writers = weakref.WeakKeyDictionary()
+
+
+def async_api_log_writer():
+    """실행 중인 이벤트 루프의 AsyncAPILogWriter (asyncio.Queue는 루프 하나에 묶임)"""
+    loop = asyncio.get_running_loop()
+    writer = _async_writers.get(loop)
+    if writer is None:
+        writer = _async_writers[loop] = AsyncAPILogWriter(**_options())
+    return writer
+
+
+api_log_writer = APILogWriter(**_options())
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MarketConfig(AppConfig):
     name = 'market'
+
+    def ready(self):
+        from market import signals  # noqa: F401 - 캐시 무효화 시그널 등록
@@ -0,0 +1,484 @@
+"""
+asyncio 캐시 클라이언트 (redis.asyncio)
+
+async 뷰에서 django.core.cache를 쓰면:
+    - cache.get(...)                  → 이벤트 루프 블로킹 (그동안 다른 요청 모두 정지)
+    - await sync_to_async(cache.get)  → 요청마다 스레드 이동
+                                         (thread_sensitive=True면 스레드 1개에 줄 서기)
+    - await cache.aget(...)           → Django 기본 구현도 결국 sync_to_async
+
+acache:
+    redis.asyncio 클라이언트로 이벤트 루프 안에서 바로 await
+    키 생성(make_key) / 직렬화 / 압축은 기본 캐시 클라이언트의 것을 그대로 사용
+        → 동기 코드가 저장한 값을 async 코드가 읽을 수 있고 그 반대도 가능
+
+    연결 풀은 이벤트 루프마다 따로 생성 (redis.asyncio 연결은 루프에 묶임)
+    동시 요청이 ASYNC_MAX_CONNECTIONS를 넘으면 연결이 반납될 때까지 대기
+
+settings.CACHES['default']['OPTIONS']:
+    "ASYNC_MAX_CONNECTIONS": 50,
+    "ASYNC_CONNECTION_POOL_KWARGS": {...},   # redis.asyncio.BlockingConnectionPool 인자
+
+위에 올린 async 헬퍼 (동기 버전과 같은 키/형식):
+    aget_products / aget_product       Cache-Aside (market.product_cache)
+    aget_cached_data                   태그 기반 캐시 (market.tag_cache)
+    aget_or_set_locked                 스탬피드 방지 락 (market.cache_lock)
+"""
+import asyncio
+import inspect
+import json
+import time
+import uuid
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from market.cache_lock import LOCK_RELEASED_CHANNEL
+from market.ttl_policy import ttl_for
+
+
+def _options():
+    return settings.CACHES['default'].get('OPTIONS', {})
+
+
+def _location():
+    from market.local_redis import server_url
+
+    location = settings.CACHES['default']['LOCATION']
+    location = location[0] if isinstance(location, (list, tuple)) else location.split(',')[0]
+    return server_url(location)  # local:// → 로컬 서버 소켓
+
+
+async def _resolve(value):
+    """fetch_func가 코루틴 함수여도, 동기 함수여도 동작"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncCachePipeline:
+    """
+    명령을 모았다가 왕복 1번으로 실행 (키/값 변환 포함)
+
+        async with acache.pipeline() as pipe:
+            pipe.get('product:1')
+            pipe.set('product:2', data, 300)
+            results = await pipe.execute()   # [값, True]
+    """
+
+    def __init__(self, acache, pipe):
+        self._acache = acache
+        self._pipe = pipe
+        self._decoders = []
+
+    def get(self, key):
+        self._pipe.get(self._acache.make_key(key))
+        self._decoders.append(self._acache.decode)
+        return self
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, nx=False):
+        self._acache._queue_set(self._pipe, key, value, timeout, nx=nx)
+        self._decoders.append(bool)
+        return self
+
+    def delete(self, *keys):
+        self._pipe.delete(*(self._acache.make_key(key) for key in keys))
+        self._decoders.append(int)
+        return self
+
+    def incr(self, key, delta=1):
+        self._pipe.incrby(self._acache.make_key(key), delta)
+        self._decoders.append(int)
+        return self
+
+    async def execute(self):
+        decoders, self._decoders = self._decoders, []
+        results = await self._pipe.execute()
+        return [decode(result) for decode, result in zip(decoders, results)]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._pipe.reset()
+
+
+class AsyncCache:
+
+    def __init__(self):
+        self._clients = weakref.WeakKeyDictionary()  # 이벤트 루프 → redis.asyncio.Redis
+
+    # ------------------------------------------------------------------
+    # 연결 / 키 / 직렬화
+    # ------------------------------------------------------------------
+
+    def get_client(self):
+        import redis.asyncio as aioredis
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            options = _options()
+            # 연결이 모두 사용 중이면 예외 대신 반납될 때까지 대기
+            pool = aioredis.BlockingConnectionPool.from_url(
+                _location(),
+                max_connections=options.get('ASYNC_MAX_CONNECTIONS', 50),
+                **options.get('ASYNC_CONNECTION_POOL_KWARGS', {}),
+            )
+            client = self._clients[loop] = aioredis.Redis(connection_pool=pool)
+        return client
+
+    def make_key(self, key):
+        return cache.make_key(key)
+
+    def encode(self, value):
+        return cache.client.encode(value)
+
+    def decode(self, value):
+        return None if value is None else cache.client.decode(value)
+
+    def _timeout(self, key, timeout):
+        return ttl_for(key) if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _queue_set(self, client, key, value, timeout, nx=False):
+        timeout = self._timeout(key, timeout)
+        redis_key = self.make_key(key)
+        if timeout is not None and timeout <= 0:
+            # django_redis와 동일: 0 이하 = 즉시 만료
+            return client.delete(redis_key)
+        px = None if timeout is None else int(timeout * 1000)
+        return client.set(redis_key, self.encode(value), px=px, nx=nx)
+
+    # ------------------------------------------------------------------
+    # 캐시 API
+    # ------------------------------------------------------------------
+
+    async def aget(self, key, default=None):
+        value = await self.get_client().get(self.make_key(key))
+        return default if value is None else self.decode(value)
+
+    async def aget_many(self, keys):
+        """{key: 값} - 없는 키는 빠짐 (MGET 1번)"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = await self.get_client().mget([self.make_key(key) for key in keys])
+        return {key: self.decode(value) for key, value in zip(keys, values) if value is not None}
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, nx=False):
+        return bool(await self._queue_set(self.get_client(), key, value, timeout, nx=nx))
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return await self.aset(key, value, timeout, nx=True)
+
+    async def aset_many(self, data, timeout=DEFAULT_TIMEOUT):
+        """키마다 TTL 정책을 적용해 파이프라인 1번으로 저장"""
+        if not data:
+            return
+        async with self.get_client().pipeline(transaction=False) as pipe:
+            for key, value in data.items():
+                self._queue_set(pipe, key, value, timeout)
+            await pipe.execute()
+
+    async def adelete(self, *keys):
+        if not keys:
+            return 0
+        return await self.get_client().delete(*(self.make_key(key) for key in keys))
+
+    async def aincr(self, key, delta=1):
+        return await self.get_client().incrby(self.make_key(key), delta)
+
+    def pipeline(self, transaction=False):
+        return AsyncCachePipeline(self, self.get_client().pipeline(transaction=transaction))
+
+    async def aclose(self):
+        """현재 이벤트 루프의 연결 풀 정리"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose(close_connection_pool=True)
+
+
+acache = AsyncCache()
+
+
+# ----------------------------------------------------------------------
+# Cache-Aside (market.product_cache와 같은 키 / 형식)
+# ----------------------------------------------------------------------
+
+async def aget_products(product_ids):
+    """여러 상품을 한 번에 조회 - 입력 순서 그대로 반환 (없는 상품은 None)"""
+    from market.models import Product
+    from market.product_cache import ABSENT, PRODUCT_PAYLOAD_FIELDS, product_key, product_payload
+    from market.tiered_cache import product_cache
+
+    product_ids = list(product_ids)
+    keys = {product_id: product_key(product_id) for product_id in product_ids}
+
+    # L1은 프로세스 메모리라 I/O 없음
+    cached = {}
+    for key in keys.values():
+        value = product_cache.local.get(key, None)
+        if value is not None:
+            cached[key] = value
+
+    # 읽는 동안 무효화가 처리됐으면 L1을 채우지 않음 (market.tiered_cache.LocalLRUCache.generation)
+    generation = product_cache.local.generation
+    remaining = [key for key in keys.values() if key not in cached]
+    if remaining:
+        found = await acache.aget_many(remaining)
+        for key, value in found.items():
+            product_cache.local.set(key, value, generation=generation)
+        cached.update(found)
+
+    missing = [product_id for product_id, key in keys.items() if key not in cached]
+    if missing:
+        fetched = {
+            product_key(p.id): product_payload(p)
+            async for p in Product.objects.filter(id__in=missing).only(*PRODUCT_PAYLOAD_FIELDS)
+        }
+        absent = {keys[product_id]: ABSENT for product_id in missing if keys[product_id] not in fetched}
+
+        await acache.aset_many(fetched)
+        await acache.aset_many(absent, ttl_for('absent:'))
+        for key, value in fetched.items():
+            product_cache.local.set(key, value, generation=generation)
+        cached.update(fetched)
+        cached.update(absent)
+
+    result = []
+    for product_id in product_ids:
+        data = cached.get(keys[product_id])
+        result.append(None if data == ABSENT else data)
+    return result
+
+
+async def aget_product(product_id):
+    return (await aget_products([product_id]))[0]
+
+
+# ----------------------------------------------------------------------
+# 태그 기반 캐시 (market.tag_cache와 같은 키 / 형식)
+# ----------------------------------------------------------------------
+
+async def aget_tag_versions(tags):
+    from market.tag_cache import tag_version_key
+
+    found = await acache.aget_many([tag_version_key(tag) for tag in tags])
+    return {tag: int(found.get(tag_version_key(tag), 0)) for tag in tags}
+
+
+async def aget_cached_data(cache_key, tags, fetch_func, ttl=None):
+    """태그 버전 + 값을 MGET 1번으로 조회, 버전이 다르면 다시 가져와 저장"""
+    from market.tag_cache import tag_version_key
+
+    if isinstance(tags, str):
+        tags = [tags]
+
+    found = await acache.aget_many([tag_version_key(tag) for tag in tags] + [cache_key])
+    versions = {tag: int(found.get(tag_version_key(tag), 0)) for tag in tags}
+
+    entry = found.get(cache_key)
+    if entry is not None and entry['tags'] == versions:
+        return entry['data']
+
+    data = await _resolve(fetch_func())
+    await acache.aset(cache_key, {'tags': versions, 'data': data}, ttl_for(cache_key) if ttl is None else ttl)
+    return data
+
+
+async def ainvalidate_tags(*tags):
+    from market.tag_cache import TAG_GENERATION_KEY, tag_version_key
+
+    if not tags:
+        return {}
+    async with acache.pipeline(transaction=True) as pipe:
+        for tag in tags:
+            pipe.incr(tag_version_key(tag))
+        pipe.incr(TAG_GENERATION_KEY)
+        new_versions = dict(zip(tags, await pipe.execute()))
+
+    # 동기 경로의 핫 키 복제본 제거 + 다른 Worker에 방송 (market.tag_cache.invalidate_tags와 같음)
+    from market.hot_keys import hot_keys
+    from market.tiered_cache import product_cache
+
+    hot = hot_keys.forget([tag_version_key(tag) for tag in tags], broadcast=False)
+    if hot:
+        await acache.get_client().publish(product_cache.channel, json.dumps(hot))
+    return new_versions
+
+
+# ----------------------------------------------------------------------
+# 스탬피드 방지 락 (market.cache_lock과 같은 락 키 / 해제 채널)
+# ----------------------------------------------------------------------
+
+class AsyncRedisLock:
+    """SET NX PX 기반 분산 락 - 동기 RedisLock과 서로 배타적"""
+
+    def __init__(self, name, timeout=10.0):
+        self.key = cache.make_key(f'lock:{name}')
+        self.timeout_ms = int(timeout * 1000)
+        self.token = None
+
+    async def acquire(self):
+        token = uuid.uuid4().hex
+        if await acache.get_client().set(self.key, token, nx=True, px=self.timeout_ms):
+            self.token = token
+            return True
+        return False
+
+    async def release(self):
+        """내 토큰일 때만 삭제 (WATCH/MULTI)"""
+        from redis.exceptions import WatchError
+
+        if self.token is None:
+            return False
+
+        token, self.token = self.token, None
+        async with acache.get_client().pipeline() as pipe:
+            try:
+                await pipe.watch(self.key)
+                current = await pipe.get(self.key)
+                if current is None or current.decode() != token:
+                    await pipe.unwatch()
+                    return False
+
+                pipe.multi()
+                pipe.delete(self.key)
+                await pipe.execute()
+                return True
+
+            except WatchError:
+                return False
+
+
+class AsyncLockNotifier:
+    """
+    락 해제 알림 수신기 (이벤트 루프당 구독 연결 1개)
+
+    동기 LockNotifier와 같은 채널 → 동기/async 어느 쪽이 해제해도 대기자가 깨어남
+    """
+
+    def __init__(self, channel=LOCK_RELEASED_CHANNEL):
+        self.channel = channel
+        self._waiters = {}  # key -> asyncio.Event 집합
+        self._listeners = weakref.WeakKeyDictionary()  # 이벤트 루프 → 구독 태스크
+
+    async def notify(self, key):
+        await acache.get_client().publish(self.channel, key)
+
+    async def register(self, key):
+        await self._ensure_listener()
+        event = asyncio.Event()
+        self._waiters.setdefault(key, set()).add(event)
+        return event
+
+    def unregister(self, key, event):
+        events = self._waiters.get(key)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            del self._waiters[key]
+
+    def _wake(self, key):
+        for event in self._waiters.get(key, ()):
+            event.set()
+
+    def _wake_all(self):
+        for events in self._waiters.values():
+            for event in events:
+                event.set()
+
+    async def _ensure_listener(self):
+        loop = asyncio.get_running_loop()
+        task = self._listeners.get(loop)
+        if task is not None and not task.done():
+            return
+
+        ready = asyncio.Event()
+        self._listeners[loop] = loop.create_task(self._listen(ready))
+        # 구독이 끝나기 전에 발행된 알림을 놓치지 않도록 대기
+        try:
+            await asyncio.wait_for(ready.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _listen(self, ready):
+        while True:
+            pubsub = acache.get_client().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                ready.set()
+                async for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        data = message['data']
+                        self._wake(data.decode() if isinstance(data, bytes) else data)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                # 연결 끊김 → 대기자 모두 깨워서 캐시 재확인하게 함
+                ready.set()
+                self._wake_all()
+                await asyncio.sleep(1)
+
+            finally:
+                await pubsub.aclose()
+
+
+async_notifier = AsyncLockNotifier()
+
+
+async def aget_or_set_locked(cache_key, fetch_func, ttl=None, lock_timeout=10.0, wait_timeout=None):
+    """
+    Redis 락으로 보호되는 get_or_set (market.cache_lock.get_or_set_locked의 async 버전)
+
+    대기자는 이벤트 루프를 막지 않고 해제 알림을 await
+    """
+    data = await acache.aget(cache_key)
+    if data is not None:
+        return data
+
+    ttl = ttl_for(cache_key) if ttl is None else ttl
+    wait_timeout = lock_timeout if wait_timeout is None else wait_timeout
+    lock = AsyncRedisLock(cache_key, timeout=lock_timeout)
+    deadline = time.monotonic() + wait_timeout
+
+    while True:
+        if await lock.acquire():
+            try:
+                # 2차 확인: 다른 프로세스가 방금 채웠을 수 있음
+                data = await acache.aget(cache_key)
+                if data is None:
+                    data = await _resolve(fetch_func())
+                    await acache.aset(cache_key, data, ttl)
+                return data
+            finally:
+                await lock.release()
+                await async_notifier.notify(cache_key)
+
+        # 알림을 놓치지 않도록 등록 후 캐시 재확인
+        event = await async_notifier.register(cache_key)
+        try:
+            data = await acache.aget(cache_key)
+            if data is not None:
+                return data
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # 대기 한도 초과 → 직접 계산 (가용성 우선)
+                return await _resolve(fetch_func())
+
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, lock_timeout))
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            async_notifier.unregister(cache_key, event)
+
+        data = await acache.aget(cache_key)
+        if data is not None:
+            return data
@@ -0,0 +1,150 @@
+"""
+존재하는 Product id의 Bloom 필터 (Redis 비트맵)
+
+    might_contain(id) == False → 절대 없는 id → 캐시/DB 조회 없이 바로 None
+    might_contain(id) == True  → 있을 수도 있음 (오탐률 ERROR_RATE)
+
+    - 생성: post_save(created) 시그널 / bulk_create에서 비트 추가
+            필터가 있을 때만 추가 (없는 필터에 추가하면 그 id만 든 필터가 생겨 나머지를 모두 거름)
+            bulk_create로 id를 알 수 없으면 (ignore_conflicts 등) 필터를 지움 → 재구축 전까지 fail-open
+    - 삭제: Bloom 필터는 비트를 지울 수 없으므로 삭제 수를 세다가
+            REBUILD_AFTER_DELETES를 넘으면 전체 재구축
+    - 필터가 아직 없으면 모든 id를 통과시킴 (fail-open)
+
+settings.PRODUCT_BLOOM_FILTER = True 일 때만 사용
+"""
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+CAPACITY = 1_000_000
+ERROR_RATE = 0.01
+REBUILD_AFTER_DELETES = 10_000
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+class ProductBloomFilter:
+
+    def __init__(self, name='products', capacity=CAPACITY, error_rate=ERROR_RATE):
+        self.key = cache.make_key(f'bloom:{name}')
+        self.deleted_key = cache.make_key(f'bloom:{name}:deleted')
+
+        # m = -n·ln(p) / (ln 2)²,  k = (m / n)·ln 2
+        self.size = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'PRODUCT_BLOOM_FILTER', False)
+
+    def _offsets(self, product_id):
+        # 이중 해싱: h1 + i·h2
+        digest = hashlib.blake2b(str(product_id).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, *product_ids):
+        """필터가 있을 때만 비트 추가 (EXISTS와 SETBIT 사이에 지워지지 않도록 WATCH) → 추가했으면 True"""
+        from redis.exceptions import WatchError
+
+        if not product_ids:
+            return False
+        with _redis().pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.key)
+                    if not pipe.exists(self.key):
+                        pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    for product_id in product_ids:
+                        for offset in self._offsets(product_id):
+                            pipe.setbit(self.key, offset, 1)
+                    pipe.execute()
+                    return True
+                except WatchError:
+                    continue  # 그 사이 다른 Worker가 추가 / 재구축
+
+    def clear(self):
+        """필터를 지움 → 재구축 전까지 모든 id 통과 (fail-open)"""
+        _redis().delete(self.key)
+
+    def might_contain_many(self, product_ids):
+        """{id: bool} - 왕복 1번 (필터가 없으면 모두 True)"""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+
+        with _redis().pipeline(transaction=False) as pipe:
+            pipe.exists(self.key)
+            for product_id in product_ids:
+                for offset in self._offsets(product_id):
+                    pipe.getbit(self.key, offset)
+            results = pipe.execute()
+
+        if not results[0]:
+            return {product_id: True for product_id in product_ids}
+
+        bits = results[1:]
+        return {
+            product_id: all(bits[i * self.hashes:(i + 1) * self.hashes])
+            for i, product_id in enumerate(product_ids)
+        }
+
+    def might_contain(self, product_id):
+        return self.might_contain_many([product_id])[product_id]
+
+    def record_delete(self, count=1):
+        """삭제 수 누적 → 재구축이 필요하면 True"""
+        return _redis().incrby(self.deleted_key, count) >= REBUILD_AFTER_DELETES
+
+    def rebuild(self, chunk_size=10_000):
+        """
+        전체 id로 새 비트맵을 만들어 원자적으로 교체 (RENAME)
+
+        로컬에서 비트 배열을 만든 뒤 SET 1번 → 수백만 번의 SETBIT 왕복 없음
+        """
+        from market.models import Product
+
+        bits = bytearray((self.size + 7) // 8)
+        count = max_id = 0
+        for product_id in Product.objects.values_list('id', flat=True).order_by('id').iterator(chunk_size=chunk_size):
+            for offset in self._offsets(product_id):
+                bits[offset >> 3] |= 0x80 >> (offset & 7)  # Redis 비트 순서 (MSB 우선)
+            count += 1
+            max_id = product_id
+
+        tmp_key = f'{self.key}:rebuild'
+        conn = _redis()
+        conn.set(tmp_key, bytes(bits))
+        with conn.pipeline(transaction=True) as pipe:
+            pipe.rename(tmp_key, self.key)
+            pipe.delete(self.deleted_key)
+            pipe.execute()
+
+        # 재구축 도중 생성된 상품은 교체 전 비트맵에만 추가되었으므로 다시 추가
+        self.add(*Product.objects.filter(id__gt=max_id).values_list('id', flat=True))
+        return count
+
+
+product_bloom = ProductBloomFilter()
+
+
+def products_created(products, using=None):
+    """bulk_create 이후 (ProductQuerySet.bulk_create) - 커밋되면 필터에 추가"""
+    if not product_bloom.enabled or not products:
+        return
+    ids = [product.pk for product in products]
+    if None in ids:
+        transaction.on_commit(product_bloom.clear, using=using)
+    else:
+        transaction.on_commit(lambda: product_bloom.add(*ids), using=using)
@@ -0,0 +1,122 @@
+"""
+캐시 백엔드
+
+InstrumentedRedisCache:
+    django_redis.cache.RedisCache + 접두사별 계측 (market.cache_metrics)
+                                  + 핫 키 감지 / 프로세스 내 복제 (market.hot_keys)
+    get_redis_connection()은 그대로 동작함.
+
+settings.CACHES['default']['BACKEND'] = 'market.cache_backends.InstrumentedRedisCache'
+"""
+import time
+
+from django_redis.cache import RedisCache
+
+from market.cache_metrics import recorder
+from market.hot_keys import hot_keys
+
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """get/set/delete 계열 호출을 접두사별로 기록 + 핫 키는 복제본에서 응답"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        recorder.backend = self
+        hot_keys.backend = self
+
+    def _encode_for_size(self, value):
+        return self.client.encode(value, allow_int=False)
+
+    def get(self, key, default=None, **kwargs):
+        start = time.perf_counter()
+        hot_keys.record(key)
+
+        if hot_keys.is_hot(key):
+            value = hot_keys.get_replica(key, _MISSING)
+            if value is not _MISSING:
+                recorder.record('get', key, time.perf_counter() - start, hits=1)
+                return value
+
+        value = super().get(key, _MISSING, **kwargs)
+        hit = value is not _MISSING
+        recorder.record('get', key, time.perf_counter() - start, hits=int(hit), misses=int(not hit))
+        if not hit:
+            return default
+        hot_keys.store_replica(key, value)
+        recorder.maybe_record_size(key, value, self._encode_for_size)
+        return value
+
+    def get_many(self, keys, **kwargs):
+        keys = list(keys)
+        start = time.perf_counter()
+
+        found = {}
+        for key in keys:
+            hot_keys.record(key)
+            if hot_keys.is_hot(key):
+                value = hot_keys.get_replica(key, _MISSING)
+                if value is not _MISSING:
+                    found[key] = value
+
+        remaining = [key for key in keys if key not in found]
+        if remaining:
+            fetched = super().get_many(remaining, **kwargs)
+            for key, value in fetched.items():
+                hot_keys.store_replica(key, value)
+            found.update(fetched)
+
+        elapsed = time.perf_counter() - start
+        for key in keys:
+            hit = key in found
+            recorder.record('get', key, elapsed / len(keys), hits=int(hit), misses=int(not hit))
+        return found
+
+    def set(self, key, value, *args, **kwargs):
+        start = time.perf_counter()
+        result = super().set(key, value, *args, **kwargs)
+        recorder.record('set', key, time.perf_counter() - start)
+        recorder.maybe_record_size(key, value, self._encode_for_size)
+        hot_keys.forget([key])
+        return result
+
+    def set_many(self, data, *args, **kwargs):
+        start = time.perf_counter()
+        result = super().set_many(data, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        for key, value in data.items():
+            recorder.record('set', key, elapsed / len(data))
+            recorder.maybe_record_size(key, value, self._encode_for_size)
+        hot_keys.forget(data)
+        return result
+
+    def add(self, key, value, *args, **kwargs):
+        start = time.perf_counter()
+        result = super().add(key, value, *args, **kwargs)
+        recorder.record('set', key, time.perf_counter() - start)
+        if result:
+            hot_keys.forget([key])
+        return result
+
+    def delete(self, key, *args, **kwargs):
+        start = time.perf_counter()
+        result = super().delete(key, *args, **kwargs)
+        recorder.record('delete', key, time.perf_counter() - start)
+        hot_keys.forget([key])
+        return result
+
+    def delete_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        start = time.perf_counter()
+        result = super().delete_many(keys, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        for key in keys:
+            recorder.record('delete', key, elapsed / len(keys))
+        hot_keys.forget(keys)
+        return result
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    pass
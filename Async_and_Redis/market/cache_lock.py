@@ -0,0 +1,221 @@
+"""
+프로세스 간 캐시 스탬피드 방지 락
+
+threading.Lock은 한 프로세스 안의 스레드만 막음.
+    → gunicorn Worker 9개 = 여전히 DB 재계산 9번
+
+Redis 락 (SET NX PX + 토큰):
+    - SET lock:key <token> NX PX <ms>  → 한 프로세스만 획득
+    - PX 만료 → 락 보유 Worker가 죽어도 자동 해제
+    - 토큰 비교 후 삭제 → 남의 락을 지우지 않음 (WATCH/MULTI, Lua 불필요)
+
+대기자는 cache.get을 반복 호출(spin)하지 않고,
+락 해제 알림(pub/sub)을 받을 때까지 블록됨.
+"""
+import os
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+
+LOCK_RELEASED_CHANNEL = 'cache:lock-released'
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+class RedisLock:
+    """SET NX PX 기반 분산 락"""
+
+    def __init__(self, name, timeout=10.0):
+        self.key = cache.make_key(f'lock:{name}')
+        self.timeout_ms = int(timeout * 1000)
+        self.token = None
+
+    def acquire(self):
+        token = uuid.uuid4().hex
+        if _redis().set(self.key, token, nx=True, px=self.timeout_ms):
+            self.token = token
+            return True
+        return False
+
+    def release(self):
+        """내 토큰일 때만 삭제 (만료 후 다른 프로세스가 잡은 락은 건드리지 않음)"""
+        if self.token is None:
+            return False
+
+        token, self.token = self.token, None
+        conn = _redis()
+
+        with conn.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                current = pipe.get(self.key)
+                if current is None or current.decode() != token:
+                    pipe.unwatch()
+                    return False
+
+                pipe.multi()
+                pipe.delete(self.key)
+                pipe.execute()
+                return True
+
+            except Exception:
+                # WATCH 충돌 = 그 사이 락이 만료되어 다른 프로세스 소유가 됨
+                return False
+
+    def is_locked(self):
+        return bool(_redis().exists(self.key))
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class LockNotifier:
+    """
+    락 해제 알림 수신기 (프로세스당 구독 연결 1개)
+
+    대기 중인 키만 _waiters에 등록되고, 마지막 대기자가 빠지면 삭제됨.
+        → 클래스 변수 dict가 끝없이 커지던 문제 해결
+    """
+
+    def __init__(self, channel=LOCK_RELEASED_CHANNEL):
+        self.channel = channel
+        self._waiters = {}  # key -> 대기 중인 threading.Event 집합
+        self._lock = threading.Lock()
+        self._listener_pid = None
+
+    def notify(self, key):
+        _redis().publish(self.channel, key)
+
+    def register(self, key):
+        self._ensure_listener()
+        event = threading.Event()
+        with self._lock:
+            self._waiters.setdefault(key, set()).add(event)
+        return event
+
+    def unregister(self, key, event):
+        with self._lock:
+            events = self._waiters.get(key)
+            if events is None:
+                return
+            events.discard(event)
+            if not events:
+                del self._waiters[key]
+
+    def pending(self):
+        return len(self._waiters)
+
+    def _wake(self, key):
+        with self._lock:
+            events = list(self._waiters.get(key, ()))
+        for event in events:
+            event.set()
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._waiters = {}
+
+            ready = threading.Event()
+            threading.Thread(
+                target=self._listen,
+                args=(ready,),
+                name=f'lock-notifier-{pid}',
+                daemon=True,
+            ).start()
+
+        # 구독이 끝나기 전에 발행된 알림을 놓치지 않도록 대기
+        ready.wait(timeout=1)
+
+    def _listen(self, ready):
+        while True:
+            try:
+                pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                ready.set()
+
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        data = message['data']
+                        self._wake(data.decode() if isinstance(data, bytes) else data)
+
+            except Exception:
+                # 연결 끊김 → 대기자 모두 깨워서 캐시 재확인하게 함
+                ready.set()
+                with self._lock:
+                    events = [e for waiting in self._waiters.values() for e in waiting]
+                for event in events:
+                    event.set()
+                time.sleep(1)
+
+
+notifier = LockNotifier()
+
+
+def get_or_set_locked(cache_key, fetch_func, ttl=None, lock_timeout=10.0, wait_timeout=None):
+    """
+    Redis 락으로 보호되는 get_or_set
+
+        1. 캐시 확인
+        2. 락 획득 성공 → 재계산 → 저장 → 해제 알림
+        3. 락 획득 실패 → 해제 알림까지 블록 → 캐시 재확인
+           (락 보유자가 죽어 락이 만료되면 재획득 시도)
+    """
+    data = cache.get(cache_key)
+    if data is not None:
+        return data
+
+    from market.ttl_policy import ttl_for
+
+    ttl = ttl_for(cache_key) if ttl is None else ttl
+    wait_timeout = lock_timeout if wait_timeout is None else wait_timeout
+    lock = RedisLock(cache_key, timeout=lock_timeout)
+    deadline = time.monotonic() + wait_timeout
+
+    while True:
+        if lock.acquire():
+            try:
+                # 2차 확인: 다른 프로세스가 방금 채웠을 수 있음
+                data = cache.get(cache_key)
+                if data is None:
+                    data = fetch_func()
+                    cache.set(cache_key, data, ttl)
+                return data
+            finally:
+                lock.release()
+                notifier.notify(cache_key)
+
+        # 알림을 놓치지 않도록 등록 후 캐시 재확인
+        event = notifier.register(cache_key)
+        try:
+            data = cache.get(cache_key)
+            if data is not None:
+                return data
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # 대기 한도 초과 → 직접 계산 (가용성 우선)
+                return fetch_func()
+
+            event.wait(timeout=min(remaining, lock_timeout))
+        finally:
+            notifier.unregister(cache_key, event)
+
+        data = cache.get(cache_key)
+        if data is not None:
+            return data
@@ -0,0 +1,217 @@
+"""
+캐시 계측 - 키 접두사별 히트/미스, 지연 시간, 값 크기
+
+    product:12           → 'product:'
+    order_full:7         → 'order_full:'
+    tag_version:products → 'tag_version:'
+
+기록 경로 (운영 상시 사용 가능하도록 가볍게):
+    - 프로세스 메모리의 카운터만 증가 (네트워크 I/O 없음)
+    - 값 크기는 SIZE_SAMPLE_RATE 비율만 직렬화하여 측정
+    - 백그라운드 스레드가 FLUSH_INTERVAL마다 Redis 해시로 HINCRBY (파이프라인 1번)
+      → 모든 Worker의 수치가 Redis에 합쳐짐
+
+조회 경로:
+    python manage.py cache_stats
+    GET /market/cache-metrics/
+"""
+import atexit
+import random
+import threading
+import time
+from collections import defaultdict
+
+
+METRICS_KEY = 'cache_metrics'              # 해시: 접두사 → 필드별 카운터
+OVERSIZED_KEY = 'cache_metrics:oversized'  # 리스트: 큰 값 샘플
+
+FLUSH_INTERVAL = 10.0
+SIZE_SAMPLE_RATE = 1 / 16
+OVERSIZED_BYTES = 100 * 1024
+MAX_PREFIXES = 100
+
+# 지연 시간 히스토그램 경계 (ms)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+# 값 크기 히스토그램 경계 (byte)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def key_prefix(key):
+    head, sep, _ = str(key).partition(':')
+    return f'{head}:' if sep else head
+
+
+def _bucket(bounds, value):
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            return i
+    return len(bounds)
+
+
+class MetricsRecorder:
+    """프로세스 내 카운터 → 주기적으로 Redis에 합산"""
+
+    def __init__(self):
+        self._counters = defaultdict(lambda: defaultdict(int))  # prefix -> field -> n
+        self._oversized = []
+        self._lock = threading.Lock()
+        self._flusher = None
+        self.backend = None
+
+    def _prefix(self, key):
+        prefix = key_prefix(key)
+        if prefix not in self._counters and len(self._counters) >= MAX_PREFIXES:
+            return 'other:'
+        return prefix
+
+    def record(self, op, key, elapsed, hits=0, misses=0, count=1):
+        bucket = _bucket(LATENCY_BUCKETS_MS, elapsed * 1000)
+        # flush가 카운터를 바꿔치기하는 중에 증가분이 사라지지 않도록 락 안에서
+        with self._lock:
+            counters = self._counters[self._prefix(key)]
+            counters[f'{op}.count'] += count
+            if hits:
+                counters['get.hits'] += hits
+            if misses:
+                counters['get.misses'] += misses
+            counters[f'latency.{op}.{bucket}'] += 1
+            counters[f'latency.{op}.total_us'] += int(elapsed * 1_000_000)
+        self._start_flusher()
+
+    def maybe_record_size(self, key, value, encode):
+        if random.random() >= SIZE_SAMPLE_RATE:
+            return
+
+        size = len(encode(value))
+        with self._lock:
+            counters = self._counters[self._prefix(key)]
+            counters['size.samples'] += 1
+            counters['size.total'] += size
+            counters[f'size.{_bucket(SIZE_BUCKETS, size)}'] += 1
+
+            if size >= OVERSIZED_BYTES:
+                self._oversized.append(f'{key}\t{size}')
+
+    def _start_flusher(self):
+        """합산 스레드 (Worker 프로세스마다 하나 - fork 이후에는 is_alive()가 False → 다시 띄움)"""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name='cache-metrics', daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """수집한 카운터를 Redis에 합산 (계측되지 않는 raw 클라이언트 사용)"""
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(lambda: defaultdict(int))
+            oversized, self._oversized = self._oversized, []
+
+        if self.backend is None or not (counters or oversized):
+            return
+
+        try:
+            redis = self.backend.client.get_client(write=True)
+            with redis.pipeline(transaction=False) as pipe:
+                for prefix, fields in counters.items():
+                    for field, n in fields.items():
+                        pipe.hincrby(f'{METRICS_KEY}:{prefix}', field, n)
+                    pipe.sadd(f'{METRICS_KEY}:prefixes', prefix)
+                if oversized:
+                    pipe.lpush(OVERSIZED_KEY, *oversized)
+                    pipe.ltrim(OVERSIZED_KEY, 0, 99)
+                pipe.execute()
+        except Exception:
+            # 계측 실패가 요청을 실패시키면 안 됨
+            pass
+
+
+recorder = MetricsRecorder()
+atexit.register(recorder.flush)
+
+
+# ----------------------------------------------------------------------
+# 조회
+# ----------------------------------------------------------------------
+
+def _percentile(histogram, total, q):
+    """
+    히스토그램 버킷 상한으로 백분위 추정 (ms)
+    마지막 경계(LATENCY_BUCKETS_MS[-1])보다 느리면 상한을 모름 → None (JSON에 Infinity를 쓰지 않도록)
+    """
+    if not total:
+        return 0.0
+    threshold = total * q
+    seen = 0
+    for i, n in enumerate(histogram):
+        seen += n
+        if seen >= threshold:
+            return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+    return None
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def collect_metrics():
+    """모든 Worker에서 합산된 접두사별 통계"""
+    recorder.flush()
+    redis = _redis()
+
+    prefixes = sorted(p.decode() for p in redis.smembers(f'{METRICS_KEY}:prefixes'))
+    report = {}
+
+    for prefix in prefixes:
+        raw = {k.decode(): int(v) for k, v in redis.hgetall(f'{METRICS_KEY}:{prefix}').items()}
+
+        hits, misses = raw.get('get.hits', 0), raw.get('get.misses', 0)
+        lookups = hits + misses
+        ops = {}
+        for op in ('get', 'set', 'delete'):
+            count = raw.get(f'{op}.count', 0)
+            histogram = [raw.get(f'latency.{op}.{i}', 0) for i in range(len(LATENCY_BUCKETS_MS) + 1)]
+            calls = sum(histogram)
+            ops[op] = {
+                'count': count,
+                'avg_ms': raw.get(f'latency.{op}.total_us', 0) / calls / 1000 if calls else 0.0,
+                'p50_ms': _percentile(histogram, calls, 0.50),
+                'p95_ms': _percentile(histogram, calls, 0.95),
+                'p99_ms': _percentile(histogram, calls, 0.99),
+            }
+
+        samples = raw.get('size.samples', 0)
+        report[prefix] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'ops': ops,
+            'avg_size': raw.get('size.total', 0) / samples if samples else 0.0,
+            'size_histogram': {
+                f'<={bound}' if i < len(SIZE_BUCKETS) else f'>{SIZE_BUCKETS[-1]}': raw.get(f'size.{i}', 0)
+                for i, bound in enumerate(SIZE_BUCKETS + (None,))
+            },
+        }
+
+    oversized = []
+    for entry in redis.lrange(OVERSIZED_KEY, 0, -1):
+        key, _, size = entry.decode().rpartition('\t')
+        oversized.append({'key': key, 'size': int(size)})
+
+    return {'prefixes': report, 'oversized': oversized}
+
+
+def reset_metrics():
+    recorder.flush()
+    redis = _redis()
+    prefixes = [p.decode() for p in redis.smembers(f'{METRICS_KEY}:prefixes')]
+    keys = [f'{METRICS_KEY}:{p}' for p in prefixes]
+    redis.delete(f'{METRICS_KEY}:prefixes', OVERSIZED_KEY, *keys)
@@ -0,0 +1,138 @@
+"""
+장바구니 일괄 주문
+
+이전 방식:
+    상품마다 Product.objects.get → stock 확인 → stock -= n; save() → OrderItem.objects.create
+    → 장바구니 항목 수 N에 비례해 쿼리 3N+α번, 읽고-수정-쓰기 사이에 다른 주문이 끼면 초과 판매
+
+현재 방식 (트랜잭션 1개, 쿼리 수는 N과 무관):
+    1. 상품 조회           SELECT ... WHERE id IN (..)                                1번
+    2. 재고 조건부 차감    UPDATE products SET stock = stock - CASE id WHEN .. END
+                           WHERE id IN (..) AND stock >= CASE id WHEN .. END          1번
+                           → 바뀐 행 수 < 상품 수면 OutOfStock, 트랜잭션 전체 롤백
+    3. 주문 생성           INSERT orders                                              1번
+    4. 항목 생성           bulk_create → INSERT order_items                           1번
+    5. 주문 금액           SELECT SUM(price * quantity) FROM order_items → UPDATE     2번
+    (+ 주문 합계 / 일별 매출 집계 유지 - 집계 행마다가 아니라 CASE UPDATE로 묶어서, 항목 / 카테고리 수와 무관)
+
+재고 write-behind 카운터(market.stock)가 있는 상품은 DB 재고에 아직 반영되지 않은 차감분이 있으므로
+조건부 UPDATE 대신 카운터에서 차감 (decrement_many - 전부 또는 전부 실패, DB 반영은 flusher가)
+    → 두 경로가 같은 재고를 보므로 서로 초과 판매하지 않음
+    → 이후 단계가 실패하면 카운터 차감을 되돌림
+    (바깥 트랜잭션 안에서 호출한 뒤 바깥이 롤백되면 되돌리지 못함 - 초과 판매는 아니고 재고가 적게 남음
+     → 그런 경우 stock_counters.increment로 직접 되돌릴 것)
+"""
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Case, DecimalField, F, IntegerField, Sum, Value, When
+
+from market.stock import OutOfStock
+
+
+MAX_CART_ITEMS = 100    # 상품 1개당 SQL 파라미터 약 5개 (SQLite 파라미터 수 제한)
+
+
+def normalize_cart(cart):
+    """
+    {product_id: 수량} 또는 [(product_id, 수량), ..] → {product_id: 수량}
+    같은 상품이 여러 번 있으면 수량을 합침
+    """
+    lines = cart.items() if hasattr(cart, 'items') else cart
+    quantities = Counter()
+    for product_id, quantity in lines:
+        product_id, quantity = int(product_id), int(quantity)
+        if quantity <= 0:
+            raise ValueError(f'수량은 1 이상이어야 합니다: 상품 {product_id}')
+        quantities[product_id] += quantity
+
+    if not quantities:
+        raise ValueError('장바구니가 비어 있습니다.')
+    if len(quantities) > MAX_CART_ITEMS:
+        raise ValueError(f'한 번에 주문할 수 있는 상품은 {MAX_CART_ITEMS}개까지입니다.')
+    return dict(quantities)
+
+
+def _by_product(quantities):
+    return Case(
+        *(When(pk=pk, then=Value(quantity)) for pk, quantity in quantities.items()),
+        output_field=IntegerField(),
+    )
+
+
+def _reserve_stock(quantities, using):
+    """재고 조건부 차감 - 전부 차감됐으면 True"""
+    from market.models import Product
+
+    # 기본 매니저의 update()는 행을 다시 읽고 카운터를 맞춤 → 호출하는 쪽에서 한 번에 처리
+    updated = Product._base_manager.using(using).filter(
+        pk__in=list(quantities), stock__gte=_by_product(quantities),
+    ).update(stock=F('stock') - _by_product(quantities))
+    return updated == len(quantities)
+
+
+def _reserve_counters(quantities):
+    """카운터가 있는 상품은 Redis에서 차감 → 차감한 {id: 수량}"""
+    from market.stock import stock_counters
+
+    tracked = stock_counters.tracked(quantities)
+    reserved = {pk: quantity for pk, quantity in quantities.items() if pk in tracked}
+    stock_counters.decrement_many(reserved)  # 부족하면 OutOfStock (아무것도 차감되지 않음)
+    return reserved
+
+
+def place_order(user, cart, using=DEFAULT_DB_ALIAS):
+    """
+    장바구니 전체를 주문 1건으로 (전부 성공 또는 전부 실패)
+
+    ValueError: 잘못된 장바구니
+    Product.DoesNotExist: 없는 상품
+    OutOfStock: 재고 부족 (product_ids)
+    """
+    from market.invalidation import invalidate_products
+    from market.models import Order, OrderItem, Product
+    from market.stock import reset_stock_counters, stock_counters
+
+    quantities = normalize_cart(cart)
+    reserved = {}
+
+    try:
+        with transaction.atomic(using=using):
+            products = {
+                pk: (price, stock, category)
+                for pk, price, stock, category in Product.objects.using(using)
+                .filter(id__in=list(quantities)).values_list('id', 'price', 'stock', 'category')
+            }
+            missing = [pk for pk in quantities if pk not in products]
+            if missing:
+                raise Product.DoesNotExist(f'상품 없음: {missing}')
+
+            reserved = _reserve_counters(quantities)
+            in_db = {pk: quantity for pk, quantity in quantities.items() if pk not in reserved}
+            if in_db and not _reserve_stock(in_db, using):
+                # 조회 이후 다른 주문이 먼저 차감했으면 조회한 재고로는 모를 수 있음
+                short = [pk for pk, quantity in in_db.items() if products[pk][1] < quantity]
+                raise OutOfStock(short or list(in_db))
+
+            order = Order.objects.using(using).create(user=user, total_amount=0)
+            OrderItem.objects.using(using).bulk_create([
+                OrderItem(order=order, product_id=pk, quantity=quantity, price=products[pk][0])
+                for pk, quantity in quantities.items()
+            ])
+
+            order.total_amount = OrderItem.objects.using(using).filter(order=order).aggregate(
+                total=Sum(F('price') * F('quantity'), output_field=DecimalField(max_digits=10, decimal_places=2)),
+            )['total']
+            # save() → 시그널이 누적 통계 / 일별 매출 집계의 금액을 증감
+            order.save(using=using, update_fields=['total_amount', 'updated_at'])
+            # bulk_create가 DB에 반영한 비정규화 컬럼 (market.order_totals) - 다시 읽지 않음
+            order.item_count, order.items_total = len(quantities), order.total_amount
+
+            invalidate_products([(pk, category) for pk, (_, _, category) in products.items()], using=using)
+            # DB 재고를 직접 차감한 상품 - 그 사이 카운터가 생겼으면 커밋 이후 DB 기준으로 다시 맞춤
+            reset_stock_counters(list(in_db), using=using)
+    except BaseException:
+        stock_counters.release_many(reserved)
+        raise
+
+    return order
@@ -0,0 +1,207 @@
+"""
+만료 전 조기 갱신 캐시
+
+XFetch (Vattani et al., "Optimal Probabilistic Cache Stampede Prevention"):
+
+    값과 함께 저장: value, delta(재계산 소요 시간), expiry(만료 시각)
+
+    갱신 조건:  now - delta * beta * ln(random()) >= expiry
+
+    - 만료가 가까울수록, 재계산이 오래 걸릴수록 갱신 확률 ↑
+    - 남은 TTL을 따로 묻지 않음 → 캐시 히트 = GET 1번
+    - 갱신은 백그라운드 Executor에서 실행 → 요청은 기다리지 않음
+    - 봉투 형식이 아닌 값(이전 버전이 같은 키에 저장한 값 등)은 미스로 취급해 다시 저장
+"""
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from market.ttl_policy import ttl_for
+
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cache-refresh')
+
+ENVELOPE_FIELDS = ('value', 'delta', 'expiry')
+
+
+class XFetchCache:
+    """XFetch 기반 확률적 조기 갱신"""
+
+    _refreshing = set()  # 이 프로세스에서 갱신 중인 키 (완료 시 제거)
+    _refreshing_lock = threading.Lock()
+
+    @staticmethod
+    def _compute(fetch_func):
+        start = time.time()
+        value = fetch_func()
+        return value, time.time() - start
+
+    @staticmethod
+    def _store(cache_key, value, delta, ttl):
+        cache.set(cache_key, {
+            'value': value,
+            'delta': delta,
+            'expiry': time.time() + ttl,
+        }, ttl)
+
+    @staticmethod
+    def is_envelope(entry):
+        return isinstance(entry, dict) and all(field in entry for field in ENVELOPE_FIELDS)
+
+    @classmethod
+    def should_refresh(cls, entry, beta=1.0):
+        # ln(random()) <= 0 이므로 now에 양수를 더한 셈
+        return time.time() - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expiry']
+
+    @classmethod
+    def get_or_refresh(cls, cache_key, fetch_func, ttl=None, beta=1.0):
+        ttl = ttl_for(cache_key) if ttl is None else ttl
+        entry = cache.get(cache_key)
+
+        if not cls.is_envelope(entry):
+            # 캐시 미스 (또는 다른 형식으로 저장된 값) → 동기 계산
+            value, delta = cls._compute(fetch_func)
+            cls._store(cache_key, value, delta, ttl)
+            return value
+
+        if cls.should_refresh(entry, beta):
+            cls.refresh_in_background(cache_key, fetch_func, ttl)
+
+        return entry['value']
+
+    @classmethod
+    def refresh_in_background(cls, cache_key, fetch_func, ttl):
+        with cls._refreshing_lock:
+            if cache_key in cls._refreshing:
+                return False
+            cls._refreshing.add(cache_key)
+
+        _executor.submit(cls._refresh, cache_key, fetch_func, ttl)
+        return True
+
+    @classmethod
+    def _refresh(cls, cache_key, fetch_func, ttl):
+        try:
+            value, delta = cls._compute(fetch_func)
+            cls._store(cache_key, value, delta, ttl)
+        except Exception:
+            # 갱신 실패 → 기존 값은 만료 전까지 계속 제공됨
+            logger.exception('background refresh failed: %s', cache_key)
+        finally:
+            with cls._refreshing_lock:
+                cls._refreshing.discard(cache_key)
+            close_old_connections()  # Executor 스레드의 DB 커넥션 정리
+
+
+class StaleWhileRevalidateCache:
+    """
+    Stale-While-Revalidate
+
+        저장 시각 ──── soft TTL ────┬──── grace ────┐
+                      (fresh)       │    (stale)    │ Redis 만료
+                                    │
+                     stale 구간: 이전 값을 즉시 반환 +
+                     백그라운드 갱신 1번 (Worker 간 Redis 락으로 중복 제거)
+
+    → 만료 시점에도 요청 지연이 튀지 않음
+    """
+
+    def __init__(self, refresh_timeout=30.0):
+        self.refresh_timeout = refresh_timeout
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.stale_age_total = 0.0
+        self.max_stale_age = 0.0
+
+    def _envelope(self, fetch_func, ttl):
+        value = fetch_func()
+        now = time.time()
+        return {'value': value, 'stored_at': now, 'fresh_until': now + ttl}
+
+    def get(self, cache_key, fetch_func, ttl=None, grace=300):
+        from market.cache_lock import get_or_set_locked
+
+        ttl = ttl_for(cache_key) if ttl is None else ttl
+        entry = cache.get(cache_key)
+
+        if entry is None:
+            # 콜드 미스 → 한 Worker만 계산, 나머지는 대기 후 결과 공유
+            with self._stats_lock:
+                self.misses += 1
+            entry = get_or_set_locked(
+                cache_key,
+                lambda: self._envelope(fetch_func, ttl),
+                ttl=ttl + grace,
+                lock_timeout=self.refresh_timeout,
+            )
+            return entry['value']
+
+        stale_age = time.time() - entry['fresh_until']
+        if stale_age <= 0:
+            with self._stats_lock:
+                self.fresh_hits += 1
+            return entry['value']
+
+        # stale 구간 → 이전 값 반환 + 백그라운드 갱신
+        with self._stats_lock:
+            self.stale_hits += 1
+            self.stale_age_total += stale_age
+            self.max_stale_age = max(self.max_stale_age, stale_age)
+
+        self._revalidate(cache_key, fetch_func, ttl, grace)
+        return entry['value']
+
+    def _revalidate(self, cache_key, fetch_func, ttl, grace):
+        from market.cache_lock import RedisLock
+
+        lock = RedisLock(f'swr:{cache_key}', timeout=self.refresh_timeout)
+        if not lock.acquire():
+            return False  # 다른 Worker가 이미 갱신 중
+
+        _executor.submit(self._refresh, lock, cache_key, fetch_func, ttl, grace)
+        return True
+
+    def _refresh(self, lock, cache_key, fetch_func, ttl, grace):
+        try:
+            cache.set(cache_key, self._envelope(fetch_func, ttl), ttl + grace)
+            with self._stats_lock:
+                self.refreshes += 1
+        except Exception:
+            with self._stats_lock:
+                self.refresh_failures += 1
+            logger.exception('stale-while-revalidate refresh failed: %s', cache_key)
+        finally:
+            lock.release()
+            close_old_connections()
+
+    def stats(self):
+        served = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            'fresh_hits': self.fresh_hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'fresh_ratio': self.fresh_hits / served if served else 0.0,
+            'stale_ratio': self.stale_hits / served if served else 0.0,
+            'avg_stale_age': self.stale_age_total / self.stale_hits if self.stale_hits else 0.0,
+            'max_stale_age': self.max_stale_age,
+        }
+
+
+swr_cache = StaleWhileRevalidateCache()
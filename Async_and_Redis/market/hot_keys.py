@@ -0,0 +1,218 @@
+"""
+핫 키 감지 + 프로세스 내 자동 복제
+
+hot_products, statistics 같은 키는 다른 키보다 수백 배 많이 읽힘
+    → 모든 Worker의 GET이 Redis 샤드 하나에 몰림
+
+    1. 기록: cache.get 호출 중 SAMPLE_RATE 비율만 프로세스 메모리에 카운트 (요청 경로는 메모리 연산만)
+    2. 합산: 백그라운드 스레드가 FLUSH_INTERVAL마다 Redis 정렬 집합(hot_keys:<버킷>)에 ZINCRBY
+            → 모든 Worker의 샘플이 BUCKET_SECONDS 단위 버킷에 합쳐짐
+    3. 감지: REFRESH_INTERVAL마다 최근 WINDOW_BUCKETS개 버킷(슬라이딩 윈도)을 합쳐
+            초당 요청 수가 HOT_KEY_THRESHOLD 이상인 키를 핫 키로 지정
+    4. 복제: 핫 키는 짧은 TTL(HOT_KEY_TTL)의 프로세스 내 복제본에서 응답
+            - 이 프로세스에서 set/delete → 복제본 즉시 갱신 + 다른 Worker에 무효화 방송
+            - market.invalidation의 무효화 방송(cache:invalidate)도 복제본에서 제거
+
+settings:
+    HOT_KEY_THRESHOLD = 50   # 전체 Worker 합계 초당 GET 수
+    HOT_KEY_TTL = 2          # 복제본 TTL (초) - 방송을 놓쳐도 이 시간 안에 갱신
+
+조회:
+    python manage.py hot_keys
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from market.tiered_cache import LocalLRUCache
+
+
+HOT_KEYS_KEY = 'hot_keys'
+
+SAMPLE_RATE = 1 / 8
+BUCKET_SECONDS = 10
+WINDOW_BUCKETS = 6           # 슬라이딩 윈도 = 60초
+FLUSH_INTERVAL = 5.0
+REFRESH_INTERVAL = 5.0
+TOP_PER_BUCKET = 200         # 버킷마다 상위 N개만 합산
+MAX_HOT_KEYS = 100
+
+_MISSING = object()
+
+
+def _bucket(now=None):
+    return int((time.time() if now is None else now) // BUCKET_SECONDS)
+
+
+class HotKeyTracker:
+
+    def __init__(self, threshold=50, replica_ttl=2, sample_rate=SAMPLE_RATE):
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.replica = LocalLRUCache(maxsize=MAX_HOT_KEYS, ttl=replica_ttl)
+        self.hot = frozenset()
+        self.backend = None
+
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+        self._worker = None
+        self.replica_hits = 0
+
+    # ------------------------------------------------------------------
+    # 기록 (요청 경로 - 메모리 연산만)
+    # ------------------------------------------------------------------
+
+    def record(self, key):
+        if random.random() < self.sample_rate:
+            with self._lock:
+                self._counts[key] += 1
+        self._start_worker()
+
+    def _start_worker(self):
+        """합산 / 감지 스레드 (Worker 프로세스마다 하나 - fork 이후에는 is_alive()가 False → 다시 띄움)"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name='hot-keys', daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        last_flush = last_refresh = time.monotonic()
+        while True:
+            time.sleep(min(FLUSH_INTERVAL, REFRESH_INTERVAL))
+            now = time.monotonic()
+            if now - last_flush >= FLUSH_INTERVAL:
+                last_flush = now
+                self.flush()
+            if now - last_refresh >= REFRESH_INTERVAL:
+                last_refresh = now
+                self.refresh()
+
+    def is_hot(self, key):
+        return key in self.hot
+
+    def get_replica(self, key, default=None):
+        value = self.replica.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.replica_hits += 1
+        return value
+
+    def store_replica(self, key, value):
+        if key in self.hot:
+            self.replica.set(key, value)
+
+    def forget(self, keys, broadcast=True):
+        """값이 바뀐 핫 키의 복제본 제거 (다른 Worker에도 방송) → 제거한 핫 키"""
+        hot = [key for key in keys if key in self.hot]
+        for key in hot:
+            self.replica.delete(key)
+        if hot and broadcast:
+            from market.tiered_cache import product_cache
+            product_cache.publish(hot)
+        return hot
+
+    # ------------------------------------------------------------------
+    # Redis 합산 / 감지
+    # ------------------------------------------------------------------
+
+    def _redis(self):
+        # 계측되지 않는 raw 클라이언트 (cache.get을 다시 거치지 않도록)
+        return self.backend.client.get_client(write=True)
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(int)
+
+        if self.backend is None or not counts:
+            return
+
+        key = f'{HOT_KEYS_KEY}:{_bucket()}'
+        scale = 1 / self.sample_rate  # 샘플 수 → 추정 요청 수
+        try:
+            with self._redis().pipeline(transaction=False) as pipe:
+                for cache_key, n in counts.items():
+                    pipe.zincrby(key, n * scale, cache_key)
+                pipe.expire(key, BUCKET_SECONDS * (WINDOW_BUCKETS + 1))
+                pipe.execute()
+        except Exception:
+            # 계측 실패가 요청을 실패시키면 안 됨
+            pass
+
+    def window_rates(self, limit=TOP_PER_BUCKET):
+        """최근 윈도의 키별 초당 요청 수 (모든 Worker 합계, 추정치)"""
+        current = _bucket()
+        with self._redis().pipeline(transaction=False) as pipe:
+            for bucket in range(current - WINDOW_BUCKETS + 1, current + 1):
+                pipe.zrevrange(f'{HOT_KEYS_KEY}:{bucket}', 0, limit - 1, withscores=True)
+            buckets = pipe.execute()
+
+        totals = defaultdict(float)
+        for entries in buckets:
+            for member, score in entries:
+                totals[member.decode()] += score
+
+        window = WINDOW_BUCKETS * BUCKET_SECONDS
+        return {key: count / window for key, count in totals.items()}
+
+    def refresh(self):
+        """핫 키 목록 갱신 - 빠진 키의 복제본은 버림"""
+        if self.backend is None:
+            return
+
+        try:
+            rates = self.window_rates()
+        except Exception:
+            return
+
+        ranked = sorted(rates.items(), key=lambda kv: kv[1], reverse=True)[:MAX_HOT_KEYS]
+        hot = frozenset(key for key, rate in ranked if rate >= self.threshold)
+
+        if hot and not self.hot:
+            # 다른 Worker의 무효화 방송을 받기 위해 구독 스레드 시작
+            from market.tiered_cache import product_cache
+            product_cache._ensure_listener()
+
+        for key in self.hot - hot:
+            self.replica.delete(key)
+        self.hot = hot
+
+    def report(self, limit=20):
+        """상위 키와 초당 요청 수, 복제 여부"""
+        self.flush()
+        rates = self.window_rates()
+        top = sorted(rates.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return {
+            'threshold': self.threshold,
+            'window_seconds': WINDOW_BUCKETS * BUCKET_SECONDS,
+            'keys': [
+                {'key': key, 'rate': round(rate, 1), 'replicated': rate >= self.threshold}
+                for key, rate in top
+            ],
+            'local': {
+                'hot': sorted(self.hot),
+                'replica_size': len(self.replica),
+                'replica_hits': self.replica_hits,
+            },
+        }
+
+    def reset(self):
+        current = _bucket()
+        self._redis().delete(*(
+            f'{HOT_KEYS_KEY}:{bucket}' for bucket in range(current - WINDOW_BUCKETS, current + 1)
+        ))
+        self.hot = frozenset()
+        self.replica.clear()
+        with self._lock:
+            self._counts.clear()
+
+
+hot_keys = HotKeyTracker(
+    threshold=getattr(settings, 'HOT_KEY_THRESHOLD', 50),
+    replica_ttl=getattr(settings, 'HOT_KEY_TTL', 2),
+)
@@ -0,0 +1,481 @@
+"""
+인덱스 추천 - 수집한 SQL 워크로드(market.query_workload)를 EXPLAIN QUERY PLAN으로 점검
+
+    1. 점검: 문장마다 EXPLAIN QUERY PLAN
+        SCAN <table>                    WHERE 조건이 있는데 전체 스캔
+        USE TEMP B-TREE FOR ORDER BY    조건에 맞는 행을 모두 읽어 임시 B-트리로 정렬 (LIMIT이 있어도)
+    2. 추천: 최상위 WHERE / ORDER BY의 컬럼으로 models.Index 구성
+        - 같음(=, IN) 조건 컬럼 → ORDER BY 컬럼 (정렬도 인덱스 순서로) 또는 범위 조건 컬럼 1개
+        - 값 종류가 적은 컬럼이 SQL에 직접 쓴 드문 값으로 걸리면 (status = 'pending')
+          → 그 조건은 condition=Q(...)로 빼서 부분 인덱스 (작고, 쓰기 비용도 그 행들만)
+          바인딩 파라미터(%s)는 실행마다 값이 다르므로 부분 인덱스 조건이 되지 않고 선택도도 평균(1/값 종류)으로
+        - 기존 인덱스가 이미 같은 컬럼으로 시작하면 생략
+    3. 검증: 트랜잭션 안에서 인덱스를 실제로 만들고 EXPLAIN / 실행 시간을 다시 잰 뒤 롤백
+        계획이 그대로이거나 더 느려진 문장은 추천에서 빼고 해결하지 못한 문장으로
+    4. 예상 효과: 실행 1번에 읽는 행 수 추정 (전체 행 × 조건별 선택도) × 워크로드 실행 횟수
+
+OR 조건, 함수로 감싼 컬럼(날짜 추출 등), 서브쿼리 안의 조건은 추천하지 않고 점검 결과만 보여 줌
+SQLite의 EXPLAIN QUERY PLAN 형식 기준
+"""
+import re
+import time
+from hashlib import md5
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+
+MIN_ROWS = 1000                 # 이보다 작은 테이블은 전체 스캔도 충분히 빠름
+PARTIAL_MAX_DISTINCT = 10       # 부분 인덱스 조건 후보: 값 종류가 이 이하인 컬럼
+PARTIAL_MAX_FRACTION = 0.2      #                        그 값인 행이 이 비율 이하
+RANGE_SELECTIVITY = 0.25        # 범위 조건 하나가 남기는 비율 (값을 모를 때 추정)
+MIN_REDUCTION = 0.5             # 읽는 행이 이 비율 이상 줄지 않으면 추천하지 않음 (정렬 제거는 예외)
+TIMING_REPEAT = 3
+
+_SCAN = re.compile(r'^SCAN (?P<table>\w+)(?P<index> USING (?:COVERING )?INDEX \w+)?')
+_SEARCH = re.compile(r'^SEARCH (?P<table>\w+) USING (?:COVERING )?INDEX \w+ \((?P<terms>[^)]*)\)')
+_TEMP_BTREE = re.compile(r'^USE TEMP B-TREE FOR (?P<purpose>.+)')
+
+_ALIAS = re.compile(r'"(?P<table>\w+)" (?P<alias>T\d+)\b')
+_PREDICATE = re.compile(
+    r'"(?P<table>\w+)"\."(?P<column>\w+)" '
+    r"(?P<op>IS NULL|IN \(|BETWEEN|<=|>=|<|>|=)"
+    r"(?: (?P<value>%s|'(?:[^']|'')*'|-?\d+(?:\.\d+)?))?"
+)
+_ORDER_ITEM = re.compile(r'^"(?P<table>\w+)"\."(?P<column>\w+)"(?: (?P<direction>ASC|DESC))?$')
+_CLAUSES = ('WHERE', 'GROUP BY', 'HAVING', 'ORDER BY', 'LIMIT')
+
+
+# ============================================================================
+# SQL 분석 - Django가 만든 SQL 기준 ("table"."column")
+# ============================================================================
+
+def _depths(sql):
+    """문자마다 괄호 깊이 (문자열 리터럴 안은 무시)"""
+    depths, depth, quoted = [], 0, False
+    for char in sql:
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        depths.append(depth)
+    return depths
+
+
+def _clauses(sql):
+    """최상위(괄호 밖) WHERE / ORDER BY / LIMIT ... → {절: (시작 위치, 내용)}"""
+    depths = _depths(sql)
+    found = []
+    for clause in _CLAUSES:
+        for match in re.finditer(rf' {clause} ', sql):
+            if depths[match.start()] == 0:
+                found.append((match.start(), match.end(), clause))
+                break
+    found.sort()
+
+    clauses = {}
+    for i, (start, end, clause) in enumerate(found):
+        stop = found[i + 1][0] if i + 1 < len(found) else len(sql)
+        clauses[clause] = (end, sql[end:stop])
+    return clauses
+
+
+def _literal(text):
+    if text.startswith("'"):
+        return text[1:-1].replace("''", "'")
+    return float(text) if '.' in text else int(text)
+
+
+def parse_statement(sql, params):
+    """
+    최상위 AND 조건과 정렬만 추출
+    → {'predicates': [(table, column, op, value, literal)], 'order': [(table, column, desc)] | None,
+       'limit': int | None, 'has_or': bool}
+
+    literal: 값이 SQL에 직접 쓰여 있음 (False면 바인딩 파라미터의 샘플 값 - 실행마다 다름)
+    """
+    params = list(params or ())
+    aliases = {match['alias']: match['table'] for match in _ALIAS.finditer(sql)}
+    clauses = _clauses(sql)
+    depths = _depths(sql)
+
+    predicates, has_or = [], False
+    if 'WHERE' in clauses:
+        offset, where = clauses['WHERE']
+        where = where.rstrip()
+        # WHERE (a = %s AND b > %s) - 전체를 감싼 괄호 안이 최상위
+        inner = depths[offset:offset + len(where) - 1]
+        base = 1 if where.startswith('(') and inner and min(inner) >= 1 else 0
+        has_or = ' OR ' in where
+        for match in _PREDICATE.finditer(where):
+            position = offset + match.start()
+            if depths[position] != base:
+                continue  # NOT (...) / 서브쿼리 / 함수 안
+            op = match['op'].removesuffix(' (').strip()
+            value, literal = None, match['value'] not in (None, '%s')
+            if match['value'] == '%s':
+                index = sql.count('%s', 0, position + match.end() - match.start()) - 1
+                value = params[index] if 0 <= index < len(params) else None
+            elif literal:
+                value = _literal(match['value'])
+            table = aliases.get(match['table'], match['table'])
+            predicates.append((table, match['column'], op, value, literal))
+
+    order = None
+    if 'ORDER BY' in clauses:
+        order = []
+        for item in clauses['ORDER BY'][1].split(', '):
+            match = _ORDER_ITEM.match(item.strip())
+            if match is None:
+                order = None  # 식으로 정렬 → 인덱스로 해결 불가
+                break
+            table = aliases.get(match['table'], match['table'])
+            order.append((table, match['column'], match['direction'] == 'DESC'))
+
+    limit = None
+    if 'LIMIT' in clauses:
+        number = clauses['LIMIT'][1].split()[0]
+        limit = int(number) if number.isdigit() else None
+
+    return {'predicates': predicates, 'order': order, 'limit': limit, 'has_or': has_or}
+
+
+# ============================================================================
+# 실행 계획
+# ============================================================================
+
+def explain(sql, params, using=DEFAULT_DB_ALIAS):
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan, statement):
+    """[(종류, 테이블, 계획 줄)] - 종류: 'scan' | 'sort'"""
+    filtered = {table for table, *_ in statement['predicates']}
+    ordered = {table for table, *_ in statement['order'] or ()}
+    problems = []
+    for line in plan:
+        line = line.strip()
+        if match := _SCAN.match(line):
+            # 조건 없는 전체 조회 / LIMIT까지만 인덱스 순서로 읽는 스캔은 문제가 아님
+            if match['table'] in filtered and not (match['index'] and statement['limit']):
+                problems.append(('scan', match['table'], line))
+        elif match := _TEMP_BTREE.match(line):
+            if match['purpose'] == 'ORDER BY' and len(ordered) == 1:
+                problems.append(('sort', next(iter(ordered)), line))
+    return problems
+
+
+def _searched(plan, table):
+    """SEARCH <table> USING INDEX x (a=? AND b>?) → (같음 컬럼, 범위 조건 수)"""
+    for line in plan:
+        if (match := _SEARCH.match(line.strip())) and match['table'] == table:
+            terms = [term.strip() for term in match['terms'].split(' AND ')]
+            equal = [term.split('=')[0] for term in terms if re.match(r'^\w+=\?$', term)]
+            return equal, len(terms) - len(equal)
+    return [], 0
+
+
+# ============================================================================
+# 통계 (테이블 / 컬럼마다 한 번)
+# ============================================================================
+
+class TableStats:
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+        self._cache = {}
+
+    def _scalar(self, key, sql, params=()):
+        if key not in self._cache:
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                self._cache[key] = cursor.fetchone()[0] or 0
+        return self._cache[key]
+
+    def rows(self, table):
+        return self._scalar(('rows', table), f'SELECT COUNT(*) FROM {self.connection.ops.quote_name(table)}')
+
+    def distinct(self, table, column):
+        quote = self.connection.ops.quote_name
+        return max(1, self._scalar(
+            ('distinct', table, column), f'SELECT COUNT(DISTINCT {quote(column)}) FROM {quote(table)}',
+        ))
+
+    def fraction(self, table, column, value, op='='):
+        """column op value (None이면 IS NULL)인 행의 비율"""
+        quote = self.connection.ops.quote_name
+        condition, params = (f'{quote(column)} IS NULL', ()) if value is None else (f'{quote(column)} {op} %s', (value,))
+        matching = self._scalar(
+            ('fraction', table, column, op, value), f'SELECT COUNT(*) FROM {quote(table)} WHERE {condition}', params,
+        )
+        return matching / max(1, self.rows(table))
+
+    def indexes(self, table):
+        """기존 인덱스의 컬럼 목록"""
+        key = ('indexes', table)
+        if key not in self._cache:
+            with self.connection.cursor() as cursor:
+                constraints = self.connection.introspection.get_constraints(cursor, table)
+            self._cache[key] = [
+                info['columns'] for info in constraints.values()
+                if (info['index'] or info['unique'] or info['primary_key']) and info['columns']
+            ]
+        return self._cache[key]
+
+
+# ============================================================================
+# 추천
+# ============================================================================
+
+def _models_by_table():
+    return {
+        model._meta.db_table: model for model in apps.get_models()
+        if model._meta.managed and not model.__module__.startswith('django.')
+    }
+
+
+def _field_name(model, column):
+    for field in model._meta.concrete_fields:
+        if field.column == column:
+            return field.name
+    return None
+
+
+def propose(statement, table, stats):
+    """
+    테이블 하나에 대한 인덱스 제안
+    → {'columns': [(column, desc)], 'condition': [(column, value)], 'selectivity': 남는 비율} | None
+    """
+    predicates = [
+        (column, op, value, literal) for t, column, op, value, literal in statement['predicates'] if t == table
+    ]
+    order = statement['order'] or []
+    if statement['has_or'] or not (predicates or order):
+        return None
+
+    equal, ranges, condition = [], [], []
+    selectivity = 1.0
+    for column, op, value, literal in predicates:
+        if op in ('=', 'IS NULL'):
+            known = op == 'IS NULL' or literal
+            if op == 'IS NULL':
+                value = None
+            # SQL에 직접 쓴 값이고 값 종류가 적으면 실제 비율로 - 드문 값이면 부분 인덱스 조건으로
+            fraction = None
+            if known and stats.distinct(table, column) <= PARTIAL_MAX_DISTINCT:
+                fraction = stats.fraction(table, column, value)
+            if fraction is not None and fraction <= PARTIAL_MAX_FRACTION:
+                condition.append((column, value))
+                selectivity *= fraction
+            elif op == '=' and column not in equal:
+                equal.append(column)
+                selectivity *= fraction if fraction is not None else 1 / stats.distinct(table, column)
+        elif op == 'IN' and column not in equal:
+            equal.append(column)
+            selectivity = min(1.0, selectivity * 4 / stats.distinct(table, column))  # 목록 길이는 모름
+        elif op in ('<', '<=', '>', '>=', 'BETWEEN') and column not in ranges:
+            ranges.append(column)
+            if len(ranges) == 1:
+                # BETWEEN은 위쪽 경계를 모름
+                known = literal and op != 'BETWEEN'
+                range_selectivity = stats.fraction(table, column, value, op) if known else RANGE_SELECTIVITY
+
+    columns = [(column, False) for column in equal]
+    fixed = set(equal) | {column for column, _ in condition}
+    if order and all(t == table for t, _, _ in order):
+        # 같음 조건 다음에 정렬 컬럼 → 조건에 맞는 행이 이미 정렬된 순서로 나옴
+        columns += [(column, desc) for _, column, desc in order if column not in fixed]
+        if ranges and ranges[0] == order[0][1]:
+            selectivity *= range_selectivity
+    elif ranges:
+        columns.append((ranges[0], False))
+        selectivity *= range_selectivity
+
+    if not columns:
+        if not condition:
+            return None
+        columns = [(condition[0][0], False)]
+
+    pk = stats.connection.introspection.get_primary_key_column
+    with stats.connection.cursor() as cursor:
+        if [column for column, _ in columns] == [pk(cursor, table)] and not condition:
+            return None
+
+    # 기존 인덱스가 같은 컬럼으로 시작하면 (부분 인덱스가 아닐 때) 이미 해결된 것
+    names = [column for column, _ in columns]
+    if not condition and any(existing[:len(names)] == names for existing in stats.indexes(table)):
+        return None
+
+    return {'columns': columns, 'condition': condition, 'selectivity': selectivity}
+
+
+def build_index(model, proposal):
+    """제안 → models.Index (이름은 Django 규칙대로)"""
+    fields = []
+    for column, desc in proposal['columns']:
+        name = _field_name(model, column)
+        if name is None:
+            return None
+        fields.append(f'-{name}' if desc else name)
+
+    condition = None
+    for column, value in proposal['condition']:
+        name = _field_name(model, column)
+        if name is None:
+            return None
+        q = models.Q(**{f'{name}__isnull': True}) if value is None else models.Q(**{name: value})
+        condition = q if condition is None else condition & q
+
+    if condition is None:
+        index = models.Index(fields=fields)
+        index.set_name_with_model(model)
+    else:
+        # 부분 인덱스는 이름이 필수 - 조건까지 넣어 해시
+        digest = md5(f'{fields}{condition}'.encode()).hexdigest()[:6]
+        index = models.Index(
+            fields=fields, condition=condition,
+            name=f'{model._meta.db_table[:11]}_{fields[0].lstrip("-")[:7]}_{digest}_part',
+        )
+    return index
+
+
+def index_source(index):
+    """models.py에 붙여 넣을 코드"""
+    parts = [f'fields={index.fields!r}']
+    if index.condition is not None:
+        q = ' & '.join(f'Q({key}={value!r})' for key, value in index.condition.children)
+        parts.append(f'condition={q}')
+    parts.append(f'name={index.name!r}')
+    return f"models.Index({', '.join(parts)})"
+
+
+def _timed(sql, params, using):
+    with connections[using].cursor() as cursor:
+        began = time.perf_counter()
+        for _ in range(TIMING_REPEAT):
+            cursor.execute(sql, params)
+            cursor.fetchall()
+        return (time.perf_counter() - began) / TIMING_REPEAT * 1000
+
+
+def verify(model, index, entry, using=DEFAULT_DB_ALIAS):
+    """인덱스를 실제로 만든 뒤 계획 / 실행 시간 비교 (트랜잭션 롤백 → 흔적 없음)"""
+    connection = connections[using]
+    sql, params = entry['sample_sql'], entry['sample_params']
+    timed = sql.lstrip().upper().startswith('SELECT')
+
+    with transaction.atomic(using=using):
+        before = _timed(sql, params, using) if timed else None
+        editor = connection.schema_editor(collect_sql=True)
+        with connection.cursor() as cursor:
+            cursor.execute(str(index.create_sql(model, editor)))
+        plan = explain(sql, params, using)
+        after = _timed(sql, params, using) if timed else None
+        transaction.set_rollback(True)
+
+    return {'plan': plan, 'before_ms': before, 'after_ms': after}
+
+
+def analyze(workload, using=DEFAULT_DB_ALIAS, min_rows=MIN_ROWS, check=True):
+    """
+    → {'proposals': [...], 'unresolved': [...], 'statements': 점검한 문장 수}
+    proposals: 같은 인덱스를 추천한 문장들을 합쳐 예상 효과(읽는 행 수 감소 × 실행 횟수) 순
+    """
+    stats = TableStats(using)
+    by_table = _models_by_table()
+    proposals, unresolved = {}, []
+
+    for entry in sorted(workload, key=lambda e: e['count'], reverse=True):
+        sql, params = entry['sample_sql'], entry['sample_params']
+        try:
+            plan = explain(sql, params, using)
+        except Exception as e:
+            unresolved.append({'sql': entry['sql'], 'count': entry['count'], 'reason': f'EXPLAIN 실패: {e}'})
+            continue
+
+        statement = parse_statement(sql, params)
+        for kind, table, line in plan_problems(plan, statement):
+            model = by_table.get(table)
+            if model is None or stats.rows(table) < min_rows:
+                continue
+
+            finding = {'sql': entry['sql'], 'count': entry['count'], 'time': entry['time'],
+                       'table': table, 'problem': kind, 'plan': line}
+            proposal = propose(statement, table, stats)
+            index = build_index(model, proposal) if proposal else None
+            if index is None:
+                finding['reason'] = 'OR 조건 / 식 / 함수로 감싼 컬럼 - 쿼리를 바꾸는 편이 나음'
+                unresolved.append(finding)
+                continue
+
+            # 실행 1번에 읽는 행 수 (추정)
+            rows = stats.rows(table)
+            equal, ranged = _searched(plan, table)
+            before = rows
+            for column in equal:
+                before /= stats.distinct(table, column)
+            before *= RANGE_SELECTIVITY ** ranged
+            after = rows * proposal['selectivity']
+            sorted_by_index = bool(statement['order']) and any(
+                column == statement['order'][0][1] for column, _ in proposal['columns']
+            )
+            if sorted_by_index and statement['limit']:
+                after = min(after, statement['limit'])
+            if kind == 'scan' and after > before * (1 - MIN_REDUCTION):
+                finding['reason'] = '조건에 맞는 행이 많음 - 인덱스를 타도 읽는 행이 크게 줄지 않음'
+                unresolved.append(finding)
+                continue
+
+            key = (model._meta.label, index.name)
+            target = proposals.setdefault(key, {
+                'model': model._meta.label,
+                'index': index_source(index),
+                'partial': index.condition is not None,
+                'statements': [],
+                '_index': index,
+                '_model': model,
+            })
+            saved = max(0, int(before - after)) * entry['count']
+            target['statements'].append({**finding, '_entry': entry, '_rows': (int(before), int(after), saved)})
+
+    ranked = []
+    for proposal in proposals.values():
+        index, model = proposal.pop('_index'), proposal.pop('_model')
+        for finding in proposal['statements']:
+            entry = finding.pop('_entry')
+            if check:
+                verified = finding['verified'] = verify(model, index, entry, using)
+                # 1ms 미만 문장의 측정 오차는 무시 (20% 이상, 0.1ms 이상 늦어졌을 때만)
+                slower = verified['before_ms'] is not None and (
+                    verified['after_ms'] - verified['before_ms'] > max(0.1, verified['before_ms'] * 0.2)
+                )
+                finding['fixed'] = not slower and not plan_problems(
+                    verified['plan'], parse_statement(entry['sample_sql'], entry['sample_params']),
+                )
+
+        # 검증에서 계획이 그대로 / 더 느려진 문장은 추천 근거에서 뺌
+        kept = []
+        for finding in proposal['statements']:
+            if finding.get('fixed', True):
+                kept.append(finding)
+            else:
+                finding.pop('_rows')
+                unresolved.append({**finding, 'reason': f"{proposal['index']} 검증: 계획이 그대로이거나 더 느려짐"})
+        if not kept:
+            continue
+
+        rows = [finding.pop('_rows') for finding in kept]
+        proposal.update({
+            'rows_before': max(before for before, _, _ in rows),
+            'rows_after': max(after for _, after, _ in rows),
+            'rows_saved': sum(saved for _, _, saved in rows),
+            'statements': kept,
+        })
+        ranked.append(proposal)
+
+    ranked.sort(key=lambda p: p['rows_saved'], reverse=True)
+    return {'proposals': ranked, 'unresolved': unresolved, 'statements': len(workload)}
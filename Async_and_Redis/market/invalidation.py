@@ -0,0 +1,155 @@
+"""
+트랜잭션 인지 + 병합 캐시 무효화
+
+이전 방식:
+    시그널 발생 즉시 cache.delete × 4
+    - 롤백될 트랜잭션에서도 캐시 삭제
+    - 상품 1,000개 일괄 수정 = Redis 왕복 4,000번
+    - QuerySet.update()는 시그널이 없어 무효화 누락
+
+현재 방식:
+    트랜잭션 안: 무효화할 키를 모아 두고 (중복 제거)
+                 transaction.on_commit에서 delete_many 1번
+    트랜잭션 밖: 즉시 delete_many 1번
+    롤백: on_commit 콜백이 버려지므로 캐시도 그대로
+
+태그 (market.tag_cache, market.response_cache)도 같은 배치로 커밋 이후 INCR
+적응형 TTL용 쓰기 수도 같은 배치에 모델별로 합산 → 커밋 이후 파이프라인 1번
+    product:<id>      상품 내용이 바뀜 → 그 상품을 담은 페이지만 무효화
+    category:<name>   카테고리 구성이 바뀜 (생성 / 삭제 / 카테고리 이동)
+    products          전체 상품 구성이 바뀜
+    orders:user:<id>  사용자의 주문이 바뀜
+"""
+import threading
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from market.product_cache import category_tags
+from market.request_memo import forget
+from market.tag_cache import TagBasedCache
+from market.tiered_cache import product_cache
+
+
+_local = threading.local()
+
+
+def product_tag(product_id):
+    return f'product:{product_id}'
+
+
+def user_orders_tag(user_id):
+    return f'orders:user:{user_id}'
+
+
+def product_cache_keys(product_id, category=None):
+    """상품 하나가 바뀌었을 때 지워야 할 캐시 키"""
+    keys = [
+        f'product:{product_id}',
+        f'product_ttl:{product_id}',
+        f'product_detail:{product_id}',
+    ]
+    if category is not None:
+        keys.append(f'products_by_category:{category}')
+    return keys
+
+
+class _InvalidationBatch:
+    """트랜잭션 하나 동안 모인 무효화 키"""
+
+    def __init__(self):
+        self.keys = set()
+        self.tags = set()
+        self.writes = Counter()  # model -> 쓰기 수
+
+    def flush(self):
+        from market.ttl_policy import ttl_policy
+
+        keys, self.keys = self.keys, set()
+        tags, self.tags = self.tags, set()
+        writes, self.writes = self.writes, Counter()
+        if keys:
+            # Redis delete_many 1번 + 모든 Worker의 L1 삭제 방송 1번
+            product_cache.invalidate(*sorted(keys))
+        if tags:
+            TagBasedCache.invalidate_tags(*sorted(tags))
+        if writes:
+            ttl_policy.record_writes(writes)
+
+
+def _current_batch(using):
+    """현재 트랜잭션에 등록된 배치 (롤백으로 콜백이 버려졌으면 새로 등록)"""
+    connection = connections[using]
+    batches = getattr(_local, 'batches', None)
+    if batches is None:
+        batches = _local.batches = {}
+
+    batch = batches.get(using)
+    if batch is not None and any(func == batch.flush for _, func, _ in connection.run_on_commit):
+        return batch
+
+    batch = batches[using] = _InvalidationBatch()
+    transaction.on_commit(batch.flush, using=using)
+    return batch
+
+
+def invalidate(*keys, using=DEFAULT_DB_ALIAS):
+    """커밋 이후 캐시 키 무효화 (트랜잭션 밖이면 즉시)"""
+    if not keys:
+        return
+
+    # 같은 요청의 다음 조회가 이전 값을 보지 않도록 메모는 즉시 제거
+    forget('cache', *keys)
+
+    if not connections[using].in_atomic_block:
+        product_cache.invalidate(*dict.fromkeys(keys))  # 순서 유지 중복 제거
+        return
+
+    _current_batch(using).keys.update(keys)
+
+
+def invalidate_tags(*tags, using=DEFAULT_DB_ALIAS):
+    """커밋 이후 태그 버전 증가 (트랜잭션 밖이면 즉시)"""
+    if not tags:
+        return
+
+    forget('tag_version', *tags)
+
+    if not connections[using].in_atomic_block:
+        TagBasedCache.invalidate_tags(*dict.fromkeys(tags))
+        return
+
+    _current_batch(using).tags.update(tags)
+
+
+def invalidate_products(rows, using=DEFAULT_DB_ALIAS, moved=()):
+    """
+    (id, category) 목록에 해당하는 상품 캐시 무효화
+
+    moved: 상품이 들어오거나 나간 카테고리 → 해당 카테고리 목록 전체 무효화
+    """
+    keys = []
+    tags = []
+    for product_id, category in rows:
+        keys.extend(product_cache_keys(product_id, category))
+        tags.append(product_tag(product_id))
+    for category in moved:
+        tags.extend(category_tags(category))
+
+    invalidate(*keys, using=using)
+    invalidate_tags(*dict.fromkeys(tags), using=using)
+    record_writes('market.product', len(rows), using=using)
+
+
+def record_writes(model, count=1, using=DEFAULT_DB_ALIAS):
+    """적응형 TTL용 쓰기 수 기록 (커밋된 쓰기만, 트랜잭션 밖이면 즉시)"""
+    from market.ttl_policy import ttl_policy
+
+    if not count or model not in ttl_policy.tracked_models():
+        return
+
+    if not connections[using].in_atomic_block:
+        ttl_policy.record_write(model, count)
+        return
+
+    _current_batch(using).writes[model] += count
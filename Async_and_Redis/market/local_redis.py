@@ -0,0 +1,893 @@
+"""
+로컬 Redis 대체 서버 - Redis 없이 캐시 벤치마크 / 스탬피드 시뮬레이션 / CI 실행
+
+settings의 캐시 LOCATION을 local://로 바꾸면:
+    CACHE_LOCATION=local:// python 05_redis_part2.py
+
+    - 첫 프로세스가 유닉스 소켓으로 RESP(Redis 프로토콜) 서버를 스레드로 띄움
+    - django_redis / redis.asyncio / get_redis_connection()은 평소처럼 그 소켓에 접속
+        → fork한 Worker 프로세스끼리도 같은 데이터를 공유 (benchmark_stampede_lock)
+        → 매 호출이 실제로 소켓 왕복을 하므로 수치를 실제 Redis와 비교 가능
+
+지원 명령 (이 프로젝트가 쓰는 범위):
+    문자열  GET SET(EX/PX/NX/XX/KEEPTTL) MGET MSET INCR(BY) DECR(BY) SETBIT GETBIT STRLEN
+    키      DEL EXISTS EXPIRE PEXPIRE PERSIST TTL PTTL TYPE KEYS SCAN RENAME MEMORY USAGE
+    해시    HSET HGET HMGET HGETALL HDEL HINCRBY HLEN
+    집합    SADD SREM SMEMBERS SISMEMBER SCARD
+    리스트  LPUSH RPUSH LRANGE LTRIM LLEN
+    정렬집합 ZADD ZINCRBY ZSCORE ZREM ZCARD ZRANGE ZREVRANGE ZRANGEBYSCORE
+            ZREVRANGEBYSCORE ZREMRANGEBYSCORE ZREMRANGEBYRANK
+    트랜잭션 WATCH UNWATCH MULTI EXEC DISCARD
+    pub/sub SUBSCRIBE UNSUBSCRIBE PUBLISH
+
+Lua(EVAL)는 지원하지 않음 → cache.incr()은 LocalRedisClient가 WATCH/MULTI로 처리
+"""
+import fnmatch
+import hashlib
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+
+from django_redis.client import DefaultClient
+
+
+class CommandError(Exception):
+    pass
+
+
+class WrongType(CommandError):
+    def __init__(self):
+        super().__init__('WRONGTYPE Operation against a key holding the wrong kind of value')
+
+
+def _int(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise CommandError('ERR value is not an integer or out of range') from None
+
+
+def _float(value):
+    value = value.lower()
+    if value in (b'+inf', b'inf'):
+        return float('inf')
+    if value == b'-inf':
+        return float('-inf')
+    try:
+        return float(value)
+    except ValueError:
+        raise CommandError('ERR value is not a valid float') from None
+
+
+def _score_bound(value):
+    """ZRANGEBYSCORE 경계: (1.5 = 미포함"""
+    if value.startswith(b'('):
+        return _float(value[1:]), True
+    return _float(value), False
+
+
+def _format_score(score):
+    if score.is_integer() and abs(score) < 1e17:
+        return str(int(score)).encode()
+    return repr(score).encode()
+
+
+def _slice(length, start, stop):
+    """Redis 범위(음수 인덱스, stop 포함) → 파이썬 슬라이스"""
+    if start < 0:
+        start = max(length + start, 0)
+    if stop < 0:
+        stop = length + stop
+    return start, min(stop, length - 1) + 1
+
+
+class LocalStore:
+    """
+    db별 키 공간 + 만료 시각 + WATCH용 변경 번호
+
+    값 타입: bytes(string) / dict(hash) / set / list / ZSet(dict member → score)
+    만료는 접근할 때 확인 (lazy)
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._dbs = {}
+        self._versions = {}  # (db, key) → 변경 번호 (WATCH)
+        self._channels = {}  # channel → 구독 중인 연결 집합
+
+    def db(self, index):
+        return self._dbs.setdefault(index, ({}, {}))  # (데이터, 만료 시각 ms)
+
+    def _now_ms(self):
+        return time.time() * 1000
+
+    def lookup(self, db, key):
+        data, expires = self.db(db)
+        deadline = expires.get(key)
+        if deadline is not None and deadline <= self._now_ms():
+            data.pop(key, None)
+            del expires[key]
+            self.touch(db, key)
+        return data.get(key)
+
+    def touch(self, db, key):
+        self._versions[(db, key)] = self._versions.get((db, key), 0) + 1
+
+    def version(self, db, key):
+        self.lookup(db, key)  # 만료도 변경으로 취급
+        return self._versions.get((db, key), 0)
+
+    def put(self, db, key, value, keep_ttl=False):
+        data, expires = self.db(db)
+        data[key] = value
+        if not keep_ttl:
+            expires.pop(key, None)
+        self.touch(db, key)
+
+    def remove(self, db, key):
+        data, expires = self.db(db)
+        if self.lookup(db, key) is None:
+            return False
+        del data[key]
+        expires.pop(key, None)
+        self.touch(db, key)
+        return True
+
+    def set_expiry(self, db, key, deadline_ms):
+        _, expires = self.db(db)
+        if deadline_ms is None:
+            expires.pop(key, None)
+        else:
+            expires[key] = deadline_ms
+        self.touch(db, key)
+
+    def keys(self, db):
+        data, _ = self.db(db)
+        return [key for key in list(data) if self.lookup(db, key) is not None]
+
+    def typed(self, db, key, kind, create=False):
+        value = self.lookup(db, key)
+        if value is None:
+            if not create:
+                return None
+            value = kind()
+            self.db(db)[0][key] = value
+        elif type(value) is not kind:
+            raise WrongType()
+        return value
+
+
+class ZSet(dict):
+    """member → score"""
+
+    def ordered(self):
+        return sorted(self.items(), key=lambda item: (item[1], item[0]))
+
+
+_NULL_ARRAY = []      # EXEC 취소 (WATCH 충돌) 응답 = *-1
+_NO_REPLY = object()  # SUBSCRIBE처럼 핸들러가 직접 응답을 보낸 경우
+
+
+class Connection(socketserver.StreamRequestHandler):
+    """클라이언트 연결 1개 - 자체 스레드에서 명령을 읽어 실행"""
+
+    store = None  # LocalRedisServer가 설정
+
+    def setup(self):
+        super().setup()
+        self.db = 0
+        self.watching = {}       # key → WATCH 시점 변경 번호
+        self.queued = None       # MULTI 중이면 명령 목록
+        self.queue_error = False
+        self.subscriptions = set()
+        self.write_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # RESP 입출력
+    # ------------------------------------------------------------------
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.split()  # 인라인 명령
+
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def encode(self, value):
+        if value is _NULL_ARRAY:
+            return b'*-1\r\n'
+        if value is None:
+            return b'$-1\r\n'
+        if isinstance(value, bool):
+            return b':%d\r\n' % value
+        if isinstance(value, int):
+            return b':%d\r\n' % value
+        if isinstance(value, bytes):
+            return b'$%d\r\n%s\r\n' % (len(value), value)
+        if isinstance(value, str):
+            return b'+%s\r\n' % value.encode()
+        if isinstance(value, CommandError):
+            message = str(value)
+            if not message.split(' ', 1)[0].isupper():
+                message = f'ERR {message}'
+            return b'-%s\r\n' % message.encode()
+        if isinstance(value, float):
+            return self.encode(_format_score(value))
+        return b'*%d\r\n' % len(value) + b''.join(self.encode(item) for item in value)
+
+    def send(self, value):
+        with self.write_lock:
+            self.wfile.write(self.encode(value))
+            self.wfile.flush()
+
+    def handle(self):
+        try:
+            while True:
+                args = self.read_command()
+                if args is None:
+                    break
+                if not args:
+                    continue
+                reply = self.dispatch(args)
+                if reply is not _NO_REPLY:
+                    self.send(reply)
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            with self.store.lock:
+                for channel in self.subscriptions:
+                    self.store._channels.get(channel, set()).discard(self)
+
+    # ------------------------------------------------------------------
+    # 명령 실행
+    # ------------------------------------------------------------------
+
+    def dispatch(self, args):
+        name = args[0].upper().decode()
+        handler = getattr(self, f'cmd_{name.lower()}', None)
+
+        if self.queued is not None and name not in ('EXEC', 'DISCARD', 'MULTI', 'WATCH'):
+            if handler is None:
+                self.queue_error = True
+                return CommandError(f"ERR unknown command '{name.lower()}'")
+            self.queued.append(args)
+            return 'QUEUED'
+
+        if handler is None:
+            if name in ('EVAL', 'EVALSHA', 'SCRIPT', 'FUNCTION', 'FCALL'):
+                return CommandError('ERR Lua scripting is not supported by the local Redis stand-in')
+            return CommandError(f"ERR unknown command '{name.lower()}'")
+
+        try:
+            with self.store.lock:
+                return handler(*args[1:])
+        except CommandError as e:
+            return e
+        except TypeError:
+            return CommandError(f"ERR wrong number of arguments for '{name.lower()}' command")
+
+    # 연결 / 서버 ------------------------------------------------------
+
+    def cmd_ping(self, message=None):
+        return 'PONG' if message is None else message
+
+    def cmd_echo(self, message):
+        return message
+
+    def cmd_select(self, index):
+        self.db = _int(index)
+        return 'OK'
+
+    def cmd_client(self, *args):
+        return 'OK'
+
+    def cmd_info(self, *args):
+        return b'# Server\r\nredis_version:7.0.0-local\r\n'
+
+    def cmd_dbsize(self):
+        return len(self.store.keys(self.db))
+
+    def cmd_flushdb(self, *args):
+        for key in self.store.keys(self.db):
+            self.store.remove(self.db, key)
+        return 'OK'
+
+    def cmd_flushall(self, *args):
+        for index in list(self.store._dbs):
+            for key in self.store.keys(index):
+                self.store.remove(index, key)
+        return 'OK'
+
+    def cmd_memory(self, subcommand, key, *args):
+        value = self.store.lookup(self.db, key)
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return len(key) + len(value) + 50
+        return len(key) + len(repr(value)) + 50
+
+    # 키 --------------------------------------------------------------
+
+    def cmd_del(self, *keys):
+        return sum(self.store.remove(self.db, key) for key in keys)
+
+    cmd_unlink = cmd_del
+
+    def cmd_exists(self, *keys):
+        return sum(self.store.lookup(self.db, key) is not None for key in keys)
+
+    def cmd_type(self, key):
+        value = self.store.lookup(self.db, key)
+        return {
+            type(None): 'none', bytes: 'string', dict: 'hash', set: 'set', list: 'list', ZSet: 'zset',
+        }[type(value)]
+
+    def _expire_at(self, key, deadline_ms):
+        if self.store.lookup(self.db, key) is None:
+            return 0
+        if deadline_ms <= self.store._now_ms():
+            self.store.remove(self.db, key)
+        else:
+            self.store.set_expiry(self.db, key, deadline_ms)
+        return 1
+
+    def cmd_expire(self, key, seconds, *flags):
+        return self._expire_at(key, self.store._now_ms() + _int(seconds) * 1000)
+
+    def cmd_pexpire(self, key, ms, *flags):
+        return self._expire_at(key, self.store._now_ms() + _int(ms))
+
+    def cmd_persist(self, key):
+        _, expires = self.store.db(self.db)
+        if self.store.lookup(self.db, key) is None or key not in expires:
+            return 0
+        self.store.set_expiry(self.db, key, None)
+        return 1
+
+    def cmd_pttl(self, key):
+        if self.store.lookup(self.db, key) is None:
+            return -2
+        deadline = self.store.db(self.db)[1].get(key)
+        if deadline is None:
+            return -1
+        return max(0, int(deadline - self.store._now_ms()))
+
+    def cmd_ttl(self, key):
+        ms = self.cmd_pttl(key)
+        return ms if ms < 0 else (ms + 500) // 1000
+
+    def cmd_keys(self, pattern):
+        pattern = pattern.decode()
+        return [key for key in self.store.keys(self.db) if fnmatch.fnmatchcase(key.decode(), pattern)]
+
+    def cmd_scan(self, cursor, *args):
+        # 전체를 한 번에 반환 (커서 0 = 끝)
+        options = dict(zip((a.upper() for a in args[::2]), args[1::2]))
+        keys = self.cmd_keys(options.get(b'MATCH', b'*'))
+        return [b'0', keys]
+
+    def cmd_rename(self, source, target):
+        value = self.store.lookup(self.db, source)
+        if value is None:
+            raise CommandError('ERR no such key')
+        deadline = self.store.db(self.db)[1].get(source)
+        self.store.remove(self.db, source)
+        self.store.put(self.db, target, value)
+        if deadline is not None:
+            self.store.set_expiry(self.db, target, deadline)
+        return 'OK'
+
+    # 문자열 ----------------------------------------------------------
+
+    def _string(self, key):
+        value = self.store.lookup(self.db, key)
+        if value is not None and not isinstance(value, bytes):
+            raise WrongType()
+        return value
+
+    def cmd_get(self, key):
+        return self._string(key)
+
+    def cmd_mget(self, *keys):
+        return [
+            value if isinstance(value, bytes) else None
+            for value in (self.store.lookup(self.db, key) for key in keys)
+        ]
+
+    def cmd_set(self, key, value, *args):
+        options = [a.upper() for a in args]
+        deadline = None
+        i = 0
+        while i < len(options):
+            option = options[i]
+            if option in (b'EX', b'PX', b'EXAT', b'PXAT'):
+                amount = _int(args[i + 1])
+                if amount <= 0:
+                    raise CommandError("ERR invalid expire time in 'set' command")
+                deadline = {
+                    b'EX': self.store._now_ms() + amount * 1000,
+                    b'PX': self.store._now_ms() + amount,
+                    b'EXAT': amount * 1000,
+                    b'PXAT': amount,
+                }[option]
+                i += 2
+                continue
+            i += 1
+
+        exists = self.store.lookup(self.db, key) is not None
+        if (b'NX' in options and exists) or (b'XX' in options and not exists):
+            return None
+
+        previous = self._string(key) if b'GET' in options else None
+        self.store.put(self.db, key, value, keep_ttl=b'KEEPTTL' in options)
+        if deadline is not None:
+            self.store.set_expiry(self.db, key, deadline)
+        return previous if b'GET' in options else 'OK'
+
+    def cmd_setex(self, key, seconds, value):
+        return self.cmd_set(key, value, b'EX', seconds)
+
+    def cmd_psetex(self, key, ms, value):
+        return self.cmd_set(key, value, b'PX', ms)
+
+    def cmd_setnx(self, key, value):
+        return int(self.cmd_set(key, value, b'NX') is not None)
+
+    def cmd_mset(self, *args):
+        for key, value in zip(args[::2], args[1::2]):
+            self.store.put(self.db, key, value)
+        return 'OK'
+
+    def cmd_incrby(self, key, delta):
+        current = self._string(key)
+        try:
+            value = int(current or 0) + _int(delta)
+        except ValueError:
+            raise CommandError('ERR value is not an integer or out of range') from None
+        if not -2 ** 63 <= value < 2 ** 63:
+            raise CommandError('ERR increment or decrement would overflow')
+        self.store.put(self.db, key, str(value).encode(), keep_ttl=True)
+        return value
+
+    def cmd_incr(self, key):
+        return self.cmd_incrby(key, b'1')
+
+    def cmd_decrby(self, key, delta):
+        return self.cmd_incrby(key, str(-_int(delta)).encode())
+
+    def cmd_decr(self, key):
+        return self.cmd_incrby(key, b'-1')
+
+    def cmd_strlen(self, key):
+        return len(self._string(key) or b'')
+
+    def cmd_setbit(self, key, offset, bit):
+        offset, bit = _int(offset), _int(bit)
+        data = bytearray(self._string(key) or b'')
+        byte = offset >> 3
+        if len(data) <= byte:
+            data.extend(b'\0' * (byte + 1 - len(data)))
+        mask = 0x80 >> (offset & 7)
+        previous = int(bool(data[byte] & mask))
+        data[byte] = (data[byte] | mask) if bit else (data[byte] & ~mask)
+        self.store.put(self.db, key, bytes(data), keep_ttl=True)
+        return previous
+
+    def cmd_getbit(self, key, offset):
+        offset = _int(offset)
+        data = self._string(key) or b''
+        byte = offset >> 3
+        if byte >= len(data):
+            return 0
+        return int(bool(data[byte] & (0x80 >> (offset & 7))))
+
+    # 해시 ------------------------------------------------------------
+
+    def cmd_hset(self, key, *args):
+        hash_ = self.store.typed(self.db, key, dict, create=True)
+        added = 0
+        for field, value in zip(args[::2], args[1::2]):
+            added += field not in hash_
+            hash_[field] = value
+        self.store.touch(self.db, key)
+        return added
+
+    def cmd_hsetnx(self, key, field, value):
+        hash_ = self.store.typed(self.db, key, dict, create=True)
+        if field in hash_:
+            return 0
+        hash_[field] = value
+        self.store.touch(self.db, key)
+        return 1
+
+    def cmd_hget(self, key, field):
+        return (self.store.typed(self.db, key, dict) or {}).get(field)
+
+    def cmd_hmget(self, key, *fields):
+        hash_ = self.store.typed(self.db, key, dict) or {}
+        return [hash_.get(field) for field in fields]
+
+    def cmd_hgetall(self, key):
+        hash_ = self.store.typed(self.db, key, dict) or {}
+        return [item for pair in hash_.items() for item in pair]
+
+    def cmd_hdel(self, key, *fields):
+        hash_ = self.store.typed(self.db, key, dict)
+        if hash_ is None:
+            return 0
+        removed = sum(hash_.pop(field, None) is not None for field in fields)
+        if not hash_:
+            self.store.remove(self.db, key)
+        else:
+            self.store.touch(self.db, key)
+        return removed
+
+    def cmd_hincrby(self, key, field, delta):
+        hash_ = self.store.typed(self.db, key, dict, create=True)
+        value = _int(hash_.get(field, b'0')) + _int(delta)
+        hash_[field] = str(value).encode()
+        self.store.touch(self.db, key)
+        return value
+
+    def cmd_hlen(self, key):
+        return len(self.store.typed(self.db, key, dict) or {})
+
+    # 집합 ------------------------------------------------------------
+
+    def cmd_sadd(self, key, *members):
+        set_ = self.store.typed(self.db, key, set, create=True)
+        before = len(set_)
+        set_.update(members)
+        self.store.touch(self.db, key)
+        return len(set_) - before
+
+    def cmd_srem(self, key, *members):
+        set_ = self.store.typed(self.db, key, set)
+        if set_ is None:
+            return 0
+        before = len(set_)
+        set_.difference_update(members)
+        if not set_:
+            self.store.remove(self.db, key)
+        else:
+            self.store.touch(self.db, key)
+        return before - len(set_)
+
+    def cmd_smembers(self, key):
+        return list(self.store.typed(self.db, key, set) or ())
+
+    def cmd_sismember(self, key, member):
+        return int(member in (self.store.typed(self.db, key, set) or ()))
+
+    def cmd_scard(self, key):
+        return len(self.store.typed(self.db, key, set) or ())
+
+    # 리스트 ----------------------------------------------------------
+
+    def cmd_lpush(self, key, *values):
+        list_ = self.store.typed(self.db, key, list, create=True)
+        for value in values:
+            list_.insert(0, value)
+        self.store.touch(self.db, key)
+        return len(list_)
+
+    def cmd_rpush(self, key, *values):
+        list_ = self.store.typed(self.db, key, list, create=True)
+        list_.extend(values)
+        self.store.touch(self.db, key)
+        return len(list_)
+
+    def cmd_lrange(self, key, start, stop):
+        list_ = self.store.typed(self.db, key, list) or []
+        start, stop = _slice(len(list_), _int(start), _int(stop))
+        return list_[start:stop]
+
+    def cmd_ltrim(self, key, start, stop):
+        list_ = self.store.typed(self.db, key, list)
+        if list_ is None:
+            return 'OK'
+        start, stop = _slice(len(list_), _int(start), _int(stop))
+        list_[:] = list_[start:stop]
+        if not list_:
+            self.store.remove(self.db, key)
+        else:
+            self.store.touch(self.db, key)
+        return 'OK'
+
+    def cmd_llen(self, key):
+        return len(self.store.typed(self.db, key, list) or [])
+
+    # 정렬 집합 -------------------------------------------------------
+
+    def cmd_zadd(self, key, *args):
+        flags = set()
+        i = 0
+        while i < len(args) and args[i].upper() in (b'NX', b'XX', b'GT', b'LT', b'CH', b'INCR'):
+            flags.add(args[i].upper())
+            i += 1
+
+        zset = self.store.typed(self.db, key, ZSet, create=True)
+        changed = added = 0
+        result = None
+        pairs = args[i:]
+        for score, member in zip(pairs[::2], pairs[1::2]):
+            score = _float(score)
+            exists = member in zset
+            if (b'NX' in flags and exists) or (b'XX' in flags and not exists):
+                continue
+            if b'INCR' in flags:
+                score += zset.get(member, 0.0)
+            if exists and ((b'GT' in flags and score <= zset[member]) or (b'LT' in flags and score >= zset[member])):
+                continue
+            if not exists:
+                added += 1
+            if zset.get(member) != score:
+                changed += 1
+            zset[member] = result = score
+
+        if not zset:
+            self.store.remove(self.db, key)
+        else:
+            self.store.touch(self.db, key)
+        if b'INCR' in flags:
+            return result
+        return changed if b'CH' in flags else added
+
+    def cmd_zincrby(self, key, delta, member):
+        zset = self.store.typed(self.db, key, ZSet, create=True)
+        zset[member] = zset.get(member, 0.0) + _float(delta)
+        self.store.touch(self.db, key)
+        return zset[member]
+
+    def cmd_zscore(self, key, member):
+        return (self.store.typed(self.db, key, ZSet) or {}).get(member)
+
+    def cmd_zrem(self, key, *members):
+        zset = self.store.typed(self.db, key, ZSet)
+        if zset is None:
+            return 0
+        removed = sum(zset.pop(member, None) is not None for member in members)
+        if not zset:
+            self.store.remove(self.db, key)
+        else:
+            self.store.touch(self.db, key)
+        return removed
+
+    def cmd_zcard(self, key):
+        return len(self.store.typed(self.db, key, ZSet) or {})
+
+    def _range_reply(self, items, withscores):
+        if withscores:
+            return [value for member, score in items for value in (member, score)]
+        return [member for member, _ in items]
+
+    def cmd_zrange(self, key, start, stop, *args):
+        options = {a.upper() for a in args}
+        if b'BYSCORE' in options:
+            reverse = b'REV' in options
+            return self._by_score(key, stop if reverse else start, start if reverse else stop, args, reverse)
+
+        items = (self.store.typed(self.db, key, ZSet) or ZSet()).ordered()
+        if b'REV' in options:
+            items.reverse()
+        start, stop = _slice(len(items), _int(start), _int(stop))
+        return self._range_reply(items[start:stop], b'WITHSCORES' in options)
+
+    def cmd_zrevrange(self, key, start, stop, *args):
+        return self.cmd_zrange(key, start, stop, b'REV', *args)
+
+    def _by_score(self, key, low, high, args, reverse=False):
+        (low, low_open), (high, high_open) = _score_bound(low), _score_bound(high)
+        items = [
+            (member, score)
+            for member, score in (self.store.typed(self.db, key, ZSet) or ZSet()).ordered()
+            if (score > low if low_open else score >= low) and (score < high if high_open else score <= high)
+        ]
+        if reverse:
+            items.reverse()
+
+        upper = [a.upper() for a in args]
+        if b'LIMIT' in upper:
+            i = upper.index(b'LIMIT')
+            offset, count = _int(args[i + 1]), _int(args[i + 2])
+            items = items[offset:] if count < 0 else items[offset:offset + count]
+        return self._range_reply(items, b'WITHSCORES' in upper)
+
+    def cmd_zrangebyscore(self, key, low, high, *args):
+        return self._by_score(key, low, high, args)
+
+    def cmd_zrevrangebyscore(self, key, high, low, *args):
+        return self._by_score(key, low, high, args, reverse=True)
+
+    def cmd_zremrangebyscore(self, key, low, high):
+        members = self._by_score(key, low, high, ())
+        return self.cmd_zrem(key, *members) if members else 0
+
+    def cmd_zremrangebyrank(self, key, start, stop):
+        members = self.cmd_zrange(key, start, stop)
+        return self.cmd_zrem(key, *members) if members else 0
+
+    # 트랜잭션 --------------------------------------------------------
+
+    def cmd_watch(self, *keys):
+        if self.queued is not None:
+            raise CommandError('ERR WATCH inside MULTI is not allowed')
+        for key in keys:
+            self.watching.setdefault(key, self.store.version(self.db, key))
+        return 'OK'
+
+    def cmd_unwatch(self):
+        self.watching = {}
+        return 'OK'
+
+    def cmd_multi(self):
+        if self.queued is not None:
+            raise CommandError('ERR MULTI calls can not be nested')
+        self.queued = []
+        self.queue_error = False
+        return 'OK'
+
+    def cmd_discard(self):
+        if self.queued is None:
+            raise CommandError('ERR DISCARD without MULTI')
+        self.queued = None
+        self.watching = {}
+        return 'OK'
+
+    def cmd_exec(self):
+        if self.queued is None:
+            raise CommandError('ERR EXEC without MULTI')
+
+        queued, self.queued = self.queued, None
+        watching, self.watching = self.watching, {}
+        if self.queue_error:
+            raise CommandError('EXECABORT Transaction discarded because of previous errors.')
+
+        # 이미 store.lock을 잡고 있으므로 큐의 명령이 원자적으로 실행됨
+        if any(self.store.version(self.db, key) != version for key, version in watching.items()):
+            return _NULL_ARRAY
+
+        results = []
+        for args in queued:
+            handler = getattr(self, f'cmd_{args[0].decode().lower()}')
+            try:
+                results.append(handler(*args[1:]))
+            except CommandError as e:
+                results.append(e)
+            except TypeError:
+                results.append(CommandError(f"ERR wrong number of arguments for '{args[0].decode().lower()}' command"))
+        return results
+
+    # pub/sub ---------------------------------------------------------
+
+    def cmd_subscribe(self, *channels):
+        for channel in channels:
+            self.subscriptions.add(channel)
+            self.store._channels.setdefault(channel, set()).add(self)
+            self.send([b'subscribe', channel, len(self.subscriptions)])
+        return _NO_REPLY
+
+    def cmd_unsubscribe(self, *channels):
+        for channel in channels or list(self.subscriptions):
+            self.subscriptions.discard(channel)
+            self.store._channels.get(channel, set()).discard(self)
+            self.send([b'unsubscribe', channel, len(self.subscriptions)])
+        return _NO_REPLY
+
+    def cmd_publish(self, channel, message):
+        subscribers = list(self.store._channels.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.send([b'message', channel, message])
+            except OSError:
+                pass
+        return len(subscribers)
+
+
+class LocalRedisServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 512  # 여러 프로세스 × 스레드가 동시에 접속 (기본값 5)
+
+    def __init__(self, path):
+        store = LocalStore()
+        handler = type('BoundConnection', (Connection,), {'store': store})
+        super().__init__(path, handler)
+        self.store = store
+
+
+# ----------------------------------------------------------------------
+# 서버 시작 / 접속 주소
+# ----------------------------------------------------------------------
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def socket_path(location):
+    """local:///tmp/x.sock → /tmp/x.sock, local:// → 프로젝트마다 고정된 임시 경로"""
+    path = location.removeprefix('local://').split('?')[0]
+    if path and path != '/':
+        return path
+    digest = hashlib.md5(os.getcwd().encode()).hexdigest()[:8]
+    return os.path.join(tempfile.gettempdir(), f'django-local-redis-{digest}.sock')
+
+
+def _is_serving(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def ensure_server(location):
+    """
+    소켓에 응답하는 서버가 없으면 이 프로세스에서 시작
+
+    fork된 자식 프로세스는 부모의 서버에 접속함 (부모가 살아 있는 동안)
+    """
+    path = socket_path(location)
+    with _servers_lock:
+        if path in _servers or _is_serving(path):
+            return path
+
+        if os.path.exists(path):
+            os.unlink(path)  # 이전 실행이 남긴 소켓 파일
+        server = LocalRedisServer(path)
+        threading.Thread(target=server.serve_forever, name='local-redis', daemon=True).start()
+        _servers[path] = server
+        return path
+
+
+def server_url(location, db=1):
+    """redis-py / redis.asyncio가 접속할 URL"""
+    if not location.startswith('local://'):
+        return location
+    # 로컬 서버는 RESP2만 지원 (redis-py 8 기본값은 RESP3)
+    return f'unix://{ensure_server(location)}?db={db}&protocol=2'
+
+
+class LocalRedisClient(DefaultClient):
+    """
+    local:// LOCATION을 로컬 서버의 유닉스 소켓 URL로 바꿔서 접속하는 django_redis 클라이언트
+
+    settings.CACHES['default']['OPTIONS']['CLIENT_CLASS'] = 'market.local_redis.LocalRedisClient'
+    """
+
+    def __init__(self, server, params, backend):
+        if isinstance(server, str):
+            server = server.split(',')
+        super().__init__([server_url(location) for location in server], params, backend)
+
+    def _incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        """Lua 없이 WATCH/MULTI로 원자적 증가 (기본 구현은 EVAL 사용)"""
+        from redis.exceptions import WatchError
+
+        if client is None:
+            client = self.get_client(write=True)
+        key = self.make_key(key, version=version)
+
+        with client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    if not ignore_key_check and not pipe.exists(key):
+                        pipe.unwatch()
+                        raise ValueError(f"Key '{key!r}' not found")
+                    pipe.multi()
+                    pipe.incrby(key, delta)
+                    return pipe.execute()[0]
+                except WatchError:
+                    continue
@@ -0,0 +1,44 @@
+"""
+일별 매출 집계 백필 (market.sales_rollup)
+
+    python manage.py backfill_sales_rollup                          # 주문이 있는 전체 기간
+    python manage.py backfill_sales_rollup --start 2026-01-01 --end 2026-01-31
+    python manage.py backfill_sales_rollup --chunk-days 1           # 하루씩 (데이터가 많을 때)
+
+    - chunk-days 구간마다 트랜잭션 1번: 집계 행 삭제 → GROUP BY 2번 → bulk_create
+    - 처음 도입할 때, bulk 적재(sales_rollup.suspended) 이후, 어긋남이 의심될 때 실행
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from market.sales_rollup import backfill
+
+
+class Command(BaseCommand):
+    help = '주문 / 주문 항목으로 일별 매출 집계를 날짜 구간 단위로 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='시작일 (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='종료일 (YYYY-MM-DD, 포함)')
+        parser.add_argument('--chunk-days', type=int, default=7, help='트랜잭션 1번에 다시 집계할 일수')
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days는 1 이상이어야 합니다.')
+        if options['start'] and options['end'] and options['start'] > options['end']:
+            raise CommandError('--start가 --end보다 늦습니다.')
+
+        def progress(chunk_start, chunk_end, created):
+            self.stdout.write(f'{chunk_start} ~ {chunk_end}: 누적 {created}행')
+
+        start = time.perf_counter()
+        created = backfill(
+            options['start'], options['end'],
+            chunk_days=options['chunk_days'],
+            progress=progress if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'일별 매출 집계 {created}행을 만들었습니다. ({time.perf_counter() - start:.2f}초)'
+        ))
@@ -0,0 +1,50 @@
+"""
+접두사별 캐시 통계 출력
+
+    python manage.py cache_stats            # 표 출력
+    python manage.py cache_stats --json     # JSON 출력
+    python manage.py cache_stats --reset    # 수집된 통계 초기화
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from market.cache_metrics import LATENCY_BUCKETS_MS, collect_metrics, reset_metrics
+
+
+class Command(BaseCommand):
+    help = '캐시 키 접두사별 히트율, 지연 시간, 값 크기를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+        parser.add_argument('--reset', action='store_true', help='통계 초기화')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_metrics()
+            self.stdout.write(self.style.SUCCESS('캐시 통계를 초기화했습니다.'))
+            return
+
+        metrics = collect_metrics()
+
+        if options['json']:
+            self.stdout.write(json.dumps(metrics, indent=2, ensure_ascii=False))
+            return
+
+        self.stdout.write(
+            f"{'prefix':<24}{'hits':>10}{'misses':>10}{'hit%':>8}"
+            f"{'sets':>8}{'dels':>8}{'get p95':>10}{'avg size':>10}"
+        )
+        for prefix, m in sorted(metrics['prefixes'].items(), key=lambda kv: kv[1]['hit_rate']):
+            p95 = m['ops']['get']['p95_ms']
+            p95 = f'>{LATENCY_BUCKETS_MS[-1]}' if p95 is None else p95
+            self.stdout.write(
+                f"{prefix:<24}{m['hits']:>10}{m['misses']:>10}{m['hit_rate'] * 100:>7.1f}%"
+                f"{m['ops']['set']['count']:>8}{m['ops']['delete']['count']:>8}"
+                f"{p95:>8}ms{m['avg_size']:>9.0f}B"
+            )
+
+        if metrics['oversized']:
+            self.stdout.write('\n큰 값 샘플:')
+            for entry in metrics['oversized']:
+                self.stdout.write(f"  {entry['key']}  {entry['size']:,}B")
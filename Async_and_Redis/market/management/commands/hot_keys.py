@@ -0,0 +1,48 @@
+"""
+핫 키 리포트 (market.hot_keys)
+
+    python manage.py hot_keys               # 상위 20개 키와 초당 요청 수
+    python manage.py hot_keys --limit 50
+    python manage.py hot_keys --json
+    python manage.py hot_keys --reset       # 수집된 샘플 초기화
+"""
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from market.hot_keys import hot_keys
+
+
+class Command(BaseCommand):
+    help = '최근 윈도에서 가장 많이 읽힌 캐시 키와 초당 요청 수, 복제 여부를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+        parser.add_argument('--reset', action='store_true', help='샘플 초기화')
+
+    def handle(self, *args, **options):
+        cache.client  # 백엔드 초기화 (hot_keys.backend 설정)
+        if hot_keys.backend is None:
+            self.stderr.write('핫 키 추적은 market.cache_backends.InstrumentedRedisCache에서만 동작합니다.')
+            return
+
+        if options['reset']:
+            hot_keys.reset()
+            self.stdout.write(self.style.SUCCESS('핫 키 샘플을 초기화했습니다.'))
+            return
+
+        report = hot_keys.report(limit=options['limit'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+            return
+
+        self.stdout.write(
+            f"최근 {report['window_seconds']}초, 복제 기준 {report['threshold']} req/s (모든 Worker 합계)\n"
+        )
+        self.stdout.write(f"{'key':<48}{'req/s':>10}  복제")
+        for entry in report['keys']:
+            mark = '✅' if entry['replicated'] else ''
+            self.stdout.write(f"{entry['key']:<48}{entry['rate']:>10.1f}  {mark}")
@@ -0,0 +1,144 @@
+"""
+인덱스 추천 (market.index_advisor)
+
+워크로드 수집:
+    python manage.py index_advisor --run 04_redis_part1:product_list_without_cache   # 함수 실행 중 SQL
+    python manage.py index_advisor --url '/market/products/?category=a' --user admin # GET 요청 재생
+    python manage.py index_advisor --sampled          # 운영 중 샘플링 윈도 (QUERY_WORKLOAD_SAMPLE_RATE)
+    python manage.py index_advisor --load workload.json
+
+    --save workload.json    수집한 워크로드를 파일로 (다른 DB에서 --load로 분석)
+    --reset-sampled         샘플링 윈도 초기화
+    --no-verify             인덱스를 임시로 만들어 보는 검증 생략
+    --min-rows 1000         이보다 작은 테이블은 건너뜀
+    --json
+"""
+import contextlib
+import importlib
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from market.index_advisor import MIN_ROWS, analyze
+from market.query_workload import Workload, record, reset_sampled, sampled_workload
+
+
+class Command(BaseCommand):
+    help = 'SQL 워크로드를 EXPLAIN QUERY PLAN으로 점검하고 전체 스캔 / 임시 정렬을 없앨 인덱스를 추천합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--run', action='append', default=[], metavar='MODULE:FUNCTION',
+                            help='실행하며 SQL을 기록할 함수 (여러 번 지정 가능)')
+        parser.add_argument('--url', action='append', default=[], help='재생할 GET 경로 (여러 번 지정 가능)')
+        parser.add_argument('--user', help='--url 요청에 로그인할 사용자 이름')
+        parser.add_argument('--sampled', action='store_true', help='샘플링 윈도의 워크로드 (Redis)')
+        parser.add_argument('--load', action='append', default=[], metavar='FILE', help='저장한 워크로드')
+        parser.add_argument('--save', metavar='FILE', help='수집한 워크로드 저장')
+        parser.add_argument('--reset-sampled', action='store_true', help='샘플링 윈도 초기화')
+        parser.add_argument('--no-verify', action='store_true', help='인덱스를 임시로 만들어 보는 검증 생략')
+        parser.add_argument('--min-rows', type=int, default=MIN_ROWS)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+
+    def handle(self, *args, **options):
+        if options['reset_sampled']:
+            reset_sampled()
+            self.stdout.write(self.style.SUCCESS('샘플링 윈도를 초기화했습니다.'))
+            return
+
+        using = options['database']
+        if connections[using].vendor != 'sqlite':
+            raise CommandError('SQLite의 EXPLAIN QUERY PLAN 형식만 지원합니다.')
+
+        workload = self._collect(options)
+        if options['save']:
+            workload.save(options['save'])
+            self.stderr.write(f"워크로드 저장: {options['save']} (문장 {len(workload)}개)")
+        if not workload:
+            raise CommandError('분석할 SQL이 없습니다. --run / --url / --sampled / --load 중 하나를 지정하세요.')
+
+        report = analyze(workload, using=using, min_rows=options['min_rows'], check=not options['no_verify'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False, default=str))
+            return
+        self._print(report, workload)
+
+    # ------------------------------------------------------------------
+    # 수집
+    # ------------------------------------------------------------------
+
+    def _collect(self, options):
+        workload = Workload()
+        for path in options['load']:
+            workload.merge(Workload.load(path))
+        if options['sampled'] or not (options['run'] or options['url'] or options['load']):
+            workload.merge(sampled_workload())
+
+        for target in options['run']:
+            module_name, _, function_name = target.partition(':')
+            if not function_name:
+                raise CommandError(f'--run은 MODULE:FUNCTION 형식입니다: {target}')
+            function = getattr(importlib.import_module(module_name), function_name)
+            # 실습 함수의 출력은 숨김 (-v 2면 표시)
+            output = contextlib.nullcontext() if options['verbosity'] > 1 else contextlib.redirect_stdout(io.StringIO())
+            with output, record() as recorded:
+                function()
+            workload.merge(recorded)
+
+        if options['url']:
+            from django.contrib.auth import get_user_model
+            from django.test import Client
+
+            client = Client()
+            if options['user']:
+                client.force_login(get_user_model().objects.get(username=options['user']))
+            with record() as recorded:
+                for url in options['url']:
+                    response = client.get(url)
+                    if response.status_code >= 400:
+                        self.stderr.write(f'{url}: HTTP {response.status_code}')
+            workload.merge(recorded)
+
+        return workload
+
+    # ------------------------------------------------------------------
+    # 출력
+    # ------------------------------------------------------------------
+
+    def _print(self, report, workload):
+        self.stdout.write(f"문장 {report['statements']}개 (실행 {workload.total_count:,}번) 점검\n")
+
+        if not report['proposals']:
+            self.stdout.write(self.style.SUCCESS('추천할 인덱스가 없습니다.'))
+
+        for rank, proposal in enumerate(report['proposals'], start=1):
+            kind = '부분 인덱스' if proposal['partial'] else '인덱스'
+            self.stdout.write(self.style.MIGRATE_HEADING(f"[{rank}] {proposal['model']} - {kind}"))
+            self.stdout.write(f"    {proposal['index']},")
+            self.stdout.write(
+                f"    예상: 실행 1번에 읽는 행 {proposal['rows_before']:,} → {proposal['rows_after']:,}, "
+                f"워크로드 전체 {proposal['rows_saved']:,}행 감소"
+            )
+            for finding in proposal['statements']:
+                problem = '전체 스캔' if finding['problem'] == 'scan' else '임시 정렬'
+                self.stdout.write(f"    - {problem} ×{finding['count']}: {finding['sql'][:120]}")
+                self.stdout.write(f"        현재: {finding['plan']}")
+                verified = finding.get('verified')
+                if verified is None:
+                    continue
+                mark = self.style.SUCCESS('해결') if finding['fixed'] else self.style.WARNING('남음')
+                self.stdout.write(f"        적용: {' / '.join(verified['plan'])} [{mark}]")
+                if verified['before_ms'] is not None:
+                    self.stdout.write(
+                        f"        실행 시간: {verified['before_ms']:.2f}ms → {verified['after_ms']:.2f}ms"
+                    )
+            self.stdout.write('')
+
+        if report['unresolved']:
+            self.stdout.write(self.style.WARNING('인덱스로 해결하지 못하는 문장'))
+            for finding in report['unresolved']:
+                self.stdout.write(f"    - ×{finding['count']}: {finding['sql'][:120]}")
+                self.stdout.write(f"        {finding.get('plan', '')} {finding['reason']}".rstrip())
@@ -0,0 +1,54 @@
+"""
+누적 주문 통계 전체 재계산 (market.order_stats)
+
+    python manage.py rebuild_order_stats          # cron으로 주기 실행 → 어긋난 합계 보정
+    python manage.py rebuild_order_stats --check  # 재계산 없이 현재 합계와 집계 결과만 비교
+
+    - 다른 Worker가 재계산 중이면 끝날 때까지 기다린 뒤 실행
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from market.cache_lock import RedisLock
+from market.order_stats import STATS_KEY, order_stats
+
+
+class Command(BaseCommand):
+    help = '주문 테이블 전체를 집계하여 누적 주문 통계를 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='재계산 없이 차이만 출력')
+        parser.add_argument('--wait', type=float, default=60.0, help='재계산 락 대기 시간 (초)')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            current, expected = order_stats.check()
+            self.stdout.write(json.dumps({'current': current, 'expected': expected}, indent=2, ensure_ascii=False))
+            return
+
+        before = order_stats.get()
+
+        lock = RedisLock(f'{STATS_KEY}:rebuild', timeout=60)
+        if not self._acquire(lock, options['wait']):
+            raise CommandError('다른 Worker가 재계산 중입니다.')
+        try:
+            order_stats.rebuild()
+        finally:
+            lock.release()
+
+        after = order_stats.get()
+        drift = after['total_orders'] - before['total_orders']
+        self.stdout.write(self.style.SUCCESS(
+            f"주문 {after['total_orders']}건, 매출 {after['total_revenue']:.2f} "
+            f"(보정 전 대비 주문 수 {drift:+d})"
+        ))
+
+    def _acquire(self, lock, wait):
+        deadline = time.monotonic() + wait
+        while not lock.acquire():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
@@ -0,0 +1,64 @@
+"""
+Redis 재고 카운터 점검 (market.stock)
+
+    python manage.py reconcile_stock            # 카운터 ≠ DB 재고 + 미반영 델타 인 상품 출력
+    python manage.py reconcile_stock --fix      # DB 기준으로 카운터를 다시 맞춤 (카운터가 더 높은 경우만)
+    python manage.py reconcile_stock --flush    # 점검 전에 미반영 델타부터 DB에 반영
+
+    - 점검 전에 이전 flush가 남긴 배치(stock:flushing:*)를 먼저 반영
+    - 삭제된 상품에 남은 델타도 --fix로 정리
+    - 카운터가 DB 재고 + 미반영 델타보다 낮으면 DB가 덮어써졌을 가능성 → 보고만 하고 고치지 않음
+      (카운터를 올리면 그만큼 초과 판매) - DB 재고를 확인한 뒤 직접 수정
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from market.models import StockFlush
+from market.stock import stock_counters
+
+
+class Command(BaseCommand):
+    help = 'Redis 재고 카운터와 DB 재고를 비교하고, 필요하면 DB 기준으로 다시 맞춥니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='어긋난 카운터를 DB 기준으로 수정')
+        parser.add_argument('--flush', action='store_true', help='점검 전에 미반영 델타를 DB에 반영')
+        parser.add_argument('--keep-days', type=int, default=7, help='반영 기록(StockFlush) 보관 일수')
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            written = stock_counters.flush()
+            self.stdout.write(f'미반영 델타 반영: {written}개 상품')
+
+        result = stock_counters.reconcile(fix=options['fix'])
+
+        suspects = [entry for entry in result['drift'] if entry['suspect'] == 'db']
+        for entry in result['drift']:
+            self.stdout.write(
+                f"상품 {entry['id']}: 카운터 {entry['counter']} / 예상 {entry['expected']} "
+                f"({entry['counter'] - entry['expected']:+d})"
+                + (' - DB 재고 확인 필요' if entry['suspect'] == 'db' else '')
+            )
+        if result['orphans']:
+            self.stdout.write(f"삭제된 상품의 미반영 델타: {result['orphans']}")
+
+        # 오래된 반영 기록 정리 (복구 시 확인하는 건 최근 배치뿐)
+        cutoff = timezone.now() - timedelta(days=options['keep_days'])
+        pruned, _ = StockFlush.objects.filter(flushed_at__lt=cutoff).delete()
+
+        problems = len(result['drift']) + len(result['orphans'])
+        if not problems:
+            self.stdout.write(self.style.SUCCESS(f'재고 카운터 정상 (반영 기록 {pruned}개 정리)'))
+        elif options['fix']:
+            fixed = problems - len(suspects)
+            if fixed:
+                self.stdout.write(self.style.SUCCESS(f'{fixed}건을 DB 기준으로 수정했습니다.'))
+            if suspects:
+                self.stdout.write(self.style.WARNING(
+                    f'{len(suspects)}건은 카운터가 DB보다 낮아 수정하지 않았습니다 '
+                    f'(DB 재고가 덮어써졌을 수 있음): {[entry["id"] for entry in suspects]}'
+                ))
+        else:
+            self.stdout.write(self.style.WARNING(f'{problems}건 불일치 - --fix로 수정할 수 있습니다.'))
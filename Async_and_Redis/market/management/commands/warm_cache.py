@@ -0,0 +1,143 @@
+"""
+캐시 워밍 - 배포 / Redis 재시작 직후 DB로 쏟아지는 미스 방지
+
+    python manage.py warm_cache
+    python manage.py warm_cache --top 500               # 판매량 상위 500개 상품만
+    python manage.py warm_cache --concurrency 4 --rate 5000
+    python manage.py warm_cache --bloom                 # 상품 id Bloom 필터도 재구축
+
+    - 상품은 iterator()로 스트리밍 (전체를 메모리에 올리지 않음)
+    - CacheAsidePattern과 같은 페이로드를 set_many(파이프라인)로 배치 저장
+    - 진행 중인 배치 수를 제한하여 메모리 사용량 고정
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from market.bloom import product_bloom
+from market.models import OrderItem, Product
+from market.product_cache import (
+    PRODUCT_PAYLOAD_FIELDS,
+    category_key,
+    category_products_payload,
+    category_tags,
+    product_key,
+    product_payload,
+)
+from market.tag_cache import TagBasedCache
+from market.ttl_policy import set_many_with_policy
+
+
+class RateLimiter:
+    """초당 키 수 제한 (0 = 무제한)"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self, n):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(self.next_at, now)
+            self.next_at = start + n * self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Command(BaseCommand):
+    help = '상품 / 카테고리 목록 캐시를 미리 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='set_many 1번에 쓰는 키 수')
+        parser.add_argument('--concurrency', type=int, default=1, help='동시에 쓰는 배치 수')
+        parser.add_argument('--rate', type=int, default=0, help='초당 최대 키 수 (0 = 무제한)')
+        parser.add_argument('--top', type=int, default=0, help='판매량 상위 N개 상품만 워밍 (0 = 전체)')
+        parser.add_argument('--ttl', type=int, default=None, help='고정 TTL (기본: 키마다 TTL 정책 + 지터)')
+        parser.add_argument('--bloom', action='store_true', help='상품 id Bloom 필터 재구축')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        concurrency = max(1, options['concurrency'])
+        ttl = options['ttl']
+        limiter = RateLimiter(options['rate'])
+
+        # 진행 중인 배치 수 제한 → 메모리 사용량 상한
+        slots = threading.BoundedSemaphore(concurrency * 2)
+        written = [0]
+        written_lock = threading.Lock()
+
+        def write(batch):
+            try:
+                limiter.wait(len(batch))
+                if ttl is None:
+                    # 키마다 지터가 다른 TTL → 워밍한 키들이 한꺼번에 만료되지 않음
+                    set_many_with_policy(batch)
+                else:
+                    cache.set_many(batch, ttl)
+                with written_lock:
+                    written[0] += len(batch)
+            finally:
+                slots.release()
+
+        def submit(executor, batch):
+            slots.acquire()
+            return executor.submit(write, batch)
+
+        start = time.time()
+        products = Product.objects.only(*PRODUCT_PAYLOAD_FIELDS).order_by('id')
+
+        if options['top']:
+            top_ids = list(
+                OrderItem.objects.values('product_id')
+                .annotate(sold=Sum('quantity'))
+                .order_by('-sold')
+                .values_list('product_id', flat=True)[:options['top']]
+            )
+            products = products.filter(id__in=top_ids)
+            self.stdout.write(f'판매량 상위 {len(top_ids)}개 상품 워밍')
+
+        categories = set()
+        futures = []
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            batch = {}
+            for product in products.iterator(chunk_size=batch_size):
+                batch[product_key(product.id)] = product_payload(product)
+                categories.add(product.category)
+
+                if len(batch) >= batch_size:
+                    futures.append(submit(executor, batch))
+                    batch = {}
+            if batch:
+                futures.append(submit(executor, batch))
+
+            # 카테고리 목록 - 현재 태그 버전과 함께 저장 (TagBasedCache 형식)
+            batch = {}
+            for category in sorted(categories):
+                versions = TagBasedCache.get_tag_versions(category_tags(category))
+                batch[category_key(category)] = {
+                    'tags': versions,
+                    'data': category_products_payload(category),
+                }
+            if batch:
+                futures.append(submit(executor, batch))
+
+            for future in futures:
+                future.result()  # 쓰기 오류가 있으면 여기서 발생
+
+        if options['bloom']:
+            count = product_bloom.rebuild()
+            self.stdout.write(f'Bloom 필터 재구축: 상품 {count}개')
+
+        elapsed = time.time() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {written[0]}개 키 워밍 완료 '
+            f'(상품 {written[0] - len(categories)}, 카테고리 {len(categories)}, {elapsed:.2f}초)'
+        ))
@@ -0,0 +1,106 @@
+"""
+요청 범위 메모 설치 미들웨어 (market.request_memo)
+
+settings.DEBUG이면 흡수한 중복 조회 수를 응답 헤더로 노출
+    X-Request-Memo: hits=12; misses=4
+
+SQL 워크로드 샘플링 미들웨어 (market.query_workload → python manage.py index_advisor)
+"""
+import logging
+import random
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from market.query_workload import publish, record
+from market.request_memo import request_scope
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMemoMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with request_scope() as memo:
+            response = self.get_response(request)
+        return self._report(request, response, memo)
+
+    async def __acall__(self, request):
+        # 태스크마다 컨텍스트가 분리되므로 동시 요청끼리 메모를 공유하지 않음
+        with request_scope() as memo:
+            response = await self.get_response(request)
+        return self._report(request, response, memo)
+
+    def _report(self, request, response, memo):
+        stats = memo.stats()
+        request.memo_stats = stats
+        if stats['hits']:
+            logger.debug('request memo %s: %s', request.path, stats)
+        if settings.DEBUG:
+            response['X-Request-Memo'] = f"hits={stats['hits']}; misses={stats['misses']}"
+        return response
+
+
+class QueryWorkloadMiddleware:
+    """
+    요청 중 QUERY_WORKLOAD_SAMPLE_RATE 비율만 실행된 SQL을 기록해 Redis에 합산
+    (비율이 0이면 random() 한 번 외에 비용 없음 - ASGI에서도 스레드 전환 없음)
+
+    기록은 DB 연결에 거는 execute_wrapper → ASGI에서는 ORM이 실행되는 스레드(요청마다 하나)에서 설치 / 해제
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _sampled():
+        rate = getattr(settings, 'QUERY_WORKLOAD_SAMPLE_RATE', 0.0)
+        return rate and random.random() < rate
+
+    @staticmethod
+    def _publish(workload):
+        try:
+            publish(workload)
+        except Exception:
+            # 수집 실패가 요청을 실패시키면 안 됨
+            logger.warning('query workload publish failed', exc_info=True)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        with record() as workload:
+            response = self.get_response(request)
+        self._publish(workload)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        stack = ExitStack()
+        workload = await sync_to_async(stack.enter_context)(record())
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        await sync_to_async(self._publish)(workload)
+        return response
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-17 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockFlush',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('products', models.IntegerField()),
+                ('flushed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'stock_flushes',
+            },
+        ),
+    ]
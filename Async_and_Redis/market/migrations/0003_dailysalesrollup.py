@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0002_stockflush'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('category', models.CharField(blank=True, max_length=100)),
+                ('order_count', models.IntegerField(default=0)),
+                ('item_quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'db_table': 'daily_sales_rollups',
+                'indexes': [models.Index(fields=['status', 'category', 'day'], name='daily_sales_status_5eed16_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'category'), name='daily_sales_rollup_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-17 05:40
+
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_order_totals(apps, schema_editor):
+    Order = apps.get_model('market', 'Order')
+    OrderItem = apps.get_model('market', 'OrderItem')
+    db = schema_editor.connection.alias
+    total = DecimalField(max_digits=12, decimal_places=2)
+
+    items = OrderItem.objects.using(db).filter(order_id=OuterRef('pk')).order_by().values('order_id')
+    Order.objects.using(db).update(
+        item_count=Coalesce(Subquery(items.annotate(n=Count('pk')).values('n')), Value(0)),
+        items_total=Coalesce(
+            Subquery(items.annotate(total=Sum(F('price') * F('quantity'), output_field=total)).values('total')),
+            Value(Decimal(0), output_field=total),
+            output_field=total,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0003_dailysalesrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='items_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='orderitem',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='market.product'),
+        ),
+        migrations.RunPython(fill_order_totals, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,90 @@
+from datetime import datetime
+
 from django.db import models
 from django.contrib.auth.models import User
 
 
+class ProductQuerySet(models.QuerySet):
+    """
+    QuerySet.update()/bulk_update()는 시그널을 보내지 않으므로
+    여기서 직접 캐시 무효화를 예약함.
+    """
+
+    def _invalidate_rows(self, rows, moved=False):
+        """
+        rows: (id, category) - 이전/새 카테고리를 모두 포함
+        moved: 카테고리가 바뀌었을 수 있음 → 관련 카테고리 목록 전체 무효화
+        """
+        from market.invalidation import invalidate_products
+        from market.request_memo import forget_instance
+
+        rows = list(rows)
+        categories = {category for _, category in rows} if moved else ()
+        invalidate_products(rows, using=self.db, moved=categories)
+
+        # 같은 요청의 get_product()가 이전 인스턴스를 내주지 않도록 (save()는 post_save에서)
+        for product_id in {product_id for product_id, _ in rows}:
+            forget_instance(self.model, product_id)
+
+    def update(self, **kwargs):
+        rows = list(self.values_list('id', 'category'))
+        updated = super().update(**kwargs)
+
+        if 'stock' in kwargs:
+            # 재고를 직접 덮어씀 → Redis 재고 카운터도 DB 기준으로 (market.stock)
+            from market.stock import reset_stock_counters
+            reset_stock_counters([product_id for product_id, _ in rows], using=self.db)
+
+        moved = 'category' in kwargs
+        if moved:
+            # 카테고리 변경 → 이전/새 카테고리 목록 모두 무효화
+            if isinstance(kwargs['category'], str):
+                rows += [(product_id, kwargs['category']) for product_id, _ in rows]
+            else:
+                # F() 등 식으로 변경 → 새 카테고리는 다시 읽어야 알 수 있음
+                rows += list(self.model._base_manager.using(self.db).filter(
+                    pk__in=[product_id for product_id, _ in rows]).values_list('id', 'category'))
+        self._invalidate_rows(rows, moved=moved)
+        return updated
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        rows = list(self.filter(pk__in=[obj.pk for obj in objs]).values_list('id', 'category'))
+        updated = super().bulk_update(objs, fields, batch_size=batch_size)
+        self._invalidate_rows(rows + [(obj.pk, obj.category) for obj in objs], moved='category' in fields)
+        if 'stock' in fields:
+            from market.stock import reset_stock_counters
+            reset_stock_counters([obj.pk for obj in objs], using=self.db)
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from market.bloom import products_created
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        products_created(created, using=self.db)
+        return created
+
+    def apply_stock_deltas(self, deltas):
+        """
+        {id: 증감량}을 UPDATE 1번으로 반영 (market.stock의 flush 전용)
+            UPDATE products SET stock = stock + CASE id WHEN .. THEN .. ELSE 0 END WHERE id IN (..)
+
+        카운터가 이미 반영된 값이므로 update()와 달리 카운터를 다시 맞추지 않음
+        """
+        if not deltas:
+            return 0
+        queryset = self.filter(pk__in=list(deltas))
+        rows = list(queryset.values_list('id', 'category'))
+        delta = models.Case(
+            *(models.When(pk=pk, then=models.Value(value)) for pk, value in deltas.items()),
+            default=models.Value(0),
+            output_field=models.IntegerField(),
+        )
+        updated = super(ProductQuerySet, queryset).update(stock=models.F('stock') + delta)
+        queryset._invalidate_rows(rows)
+        return updated
+
+
 class Product(models.Model):
     """상품 모델"""
     name = models.CharField(max_length=200)
@@ -11,6 +94,37 @@ class Product(models.Model):
     category = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = ProductQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 저장 시 카테고리 이동 / 재고 변경 여부 판단용 (market.signals)
+        instance._loaded_category = instance.__dict__.get('category')
+        instance._loaded_stock = instance.__dict__.get('stock')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        기존 행 편집에서 재고를 바꾸지 않았으면 stock은 쓰지 않음
+
+        불러온 뒤 재고 flush(market.stock)가 반영한 차감을 불러올 때의 값으로 덮어쓰지 않도록
+        (관리자 / 전체 행 save() 모두 해당) - 재고를 바꾸려면 stock에 새 값을 넣고 저장
+        """
+        loaded_stock = getattr(self, '_loaded_stock', None)
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and loaded_stock is not None and self.stock == loaded_stock):
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                kwargs['update_fields'] = [
+                    field.attname for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred and field.attname != 'stock'
+                ]
+            else:
+                kwargs['update_fields'] = [name for name in update_fields if name != 'stock']
+        super().save(*args, **kwargs)
+    
     class Meta:
         db_table = 'products'
         indexes = [
@@ -24,6 +138,122 @@ class Product(models.Model):
 
 
 
+class OrderQuerySet(models.QuerySet):
+    """
+    update()/bulk_update()/bulk_create()는 시그널을 보내지 않으므로
+    - 누적 주문 통계(market.order_stats)를 무효로 표시 → 다음 조회가 전체 재계산
+    - 일별 매출 집계(market.sales_rollup)는 생성분만 증감 / 수정된 날짜만 다시 집계
+    """
+
+    ROLLUP_FIELDS = {'status', 'total_amount', 'created_at'}
+
+    def _mark_stats_stale(self):
+        from market.order_stats import order_stats
+        order_stats.mark_stale(using=self.db)
+
+    def update(self, **kwargs):
+        from market import sales_rollup
+
+        rollup = bool(self.ROLLUP_FIELDS & set(kwargs)) and not sales_rollup.is_suspended()
+        if rollup:
+            days = sales_rollup.days_of_orders(self)
+            moved_to = kwargs.get('created_at')
+            if moved_to is not None and not isinstance(moved_to, datetime):
+                # F() 등 식으로 날짜 변경 → 새 날짜는 다시 읽어야 알 수 있음
+                pks = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+
+        if updated and {'status', 'total_amount'} & set(kwargs):
+            self._mark_stats_stale()
+        if updated and rollup:
+            if isinstance(moved_to, datetime):
+                days.append(sales_rollup.order_day(self.model(created_at=moved_to)))
+            elif moved_to is not None:
+                days += sales_rollup.days_of_orders(self.model._base_manager.using(self.db).filter(pk__in=pks))
+            sales_rollup.rebuild_days(days, using=self.db)
+        return updated
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        from market import sales_rollup
+
+        objs = list(objs)
+        rollup = bool(self.ROLLUP_FIELDS & set(fields)) and not sales_rollup.is_suspended()
+        if rollup:
+            days = sales_rollup.days_of_orders(self.filter(pk__in=[obj.pk for obj in objs]))
+        updated = super().bulk_update(objs, fields, batch_size=batch_size)
+
+        if updated and {'status', 'total_amount'} & set(fields):
+            self._mark_stats_stale()
+        if updated and rollup:
+            sales_rollup.rebuild_days(days + [sales_rollup.order_day(obj) for obj in objs], using=self.db)
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from market import sales_rollup
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            self._mark_stats_stale()
+            sales_rollup.orders_created(created, using=self.db)
+        return created
+
+
+class OrderItemQuerySet(models.QuerySet):
+    """
+    시그널 없는 쓰기도 반영
+    - 주문의 item_count / items_total (market.order_totals)
+    - 일별 매출 집계 (market.sales_rollup)
+    """
+
+    TOTAL_FIELDS = {'order', 'order_id', 'quantity', 'price'}
+    ROLLUP_FIELDS = TOTAL_FIELDS | {'product', 'product_id'}
+
+    def _order_days(self, order_ids):
+        from market import sales_rollup
+        return sales_rollup.days_of_orders(Order._base_manager.using(self.db).filter(pk__in=order_ids))
+
+    def _after_change(self, order_ids, fields):
+        from market import order_totals, sales_rollup
+
+        if self.TOTAL_FIELDS & fields:
+            order_totals.recount(order_ids, using=self.db)
+        if not sales_rollup.is_suspended():
+            sales_rollup.rebuild_days(self._order_days(order_ids), using=self.db)
+
+    def update(self, **kwargs):
+        fields = self.ROLLUP_FIELDS & set(kwargs)
+        if fields:
+            order_ids = set(self.values_list('order_id', flat=True))
+        updated = super().update(**kwargs)
+
+        if updated and fields:
+            if 'order' in kwargs or 'order_id' in kwargs:
+                order = kwargs.get('order', kwargs.get('order_id'))
+                order_ids.add(getattr(order, 'pk', order))
+            self._after_change(order_ids, fields)
+        return updated
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        changed = self.ROLLUP_FIELDS & set(fields)
+        if changed:
+            order_ids = set(self.filter(pk__in=[obj.pk for obj in objs]).values_list('order_id', flat=True))
+        updated = super().bulk_update(objs, fields, batch_size=batch_size)
+
+        if updated and changed:
+            self._after_change(order_ids | {obj.order_id for obj in objs}, changed)
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from market import order_totals, sales_rollup
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        inserted = [item for item in created if item.pk is not None]  # ignore_conflicts면 알 수 없음
+        order_totals.items_created(inserted, using=self.db)
+        sales_rollup.items_created(inserted, using=self.db)
+        return created
+
+
 class Order(models.Model):
     """주문 모델"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
@@ -38,8 +268,21 @@ class Order(models.Model):
         ],
         default='pending'
     )
+    # 항목 수 / 항목 금액 합계 비정규화 (market.order_totals) - 목록에서 Count('items') 불필요
+    item_count = models.PositiveIntegerField(default=0)
+    items_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrderQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 저장 / 삭제 시 누적 통계 증감 계산용 (market.order_stats)
+        if 'status' in instance.__dict__ and 'total_amount' in instance.__dict__:
+            instance._loaded_stats = (instance.status, instance.total_amount)
+        return instance
     
     class Meta:
         db_table = 'orders'
@@ -56,10 +299,21 @@ class Order(models.Model):
 
 class OrderItem(models.Model):
     """주문 항목 모델"""
-    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='orders')
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='items')
     quantity = models.IntegerField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    objects = OrderItemQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 저장 / 삭제 시 주문 합계 / 일별 매출 집계 증감 계산용 (market.order_totals, market.sales_rollup)
+        fields = instance.__dict__
+        if all(name in fields for name in ('order_id', 'product_id', 'quantity', 'price')):
+            instance._loaded_line = (instance.order_id, instance.product_id, instance.quantity, instance.price)
+        return instance
     
     class Meta:
         db_table = 'order_items'
@@ -70,6 +324,34 @@ class OrderItem(models.Model):
 
 
 
+class DailySalesRollup(models.Model):
+    """
+    일별 매출 집계 (market.sales_rollup)
+    status / category가 ''인 행 = 모든 상태 / 모든 카테고리 합계
+    """
+    day = models.DateField()
+    status = models.CharField(max_length=20, blank=True)
+    category = models.CharField(max_length=100, blank=True)
+    order_count = models.IntegerField(default=0)
+    item_quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'daily_sales_rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status', 'category'], name='daily_sales_rollup_key'),
+        ]
+        indexes = [
+            # 날짜 범위 조회: WHERE status = ? AND category = ? AND day BETWEEN ? AND ?
+            models.Index(fields=['status', 'category', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status or '전체'} / {self.category or '전체'}: {self.revenue}"
+
+
+
+
 class APILog(models.Model):
     """외부 API 호출 로그"""
     endpoint = models.CharField(max_length=500)
@@ -82,4 +364,19 @@ class APILog(models.Model):
         db_table = 'api_logs'
         indexes = [
             models.Index(fields=['created_at']),
-        ]
\ No newline at end of file
+        ]
+
+
+
+
+class StockFlush(models.Model):
+    """Redis 재고 델타를 DB에 반영한 배치 번호 (market.stock - 같은 배치 중복 반영 방지)"""
+    id = models.BigIntegerField(primary_key=True)
+    products = models.IntegerField()
+    flushed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'stock_flushes'
+
+    def __str__(self):
+        return f"StockFlush #{self.id} ({self.products}개 상품)"
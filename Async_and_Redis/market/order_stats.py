@@ -0,0 +1,224 @@
+"""
+주문 통계 누적 합계
+
+이전 방식 (05_redis_part2.calculate_statistics):
+    캐시가 만료될 때마다 Order.objects.aggregate(Count, Sum, Avg)
+    → orders 테이블 전체 스캔, 주문이 늘수록 느려짐
+
+현재 방식:
+    Redis 해시 하나에 누적 합계 보관
+        count           주문 수
+        revenue         매출 합계 (센트 단위 정수 - HINCRBY로 원자적 증감)
+        status:<상태>   상태별 주문 수
+        built_at        마지막 전체 재계산 시각
+
+    - 주문 저장 / 삭제 시그널 → 커밋 이후 HINCRBY (MULTI 1번, 롤백되면 반영 안 함)
+    - 조회 = HGETALL 1번 → 주문 수와 무관하게 O(1)
+    - 어긋남 보정: REBUILD_INTERVAL이 지난 뒤 첫 조회가 백그라운드에서 전체 재계산 (한 Worker만)
+        또는 python manage.py rebuild_order_stats (cron)
+    - QuerySet.update() / bulk_create() 등 시그널 없는 쓰기 → 해시를 무효로 표시 → 다음 조회가 재계산
+
+settings:
+    ORDER_STATS_REBUILD_INTERVAL = 3600   # 초
+"""
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, transaction
+
+from market.cache_lock import RedisLock
+
+
+STATS_KEY = 'order_stats'
+BUILT_AT = 'built_at'
+STATUS_PREFIX = 'status:'
+
+REBUILD_ATTEMPTS = 3
+REBUILD_WAIT = 10.0
+
+
+def _cents(amount):
+    return int((Decimal(amount or 0) * 100).to_integral_value())
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+class OrderStats:
+
+    def __init__(self, rebuild_interval=3600):
+        self.rebuild_interval = rebuild_interval
+        self._rebuilding = False
+
+    @property
+    def key(self):
+        return cache.make_key(STATS_KEY)
+
+    # ------------------------------------------------------------------
+    # 증감 (시그널)
+    # ------------------------------------------------------------------
+
+    def apply(self, count=0, revenue=0, statuses=None):
+        """revenue: 센트 단위, statuses: {상태: 증감}"""
+        fields = {'count': count, 'revenue': revenue}
+        fields.update({f'{STATUS_PREFIX}{status}': n for status, n in (statuses or {}).items()})
+        fields = {field: n for field, n in fields.items() if n}
+        if not fields:
+            return
+
+        with _redis().pipeline() as pipe:
+            for field, n in fields.items():
+                pipe.hincrby(self.key, field, n)
+            pipe.execute()
+
+    def record_saved(self, order, created, previous=None, using=DEFAULT_DB_ALIAS):
+        """previous: 저장 전 (status, total_amount) - DB에서 읽은 값 (Order.from_db)"""
+        amount = _cents(order.total_amount)
+
+        if created:
+            delta = {'count': 1, 'revenue': amount, 'statuses': {order.status: 1}}
+        elif previous is None:
+            # DB에서 읽지 않은 인스턴스를 저장 → 이전 값을 모름
+            self.mark_stale(using=using)
+            return
+        else:
+            status, total = previous
+            delta = {'revenue': amount - _cents(total), 'statuses': {}}
+            if status != order.status:
+                delta['statuses'] = {status: -1, order.status: 1}
+
+        transaction.on_commit(lambda: self.apply(**delta), using=using)
+
+    def record_deleted(self, order, previous=None, using=DEFAULT_DB_ALIAS):
+        status, amount = previous or (order.status, order.total_amount)
+        amount = _cents(amount)
+        transaction.on_commit(
+            lambda: self.apply(count=-1, revenue=-amount, statuses={status: -1}),
+            using=using,
+        )
+
+    def mark_stale(self, using=DEFAULT_DB_ALIAS):
+        """시그널 없이 주문이 바뀜 → 다음 조회가 전체 재계산"""
+        transaction.on_commit(lambda: _redis().hdel(self.key, BUILT_AT), using=using)
+
+    # ------------------------------------------------------------------
+    # 전체 재계산 (보정)
+    # ------------------------------------------------------------------
+
+    def _aggregate(self):
+        from django.db.models import Count, Sum
+
+        from market.models import Order
+
+        totals = Order.objects.aggregate(count=Count('id'), revenue=Sum('total_amount'))
+        by_status = Order.objects.order_by().values_list('status').annotate(n=Count('id'))
+        fields = {
+            'count': totals['count'] or 0,
+            'revenue': _cents(totals['revenue']),
+            **{f'{STATUS_PREFIX}{status}': n for status, n in by_status},
+        }
+        return fields
+
+    def rebuild(self):
+        """
+        전체 집계로 해시를 덮어씀
+
+        집계 도중 증감이 들어오면 (WATCH 충돌) 다시 집계 → 그 사이의 증감을 잃지 않음
+        (커밋 직후 ~ on_commit 사이의 증감은 이중 반영될 수 있음 → 다음 재계산이 보정)
+        """
+        from redis.exceptions import WatchError
+
+        conn = _redis()
+        for attempt in range(REBUILD_ATTEMPTS):
+            with conn.pipeline() as pipe:
+                try:
+                    if attempt < REBUILD_ATTEMPTS - 1:
+                        pipe.watch(self.key)
+                    fields = self._aggregate()
+                    fields[BUILT_AT] = time.time()
+
+                    pipe.multi()
+                    pipe.delete(self.key)
+                    pipe.hset(self.key, mapping=fields)
+                    pipe.execute()
+                    return fields
+                except WatchError:
+                    continue
+
+    def _rebuild_locked(self, wait):
+        lock = RedisLock(f'{STATS_KEY}:rebuild', timeout=60)
+        deadline = time.monotonic() + wait
+        while not lock.acquire():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        try:
+            # 기다리는 동안 다른 Worker가 재계산했으면 생략
+            built_at = _redis().hget(self.key, BUILT_AT)
+            if built_at is None or time.time() - float(built_at) >= self.rebuild_interval:
+                self.rebuild()
+            return True
+        finally:
+            lock.release()
+
+    def _rebuild_in_background(self):
+        if self._rebuilding:
+            return
+        self._rebuilding = True
+
+        def run():
+            try:
+                self._rebuild_locked(wait=0)
+            except Exception:
+                pass  # 다음 조회가 다시 시도
+            finally:
+                self._rebuilding = False
+                close_old_connections()
+
+        threading.Thread(target=run, name='order-stats-rebuild', daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # 조회 - HGETALL 1번
+    # ------------------------------------------------------------------
+
+    def get(self):
+        raw = {field.decode(): value for field, value in _redis().hgetall(self.key).items()}
+
+        if BUILT_AT not in raw:
+            # 처음 / 무효로 표시됨 → 한 Worker만 재계산, 나머지는 완료를 기다림
+            if not self._rebuild_locked(wait=REBUILD_WAIT):
+                raw = self._aggregate()  # 재계산이 너무 오래 걸림 → 이번만 직접 집계
+            else:
+                raw = {field.decode(): value for field, value in _redis().hgetall(self.key).items()}
+        elif time.time() - float(raw[BUILT_AT]) >= self.rebuild_interval:
+            self._rebuild_in_background()  # 이번 요청은 현재 합계로 응답
+
+        return self._format(raw)
+
+    def check(self):
+        """(현재 합계, 전체 집계 결과) - 어긋남 확인용, 해시는 바꾸지 않음"""
+        return self.get(), self._format(self._aggregate())
+
+    @staticmethod
+    def _format(raw):
+        count = int(raw.get('count', 0))
+        revenue = Decimal(int(raw.get('revenue', 0))) / 100
+        return {
+            'total_orders': count,
+            'total_revenue': float(revenue),
+            'avg_order': float(revenue / count) if count else 0.0,
+            'by_status': {
+                field.removeprefix(STATUS_PREFIX): int(value)
+                for field, value in raw.items()
+                if field.startswith(STATUS_PREFIX) and int(value)
+            },
+            'built_at': float(raw[BUILT_AT]) if BUILT_AT in raw else None,
+        }
+
+
+order_stats = OrderStats(rebuild_interval=getattr(settings, 'ORDER_STATS_REBUILD_INTERVAL', 3600))
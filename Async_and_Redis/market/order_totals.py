@@ -0,0 +1,167 @@
+"""
+주문 항목 비정규화 - Order.item_count / Order.items_total
+
+이전 방식:
+    주문 목록마다 Order.objects.annotate(item_count=Count('items'))
+    → order_items JOIN + GROUP BY를 목록을 열 때마다
+
+현재 방식:
+    항목 수 / 항목 금액 합계(price × quantity)를 orders 행에 저장
+    - 항목 생성 / 수정 / 삭제 시그널 → 같은 트랜잭션에서 UPDATE ... SET item_count = item_count + 1
+    - bulk_create → 주문별로 묶어서 CASE UPDATE 1번
+    - QuerySet.update() / bulk_update() → 영향받은 주문만 서브쿼리로 다시 계산
+    - 주문 삭제 중(CASCADE)에 지워지는 항목은 건너뜀 (어차피 주문 행도 지워짐)
+    → 목록 페이지는 집계 쿼리 없이 컬럼만 읽음
+
+어긋났을 때: recount(Order.objects.all())
+"""
+import threading
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Case, Count, DecimalField, F, IntegerField, OuterRef, QuerySet, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+RECOUNT_CHUNK = 500
+
+_state = threading.local()
+
+_TOTAL = DecimalField(max_digits=12, decimal_places=2)
+
+
+def _deleting():
+    if not hasattr(_state, 'deleting'):
+        _state.deleting = set()
+    return _state.deleting
+
+
+def mark_deleting(order_id):
+    """주문 pre_delete - 이어지는 항목 삭제 시그널은 주문 합계를 건드리지 않음"""
+    _deleting().add(order_id)
+
+
+def unmark_deleting(order_id):
+    _deleting().discard(order_id)
+
+
+def is_deleting(order_id):
+    return order_id in _deleting()
+
+
+def line_total(quantity, price):
+    return Decimal(price) * quantity
+
+
+def _changed(order_ids, using):
+    """시그널 없이 주문 행이 바뀜 → 요청 메모 / 사용자별 주문 목록 응답 캐시 정리"""
+    from market.invalidation import invalidate_tags, user_orders_tag
+    from market.models import Order
+    from market.request_memo import forget_instance
+
+    user_ids = set(Order._base_manager.using(using).filter(pk__in=order_ids).values_list('user_id', flat=True))
+    for order_id in order_ids:
+        forget_instance(Order, order_id)
+    if user_ids:
+        invalidate_tags(*(user_orders_tag(user_id) for user_id in user_ids), using=using)
+
+
+def apply(deltas, using=DEFAULT_DB_ALIAS):
+    """
+    {order_id: (항목 수 증감, 금액 증감)}을 UPDATE 1번으로
+        UPDATE orders SET item_count = item_count + CASE id WHEN .. END,
+                          items_total = items_total + CASE id WHEN .. END
+    """
+    from market.models import Order
+
+    deltas = {pk: delta for pk, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return 0
+
+    if len(deltas) == 1:
+        [(pk, (count, total))] = deltas.items()
+        count_delta, total_delta = Value(count), Value(total, output_field=_TOTAL)
+    else:
+        count_delta = Case(
+            *(When(pk=pk, then=Value(count)) for pk, (count, _) in deltas.items()),
+            default=Value(0), output_field=IntegerField(),
+        )
+        total_delta = Case(
+            *(When(pk=pk, then=Value(total, output_field=_TOTAL)) for pk, (_, total) in deltas.items()),
+            default=Value(Decimal(0), output_field=_TOTAL), output_field=_TOTAL,
+        )
+
+    updated = Order._base_manager.using(using).filter(pk__in=list(deltas)).update(
+        item_count=F('item_count') + count_delta,
+        items_total=F('items_total') + total_delta,
+    )
+    _changed(list(deltas), using)
+    return updated
+
+
+def recount(orders, using=DEFAULT_DB_ALIAS):
+    """주문 QuerySet / id 목록의 합계를 order_items에서 다시 계산 (서브쿼리 UPDATE)"""
+    from market.models import Order, OrderItem
+
+    items = OrderItem.objects.using(using).filter(order_id=OuterRef('pk')).order_by().values('order_id')
+    changes = {
+        'item_count': Coalesce(Subquery(items.annotate(n=Count('pk')).values('n')), Value(0)),
+        'items_total': Coalesce(
+            Subquery(items.annotate(total=Sum(F('price') * F('quantity'), output_field=_TOTAL)).values('total')),
+            Value(Decimal(0), output_field=_TOTAL),
+            output_field=_TOTAL,
+        ),
+    }
+
+    if isinstance(orders, QuerySet):
+        return orders.update(**changes)
+
+    order_ids = list(dict.fromkeys(orders))
+    updated = 0
+    for start in range(0, len(order_ids), RECOUNT_CHUNK):
+        chunk = order_ids[start:start + RECOUNT_CHUNK]
+        updated += Order._base_manager.using(using).filter(pk__in=chunk).update(**changes)
+        _changed(chunk, using)
+    return updated
+
+
+# ============================================================================
+# 시그널 (market.signals) / bulk_create (market.models)
+# ============================================================================
+
+def item_saved(item, created, previous=None, using=DEFAULT_DB_ALIAS):
+    """previous: 저장 전 (order_id, product_id, quantity, price) - OrderItem.from_db"""
+    deltas = defaultdict(lambda: (0, Decimal(0)))
+
+    def add(order_id, count, total):
+        previous_count, previous_total = deltas[order_id]
+        deltas[order_id] = (previous_count + count, previous_total + total)
+
+    if created:
+        add(item.order_id, 1, line_total(item.quantity, item.price))
+    elif previous is None:
+        recount([item.order_id], using=using)  # 이전 값을 모름
+        return
+    else:
+        order_id, _, quantity, price = previous
+        add(order_id, -1, -line_total(quantity, price))
+        add(item.order_id, 1, line_total(item.quantity, item.price))
+
+    apply(deltas, using=using)
+
+
+def item_deleted(item, previous=None, using=DEFAULT_DB_ALIAS):
+    order_id, _, quantity, price = previous or (item.order_id, item.product_id, item.quantity, item.price)
+    if is_deleting(order_id):
+        return
+    apply({order_id: (-1, -line_total(quantity, price))}, using=using)
+
+
+def items_created(items, using=DEFAULT_DB_ALIAS):
+    """bulk_create된 항목 - 주문 수와 무관하게 UPDATE 1번"""
+    deltas = defaultdict(lambda: (0, Decimal(0)))
+    for item in items:
+        count, total = deltas[item.order_id]
+        deltas[item.order_id] = (count + 1, total + line_total(item.quantity, item.price))
+    apply(deltas, using=using)
@@ -0,0 +1,135 @@
+"""
+키셋(커서) 페이지네이션 - (created_at, id) 기준
+
+OFFSET 방식:
+    ORDER BY created_at DESC LIMIT 50 OFFSET 500000
+    → 건너뛸 50만 행을 모두 읽고 버림, 뒤 페이지일수록 느려짐
+    → 페이지를 넘기는 사이 새 행이 들어오면 같은 행이 두 번 보이거나 빠짐
+
+키셋 방식:
+    WHERE created_at <= :c AND NOT (created_at = :c AND id >= :id)
+    ORDER BY created_at DESC, id DESC LIMIT 51
+    → created_at 인덱스에서 커서 위치로 바로 이동 (SQLite 인덱스는 rowid=id를 포함 → 정렬도 인덱스 순서)
+    → 몇 번째 페이지든 같은 비용, 51번째 행은 다음 페이지가 있는지 확인용
+    (created_at이 같은 행은 id 조건으로 하나씩 걸러짐 - 마이크로초 단위라 보통은 거의 없음)
+
+커서:
+    마지막(또는 첫) 행의 (created_at, id)와 방향을 base64로 감싼 불투명 토큰
+    - next: 이 행 다음부터, prev: 이 행 이전까지
+    - 전체 개수(COUNT)와 페이지 번호는 제공하지 않음 (전체 개수 자체가 전체 스캔)
+
+사용:
+    page = KeysetPaginator(Order.objects.filter(user=user), per_page=50).page(request.GET.get('cursor'))
+    page.object_list, page.next_cursor, page.previous_cursor
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """잘못된 / 변조된 커서"""
+
+
+class KeysetPage:
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    queryset을 (field, id) 순서로 페이지 단위로 자름
+    descending=True: 최신순 (created_at DESC, id DESC)
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, per_page=50, field='created_at', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = queryset.model._meta.get_field(field)
+        self.descending = descending
+
+    # ------------------------------------------------------------------
+    # 커서 토큰
+    # ------------------------------------------------------------------
+
+    def encode(self, obj, direction):
+        payload = [direction, self.field.value_to_string(obj), obj.pk]
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode())
+        return token.decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, value, pk = json.loads(raw)
+            value = self.field.to_python(value)
+            pk = int(pk)
+        except (TypeError, ValueError, ValidationError) as e:
+            raise InvalidCursor(f'잘못된 커서: {cursor!r}') from e
+        if direction not in (self.NEXT, self.PREVIOUS) or value is None:
+            raise InvalidCursor(f'잘못된 커서: {cursor!r}')
+        return direction, value, pk
+
+    # ------------------------------------------------------------------
+    # 페이지
+    # ------------------------------------------------------------------
+
+    def _after(self, value, pk, forward):
+        """정렬 순서상 (value, pk) 뒤에 오는 행 - 범위 조건은 인덱스를 타도록 field 하나에만"""
+        name = self.field.name
+        if forward == self.descending:
+            return Q(**{f'{name}__lte': value}) & ~Q(**{name: value, 'pk__gte': pk})
+        return Q(**{f'{name}__gte': value}) & ~Q(**{name: value, 'pk__lte': pk})
+
+    def _ordering(self, forward):
+        name = self.field.name
+        if forward == self.descending:
+            return (f'-{name}', '-pk')
+        return (name, 'pk')
+
+    def page(self, cursor=None):
+        """cursor가 없으면 첫 페이지 - 쿼리 1번 (per_page + 1행)"""
+        direction, value, pk = self.decode(cursor) if cursor else (self.NEXT, None, None)
+        forward = direction == self.NEXT
+
+        queryset = self.queryset
+        if value is not None:
+            queryset = queryset.filter(self._after(value, pk, forward))
+        rows = list(queryset.order_by(*self._ordering(forward))[:self.per_page + 1])
+
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()  # 거꾸로 읽었으므로 원래 순서로
+        if not rows:
+            return KeysetPage(rows)
+
+        # 커서를 따라 왔으면 반대 방향에는 항상 행이 있음
+        has_next = more if forward else True
+        has_previous = cursor is not None if forward else more
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode(rows[-1], self.NEXT) if has_next else None,
+            previous_cursor=self.encode(rows[0], self.PREVIOUS) if has_previous else None,
+        )
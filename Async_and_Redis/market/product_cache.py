@@ -0,0 +1,127 @@
+"""
+상품 캐시 페이로드 + 다건 Cache-Aside
+
+get_product를 반복문에서 호출하면:
+    - Redis GET N번
+    - 캐시 미스마다 Product.objects.get → 캐시 계층에서 N+1 재발
+
+get_products(ids):
+    - L1 확인 후 나머지는 cache.get_many (MGET 1번)
+    - 미스는 id__in 쿼리 1번 (필요한 필드만)
+    - set_many (파이프라인 1번)으로 저장
+"""
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from market.models import Product
+from market.request_memo import current_memo
+from market.tiered_cache import product_cache
+from market.ttl_policy import ttl_for
+
+
+# 존재하지 않는 상품 표시 - django_redis는 int를 직렬화 없이 저장하므로 1바이트
+# TTL은 ttl_policy의 'absent:' 정책 (짧게)
+ABSENT = 0
+
+_MISSING = object()
+
+# 캐시에 직렬화되는 필드 - only()에도 그대로 사용
+PRODUCT_PAYLOAD_FIELDS = ('id', 'name', 'price', 'category')
+
+
+def product_key(product_id):
+    return f'product:{product_id}'
+
+
+def product_payload(product):
+    """CacheAsidePattern이 캐시에 저장하는 상품 데이터"""
+    return {
+        'id': product.id,
+        'name': product.name,
+        'price': float(product.price),
+        'category': product.category,
+    }
+
+
+def category_key(category):
+    return f'products_by_category:{category}'
+
+
+def category_tags(category):
+    """카테고리 목록 캐시의 태그 (market.tag_cache)"""
+    return ['products', f'category:{category}']
+
+
+def category_products_payload(category, limit=5):
+    """products_by_category:{category}에 저장되는 상품 목록"""
+    products = Product.objects.filter(category=category).only('id', 'name', 'price')[:limit]
+    return [
+        {
+            'id': p.id,
+            'name': p.name,
+            'price': float(p.price)
+        }
+        for p in products
+    ]
+
+
+def get_products(product_ids, ttl=DEFAULT_TIMEOUT):
+    """
+    여러 상품을 한 번에 조회 - 입력 순서 그대로 반환
+
+    존재하지 않는 상품은 None
+        - Bloom 필터가 없다고 판단한 id → 캐시/DB 조회 없음
+        - DB에도 없던 id → ABSENT 표시를 짧은 TTL로 저장 (반복 DB 조회 방지)
+    """
+    from market.bloom import product_bloom
+
+    product_ids = list(product_ids)
+    candidates = product_ids
+    if product_bloom.enabled:
+        maybe = product_bloom.might_contain_many(set(product_ids))
+        candidates = [product_id for product_id in product_ids if maybe[product_id]]
+
+    keys = {product_id: product_key(product_id) for product_id in candidates}
+
+    # 0. 같은 요청에서 이미 조회한 상품은 메모에서
+    memo = current_memo()
+    cached = {}
+    if memo is not None:
+        for key in keys.values():
+            value = memo.get('cache', key, _MISSING)
+            if value is not _MISSING:
+                cached[key] = value
+
+    # 1. 캐시 확인 (MGET 1번)
+    remaining = [key for key in keys.values() if key not in cached]
+    if remaining:
+        cached.update(product_cache.get_many(remaining))
+
+    # 2. 미스만 DB 조회 (쿼리 1번)
+    missing = [product_id for product_id, key in keys.items() if key not in cached]
+    if missing:
+        products = Product.objects.filter(id__in=missing).only(*PRODUCT_PAYLOAD_FIELDS)
+        fetched = {product_key(p.id): product_payload(p) for p in products}
+        absent = {keys[product_id]: ABSENT for product_id in missing if keys[product_id] not in fetched}
+
+        # 3. 캐시에 저장 (파이프라인 1번씩)
+        if fetched:
+            product_cache.set_many(fetched, ttl)
+        if absent:
+            product_cache.set_many(absent, ttl_for('absent:'))
+        cached.update(fetched)
+        cached.update(absent)
+
+    if memo is not None:
+        for key, value in cached.items():
+            memo.set('cache', key, value)
+
+    result = []
+    for product_id in product_ids:
+        data = cached.get(keys[product_id]) if product_id in keys else None
+        result.append(None if data == ABSENT else data)
+    return result
+
+
+def get_product(product_id, ttl=DEFAULT_TIMEOUT):
+    """단건 Cache-Aside (없는 상품은 None)"""
+    return get_products([product_id], ttl)[0]
@@ -0,0 +1,188 @@
+"""
+SQL 워크로드 수집 (market.index_advisor의 입력)
+
+같은 모양의 쿼리는 값만 다르므로 정규화해서 하나로 묶음
+    WHERE id IN (%s, %s, %s)  → WHERE id IN (%s...)
+    LIMIT 21 / 'literal'      → LIMIT %s / %s
+    문장마다 실행 횟수, 누적 시간, EXPLAIN용 실제 SQL + 파라미터 1개 보관
+
+수집 방법:
+    1. 테스트 실행
+        with record() as workload:
+            ...                              # 실행된 모든 SELECT / UPDATE / DELETE
+        workload.save('workload.json')
+    2. 샘플링 윈도 (운영 중)
+        QueryWorkloadMiddleware가 요청 중 QUERY_WORKLOAD_SAMPLE_RATE 비율만 기록
+        → Redis 해시에 모든 Worker 합산 (QUERY_WORKLOAD_TTL 동안 보관)
+        → sampled_workload()로 읽음
+
+settings:
+    QUERY_WORKLOAD_SAMPLE_RATE = 0.0    # 0이면 끔, 0.01 = 요청 100개 중 1개
+    QUERY_WORKLOAD_TTL = 86400          # 마지막 기록 이후 보관 시간 (초)
+"""
+import hashlib
+import json
+import re
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+
+WORKLOAD_KEY = 'query_workload'
+
+ANALYZED = ('SELECT', 'UPDATE', 'DELETE')   # INSERT는 인덱스로 빨라지지 않음
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?(?![\w"])')
+_SPACE = re.compile(r'\s+')
+
+
+def normalize(sql):
+    sql = _SPACE.sub(' ', sql).strip()
+    sql = _STRING.sub('%s', sql)
+    sql = _NUMBER.sub('%s', sql)
+    return _IN_LIST.sub('IN (%s...)', sql)
+
+
+def fingerprint(sql):
+    return hashlib.md5(normalize(sql).encode()).hexdigest()[:16]
+
+
+def is_analyzed(sql):
+    return sql.lstrip().split(' ', 1)[0].upper() in ANALYZED
+
+
+class Workload:
+    """정규화한 문장별 {sql, sample_sql, sample_params, count, time}"""
+
+    def __init__(self, statements=None):
+        self.statements = statements or {}
+
+    def add(self, sql, params=None, duration=0.0, count=1):
+        if not is_analyzed(sql):
+            return
+        key = fingerprint(sql)
+        entry = self.statements.get(key)
+        if entry is None:
+            entry = self.statements[key] = {
+                'sql': normalize(sql),
+                'sample_sql': sql,
+                'sample_params': list(params or ()),
+                'count': 0,
+                'time': 0.0,
+            }
+        entry['count'] += count
+        entry['time'] += duration
+
+    def merge(self, other):
+        for entry in other.statements.values():
+            self.add(entry['sample_sql'], entry['sample_params'], entry['time'], entry['count'])
+        return self
+
+    def __len__(self):
+        return len(self.statements)
+
+    def __iter__(self):
+        return iter(self.statements.values())
+
+    @property
+    def total_count(self):
+        return sum(entry['count'] for entry in self)
+
+    # ------------------------------------------------------------------
+    # 파일 저장 / 읽기
+    # ------------------------------------------------------------------
+
+    def to_json(self):
+        # datetime / Decimal 파라미터는 문자열로 (EXPLAIN 계획에는 영향 없음)
+        return json.dumps(list(self.statements.values()), cls=DjangoJSONEncoder, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text):
+        workload = cls()
+        for entry in json.loads(text):
+            workload.add(entry['sample_sql'], entry['sample_params'], entry['time'], entry['count'])
+        return workload
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_json(f.read())
+
+
+@contextmanager
+def record(aliases=None):
+    """이 스레드에서 실행되는 SQL을 모두 기록"""
+    workload = Workload()
+
+    def wrapper(execute, sql, params, many, context):
+        if many:
+            return execute(sql, params, many, context)  # executemany = 대량 INSERT
+        began = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            workload.add(sql, params, time.perf_counter() - began)
+
+    with ExitStack() as stack:
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(wrapper))
+        yield workload
+
+
+# ============================================================================
+# 샘플링 윈도 (Redis에 모든 Worker 합산)
+# ============================================================================
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def _keys():
+    from django.core.cache import cache
+    return {name: cache.make_key(f'{WORKLOAD_KEY}:{name}') for name in ('count', 'time', 'sample')}
+
+
+def publish(workload):
+    """요청 하나에서 기록한 워크로드를 Redis에 합산 (파이프라인 1번)"""
+    if not workload:
+        return
+    keys = _keys()
+    ttl = getattr(settings, 'QUERY_WORKLOAD_TTL', 86400)
+    with _redis().pipeline(transaction=False) as pipe:
+        for key, entry in workload.statements.items():
+            pipe.hincrby(keys['count'], key, entry['count'])
+            pipe.hincrby(keys['time'], key, int(entry['time'] * 1_000_000))  # 마이크로초
+            pipe.hsetnx(keys['sample'], key, json.dumps(
+                [entry['sample_sql'], entry['sample_params']], cls=DjangoJSONEncoder, ensure_ascii=False,
+            ))
+        for key in keys.values():
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+
+def sampled_workload():
+    keys = _keys()
+    with _redis().pipeline(transaction=False) as pipe:
+        for key in keys.values():
+            pipe.hgetall(key)
+        counts, times, samples = pipe.execute()
+
+    workload = Workload()
+    for key, sample in samples.items():
+        sql, params = json.loads(sample)
+        workload.add(sql, params, int(times.get(key, 0)) / 1_000_000, int(counts.get(key, 0)))
+    return workload
+
+
+def reset_sampled():
+    _redis().delete(*_keys().values())
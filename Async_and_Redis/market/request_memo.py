@@ -0,0 +1,114 @@
+"""
+요청 범위 메모이제이션 (contextvars)
+
+한 요청 안에서 같은 상품 / 태그 버전 / PK 조회를 여러 번 하면
+매번 Redis나 DB로 왕복함 → 요청 동안만 결과를 기억
+
+    RequestMemoMiddleware가 요청마다 새 메모를 설치하고 응답 후 제거
+    - WSGI: 스레드마다 컨텍스트가 분리됨
+    - ASGI: 태스크마다 컨텍스트가 분리됨 (sync_to_async에도 전파)
+
+메모가 설치되지 않은 곳(스크립트, 셸, Celery 등)에서는 그냥 원래 함수를 호출함.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+
+from market.models import Order, Product
+
+
+_current = contextvars.ContextVar('request_memo', default=None)
+
+_MISSING = object()
+
+
+class RequestMemo:
+
+    def __init__(self):
+        self._data = {}   # (namespace, key) -> value
+        self.hits = 0     # 흡수한 중복 조회 수
+        self.misses = 0
+
+    def get(self, namespace, key, default=_MISSING):
+        value = self._data.get((namespace, key), _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def peek(self, namespace, key, default=None):
+        """카운터를 건드리지 않는 조회"""
+        return self._data.get((namespace, key), default)
+
+    def set(self, namespace, key, value):
+        self._data[(namespace, key)] = value
+
+    def forget(self, namespace, key):
+        self._data.pop((namespace, key), None)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._data)}
+
+
+def current_memo():
+    return _current.get()
+
+
+@contextmanager
+def request_scope():
+    """이 범위 안의 조회를 메모 (미들웨어 밖에서도 사용 가능)"""
+    memo = RequestMemo()
+    token = _current.set(memo)
+    try:
+        yield memo
+    finally:
+        _current.reset(token)
+
+
+def memoized(namespace, key, func):
+    memo = _current.get()
+    if memo is None:
+        return func()
+
+    value = memo.get(namespace, key)
+    if value is _MISSING:
+        value = func()
+        memo.set(namespace, key, value)
+    return value
+
+
+def forget(namespace, *keys):
+    memo = _current.get()
+    if memo is not None:
+        for key in keys:
+            memo.forget(namespace, key)
+
+
+# ----------------------------------------------------------------------
+# PK 조회
+# ----------------------------------------------------------------------
+
+MEMO_MODELS = (Product, Order, User)
+
+
+def _orm_namespace(model):
+    return f'orm:{model._meta.label_lower}'
+
+
+def get_by_pk(model, pk):
+    """요청 안에서 같은 PK 조회는 DB 1번 (없으면 DoesNotExist)"""
+    pk = model._meta.pk.to_python(pk)
+    instance = memoized(_orm_namespace(model), pk, lambda: model.objects.filter(pk=pk).first())
+    if instance is None:
+        raise model.DoesNotExist(f'{model.__name__} matching pk={pk} does not exist.')
+    return instance
+
+
+def get_product(pk):
+    return get_by_pk(Product, pk)
+
+
+def forget_instance(model, pk):
+    forget(_orm_namespace(model), model._meta.pk.to_python(pk))
@@ -0,0 +1,160 @@
+"""
+응답 캐시 - cache_page로 안 되는 것들
+
+cache_page의 한계 (04_redis_part1.simulate_view_cache):
+    - 키 = URL 전체 → 사용자별 캐시 불가, 쓸모없는 쿼리 파라미터(utm_*)마다 따로 저장
+    - 무효화 = TTL 만료뿐 → 상품을 고쳐도 목록 페이지는 그대로
+    - 캐시 히트여도 본문 전체를 다시 전송
+
+cache_response:
+    키 = 뷰 이름 + 경로 + 지정한 쿼리 파라미터만 (+ 사용자 id)
+    태그 = 데코레이터의 정적 태그 + 뷰가 응답에 붙인 태그 (tag_response)
+        → 상품 수정(product:<id> 태그 증가) 시 그 상품을 담은 페이지만 무효화
+    ETag = 본문 해시를 함께 저장
+        → If-None-Match가 일치하면 뷰 호출 없이 304
+
+저장 형식 (market.tag_cache와 같은 방식):
+    response:<hash> → {'tags': {tag: version}, 'etag': ..., 'content': ..., ...}
+    조회 시 저장된 태그 버전 중 하나라도 현재와 다르면 미스
+
+뷰 실행 중 수정:
+    동적 태그 버전은 뷰 실행 이후에야 읽을 수 있음
+    → 뷰 호출 전후로 전역 무효화 세대(market.tag_cache.tag_generation)를 비교해
+      그 사이 어떤 태그든 무효화됐으면 저장하지 않음 (이전 내용이 새 버전으로 저장되는 것 방지)
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+from market.tag_cache import TagBasedCache, fetch_tag_versions, tag_generation
+from market.ttl_policy import ttl_for
+
+
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+def tag_response(response, *tags):
+    """뷰가 응답 내용에 따라 결정되는 태그를 붙임 (예: 목록에 담긴 상품들)"""
+    response.cache_tags = [*getattr(response, 'cache_tags', ()), *tags]
+    return response
+
+
+def response_key(view_name, request, query_params=(), per_user=False):
+    parts = [view_name, request.path]
+    for name in sorted(query_params):
+        parts.append(f'{name}={",".join(request.GET.getlist(name))}')
+    if per_user:
+        user = getattr(request, 'user', None)
+        parts.append(f'user={user.pk if user is not None and user.is_authenticated else "anon"}')
+
+    digest = hashlib.md5('\n'.join(parts).encode()).hexdigest()
+    return f'response:{view_name}:{digest}'
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # 약한 비교 (W/ 접두사 무시)
+    return etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in parse_etags(header)}
+
+
+def _not_modified(etag, per_user):
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    return _finalize(response, per_user, 'hit')
+
+
+def _finalize(response, per_user, status):
+    if per_user:
+        # 공유 캐시(프록시/CDN)가 다른 사용자 응답을 내주지 않도록
+        patch_vary_headers(response, ['Cookie'])
+        patch_cache_control(response, private=True)
+    if settings.DEBUG:
+        response['X-Response-Cache'] = status
+    return response
+
+
+def _is_fresh(entry, versions):
+    """저장된 태그 버전이 모두 현재 버전과 같으면 True (versions: 이미 조회한 버전)"""
+    stored = entry['tags']
+    if any(tag not in stored for tag in versions):
+        return False
+
+    # 동적 태그 버전은 이때 조회 (요청 메모에 있으면 왕복 없음)
+    remaining = [tag for tag in stored if tag not in versions]
+    current = {**versions, **(TagBasedCache.get_tag_versions(remaining) if remaining else {})}
+    return all(current[tag] == version for tag, version in stored.items())
+
+
+def cache_response(tags=(), query_params=(), per_user=False, ttl=None, name=None):
+    """
+    뷰 응답 캐시 데코레이터
+
+    tags:         정적 태그 목록 또는 (request, *args, **kwargs) → 태그 목록
+    query_params: 캐시 키에 포함할 쿼리 파라미터 (나머지는 무시)
+    per_user:     사용자마다 따로 캐시 (Vary: Cookie, Cache-Control: private)
+    ttl:          생략 시 TTL 정책 ('response:' 접두사)
+
+    200 응답만 저장 (스트리밍 / Set-Cookie 응답은 저장하지 않음)
+    """
+
+    def decorator(view_func):
+        view_name = name or f'{view_func.__module__}.{view_func.__qualname__}'
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in CACHEABLE_METHODS:
+                return view_func(request, *args, **kwargs)
+
+            cache_key = response_key(view_name, request, query_params, per_user)
+            static_tags = list(tags(request, *args, **kwargs) if callable(tags) else tags)
+
+            # 정적 태그 버전 + 저장된 응답을 MGET 1번으로
+            versions, fetched = fetch_tag_versions(static_tags, extra_keys=[cache_key])
+            entry = fetched.get(cache_key)
+
+            if entry is not None and _is_fresh(entry, versions):
+                if _etag_matches(request, entry['etag']):
+                    return _not_modified(entry['etag'], per_user)
+
+                response = HttpResponse(entry['content'], content_type=entry['content_type'], status=entry['status'])
+                response['ETag'] = entry['etag']
+                return _finalize(response, per_user, 'hit')
+
+            generation = tag_generation()
+            response = view_func(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming or response.cookies:
+                return response
+
+            # 동적 태그는 뷰 실행 이후에야 알 수 있음
+            dynamic_tags = [tag for tag in dict.fromkeys(getattr(response, 'cache_tags', ())) if tag not in versions]
+            if dynamic_tags:
+                versions.update(TagBasedCache.get_tag_versions(dynamic_tags))
+
+            etag = f'"{hashlib.md5(response.content).hexdigest()}"'
+            response['ETag'] = etag
+            # 뷰 실행 중 무효화됨 → 이 응답은 이전 내용일 수 있으므로 저장하지 않음 (다음 요청이 다시 만듦)
+            if tag_generation() == generation:
+                cache.set(cache_key, {
+                    'tags': versions,
+                    'etag': etag,
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'status': response.status_code,
+                }, ttl_for(cache_key) if ttl is None else ttl)
+
+            if _etag_matches(request, etag):
+                return _not_modified(etag, per_user)
+            return _finalize(response, per_user, 'miss')
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,479 @@
+"""
+일별 매출 집계 테이블 (DailySalesRollup)
+
+이전 방식:
+    매출 대시보드 = orders + order_items 전체를 날짜별로 GROUP BY
+    → generate_dummy.py 기본값(주문 1만 / 항목 3만)에서도 매번 전체 스캔, 운영 데이터는 수천만 행
+
+현재 방식:
+    (일자, 상태, 카테고리)마다 1행 - order_count / item_quantity / revenue
+        상태 ''     = 모든 상태 합계
+        카테고리 '' = 모든 카테고리 합계 (revenue = 주문 금액 total_amount 합계)
+        카테고리 X  = 그 카테고리 상품이 담긴 주문 수, 수량, 항목 금액(price × quantity) 합계
+    → 어떤 상태 / 카테고리 조합이든 날짜 범위 조회가 하루에 최대 1행
+
+유지:
+    - 주문 / 주문 항목 시그널 → 같은 트랜잭션에서 해당 행만 F() 증감 (롤백되면 함께 롤백)
+      여러 행의 증감은 UPDATE 1번 (CASE id) + 없는 행 bulk_create 1번 → 카테고리 수와 무관
+    - bulk_create → 생성된 행을 묶어서 한 번에 증감
+    - QuerySet.update() / bulk_update() → 영향받은 날짜만 다시 집계
+    - 처음 / 어긋났을 때: python manage.py backfill_sales_rollup (날짜 구간 단위로 나눠서)
+
+카테고리는 판매 시점 기준으로 누적됨 (이후 상품의 카테고리가 바뀌어도 과거 행은 그대로).
+백필은 현재 카테고리 기준으로 다시 집계함.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from market.order_totals import is_deleting
+
+
+ALL = ''
+APPLY_CHUNK = 200       # UPDATE 1번에 담는 행 수 (SQLite 파라미터 수 제한)
+
+_state = threading.local()
+
+_REVENUE = DecimalField(max_digits=14, decimal_places=2)
+
+
+def _line_total():
+    return Sum(F('price') * F('quantity'), output_field=_REVENUE)
+
+
+def _local_date(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def order_day(order):
+    return _local_date(order.created_at or timezone.now())
+
+
+# ============================================================================
+# 증감 누적 → UPDATE 1번 (CASE id)
+# ============================================================================
+
+class RollupDelta:
+    """(일자, 상태, 카테고리)별 증감 - 상태 '' 행은 자동으로 함께 증감"""
+
+    def __init__(self):
+        self.rows = defaultdict(lambda: [0, 0, Decimal(0)])
+
+    def add(self, day, status, category=ALL, orders=0, quantity=0, revenue=0):
+        for row_status in (status, ALL):
+            row = self.rows[(day, row_status, category)]
+            row[0] += orders
+            row[1] += quantity
+            row[2] += Decimal(revenue)
+
+    def add_order(self, day, status, total, categories, sign=1):
+        """
+        주문 1건 전체의 기여분
+        categories: {카테고리: (수량, 항목 금액)}
+        """
+        quantity = sum(q for q, _ in categories.values())
+        self.add(day, status, ALL, orders=sign, quantity=sign * quantity, revenue=sign * Decimal(total))
+        for category, (q, revenue) in categories.items():
+            self.add(day, status, category, orders=sign, quantity=sign * q, revenue=sign * revenue)
+
+    def apply(self, using=DEFAULT_DB_ALIAS):
+        """
+        행 수와 무관하게 SELECT 1번 + UPDATE 1번 (+ 없는 행 INSERT 1번)
+            UPDATE daily_sales_rollups SET order_count = order_count + CASE id WHEN .. END, ..
+            WHERE id IN (..)
+        """
+        from market.models import DailySalesRollup
+
+        rows = {key: delta for key, delta in self.rows.items() if any(delta)}
+        self.rows.clear()
+        manager = DailySalesRollup.objects.using(using)
+
+        while rows:
+            existing = _existing_rows(manager, rows)
+            for start in range(0, len(existing), APPLY_CHUNK):
+                _update_rows(manager, {pk: rows[key] for key, pk in existing[start:start + APPLY_CHUNK]})
+
+            found = {key for key, _ in existing}
+            rows = {key: delta for key, delta in rows.items() if key not in found}
+            if not rows:
+                return
+            try:
+                with transaction.atomic(using=using):
+                    manager.bulk_create([
+                        DailySalesRollup(
+                            day=day, status=status, category=category,
+                            order_count=orders, item_quantity=quantity, revenue=revenue,
+                        )
+                        for (day, status, category), (orders, quantity, revenue) in sorted(rows.items())
+                    ])
+                return
+            except IntegrityError:
+                # 다른 트랜잭션이 먼저 만든 행이 있음 → 다시 찾아서 증감 (새로 찾은 행이 없으면 다른 오류)
+                if not _existing_rows(manager, rows):
+                    raise
+
+    def to_objects(self):
+        from market.models import DailySalesRollup
+
+        return [
+            DailySalesRollup(
+                day=day, status=status, category=category,
+                order_count=orders, item_quantity=quantity, revenue=revenue,
+            )
+            for (day, status, category), (orders, quantity, revenue) in sorted(self.rows.items())
+        ]
+
+
+def _existing_rows(manager, rows):
+    """[((일자, 상태, 카테고리), id)] - 키 순서"""
+    days, statuses, categories = ({key[i] for key in rows} for i in range(3))
+    found = {
+        (day, status, category): pk
+        for pk, day, status, category in manager.filter(
+            day__in=days, status__in=statuses, category__in=categories,
+        ).values_list('id', 'day', 'status', 'category')
+    }
+    return sorted((key, pk) for key, pk in found.items() if key in rows)
+
+
+def _update_rows(manager, deltas):
+    """{id: (주문 수, 수량, 금액)} 증감을 UPDATE 1번으로"""
+    if not deltas:
+        return
+
+    def by_id(index, output_field):
+        return Case(
+            *(When(pk=pk, then=Value(delta[index], output_field=output_field)) for pk, delta in deltas.items()),
+            default=Value(0, output_field=output_field), output_field=output_field,
+        )
+
+    manager.filter(pk__in=list(deltas)).update(
+        order_count=F('order_count') + by_id(0, IntegerField()),
+        item_quantity=F('item_quantity') + by_id(1, IntegerField()),
+        revenue=F('revenue') + by_id(2, _REVENUE),
+    )
+
+
+def is_suspended():
+    return getattr(_state, 'suspended', False)
+
+
+@contextmanager
+def suspended():
+    """
+    대량 적재 중에는 집계 유지를 멈춤 → 끝난 뒤 backfill로 한 번에
+        with sales_rollup.suspended():
+            ... bulk_create ...
+        backfill(start, end)
+    """
+    previous, _state.suspended = is_suspended(), True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def _categories(order_id, using):
+    from market.models import OrderItem
+
+    rows = (
+        OrderItem.objects.using(using).filter(order_id=order_id)
+        .values('product__category')
+        .annotate(line_quantity=Sum('quantity'), line_revenue=_line_total())
+    )
+    return {row['product__category']: (row['line_quantity'], row['line_revenue']) for row in rows}
+
+
+def _product_category(product_id, using):
+    from market.models import Product
+    return Product._base_manager.using(using).filter(pk=product_id).values_list('category', flat=True).first()
+
+
+def _order_has_category(order_id, item_pk, category, using):
+    """같은 주문에 이 카테고리 항목이 (자신 말고) 더 있는지 - 카테고리 행의 주문 수 중복 방지"""
+    from market.models import OrderItem
+
+    return (
+        OrderItem.objects.using(using)
+        .filter(order_id=order_id, product__category=category)
+        .exclude(pk=item_pk)
+        .exists()
+    )
+
+
+# ============================================================================
+# 시그널 (market.signals)
+# ============================================================================
+
+def order_saved(order, created, previous=None, using=DEFAULT_DB_ALIAS):
+    """previous: 저장 전 (status, total_amount) - Order.from_db"""
+    if is_suspended():
+        return
+    day = order_day(order)
+    delta = RollupDelta()
+
+    if created:
+        delta.add(day, order.status, ALL, orders=1, revenue=order.total_amount)
+    elif previous is None:
+        # 이전 값을 모름 → 그날만 다시 집계
+        rebuild_days([day], using=using)
+        return
+    else:
+        status, total = previous
+        if status != order.status:
+            categories = _categories(order.pk, using)
+            delta.add_order(day, status, total, categories, sign=-1)
+            delta.add_order(day, order.status, order.total_amount, categories)
+        elif total != order.total_amount:
+            delta.add(day, order.status, ALL, revenue=Decimal(order.total_amount) - Decimal(total))
+
+    delta.apply(using=using)
+
+
+def order_deleting(order, previous=None, using=DEFAULT_DB_ALIAS):
+    """pre_delete - 항목이 CASCADE로 지워지기 전에 주문 전체 기여분을 한 번에 뺌"""
+    if is_suspended() or order.pk is None:
+        return
+    status, total = previous or (order.status, order.total_amount)
+    delta = RollupDelta()
+    delta.add_order(order_day(order), status, total, _categories(order.pk, using), sign=-1)
+    delta.apply(using=using)
+
+
+def _item_line(delta, item, order, product_id, quantity, price, sign, using):
+    category = _product_category(product_id, using)
+    if category is None:
+        return
+    first_or_last = not _order_has_category(order.pk, item.pk, category, using)
+    day, status = order_day(order), order.status
+    revenue = Decimal(price) * quantity
+    delta.add(day, status, category, orders=sign if first_or_last else 0, quantity=sign * quantity, revenue=sign * revenue)
+    delta.add(day, status, ALL, quantity=sign * quantity)
+
+
+def item_saved(item, created, previous=None, using=DEFAULT_DB_ALIAS):
+    """previous: 저장 전 (order_id, product_id, quantity, price) - OrderItem.from_db"""
+    if is_suspended():
+        return
+    from market.models import Order
+
+    order = item.order
+    delta = RollupDelta()
+
+    if not created:
+        if previous is None:
+            rebuild_days([order_day(order)], using=using)
+            return
+        if previous == (item.order_id, item.product_id, item.quantity, item.price):
+            return
+        order_id, product_id, quantity, price = previous
+        previous_order = order if order_id == order.pk else Order.objects.using(using).filter(pk=order_id).first()
+        if previous_order is not None:
+            _item_line(delta, item, previous_order, product_id, quantity, price, sign=-1, using=using)
+
+    _item_line(delta, item, order, item.product_id, item.quantity, item.price, sign=1, using=using)
+    delta.apply(using=using)
+
+
+def item_deleted(item, previous=None, using=DEFAULT_DB_ALIAS):
+    order_id, product_id, quantity, price = previous or (item.order_id, item.product_id, item.quantity, item.price)
+    if is_suspended() or is_deleting(order_id):
+        return  # 주문째 삭제 중이면 order_deleting에서 이미 뺌
+    from market.models import Order
+
+    order = Order.objects.using(using).filter(pk=order_id).first()
+    if order is None:
+        return
+    delta = RollupDelta()
+    _item_line(delta, item, order, product_id, quantity, price, sign=-1, using=using)
+    delta.apply(using=using)
+
+
+# ============================================================================
+# bulk_create / update (market.models의 QuerySet)
+# ============================================================================
+
+def orders_created(orders, using=DEFAULT_DB_ALIAS):
+    if is_suspended():
+        return
+    delta = RollupDelta()
+    for order in orders:
+        delta.add(order_day(order), order.status, ALL, orders=1, revenue=order.total_amount)
+    delta.apply(using=using)
+
+
+def items_created(items, using=DEFAULT_DB_ALIAS):
+    """
+    bulk_create된 항목 - 쿼리 수는 항목 수와 무관
+        주문 1번 + 상품 카테고리 1번 + 기존 (주문, 카테고리) 1번 + 행마다 UPDATE
+    """
+    from market.models import Order, OrderItem, Product
+
+    items = [item for item in items if item.pk is not None]
+    if is_suspended() or not items:
+        return
+
+    order_ids = {item.order_id for item in items}
+    orders = {
+        pk: (_local_date(created_at), status)
+        for pk, created_at, status in Order.objects.using(using).filter(pk__in=order_ids)
+        .values_list('pk', 'created_at', 'status')
+    }
+    categories = dict(
+        Product._base_manager.using(using).filter(pk__in={item.product_id for item in items})
+        .values_list('pk', 'category')
+    )
+    seen = set(
+        OrderItem.objects.using(using).filter(order_id__in=order_ids)
+        .exclude(pk__in=[item.pk for item in items])
+        .values_list('order_id', 'product__category').distinct()
+    )
+
+    delta = RollupDelta()
+    for item in items:
+        if item.order_id not in orders or item.product_id not in categories:
+            continue
+        day, status = orders[item.order_id]
+        category = categories[item.product_id]
+        first = (item.order_id, category) not in seen
+        seen.add((item.order_id, category))
+        delta.add(day, status, category, orders=int(first), quantity=item.quantity,
+                  revenue=Decimal(item.price) * item.quantity)
+        delta.add(day, status, ALL, quantity=item.quantity)
+    delta.apply(using=using)
+
+
+def rebuild_days(days, using=DEFAULT_DB_ALIAS):
+    """영향받은 날짜만 다시 집계 (연속된 날짜는 한 구간으로)"""
+    days = sorted(set(days))
+    if is_suspended() or not days:
+        return
+    start = previous = days[0]
+    for day in days[1:] + [None]:
+        if day is not None and day - previous == timedelta(days=1):
+            previous = day
+            continue
+        backfill_range(start, previous, using=using)
+        start = previous = day
+
+
+def days_of_orders(queryset):
+    """QuerySet에 해당하는 주문들의 날짜 목록 (GROUP BY 1번)"""
+    return list(
+        queryset.order_by().annotate(rollup_day=TruncDate('created_at'))
+        .values_list('rollup_day', flat=True).distinct()
+    )
+
+
+# ============================================================================
+# 백필 - [start, end] 구간을 통째로 다시 집계
+# ============================================================================
+
+def _bounds(start, end):
+    lower = datetime.combine(start, time.min)
+    upper = datetime.combine(end + timedelta(days=1), time.min)
+    if not settings.USE_TZ:
+        return lower, upper
+    return timezone.make_aware(lower), timezone.make_aware(upper)
+
+
+def backfill_range(start, end, using=DEFAULT_DB_ALIAS):
+    """
+    구간의 집계 행을 지우고 GROUP BY 2번으로 다시 만듦 (같은 트랜잭션)
+    반환: 만든 행 수
+    """
+    from market.models import DailySalesRollup, Order, OrderItem
+
+    lower, upper = _bounds(start, end)
+    delta = RollupDelta()
+
+    orders = (
+        Order.objects.using(using).filter(created_at__gte=lower, created_at__lt=upper)
+        .order_by().annotate(day=TruncDate('created_at'))
+        .values('day', 'status')
+        .annotate(orders=Count('id'), revenue=Sum('total_amount'))
+    )
+    for row in orders:
+        delta.add(row['day'], row['status'], ALL, orders=row['orders'], revenue=row['revenue'] or 0)
+
+    # 주문은 상태가 하나뿐 → 상태별 카테고리 행을 더하면 상태 '' 행이 됨
+    items = (
+        OrderItem.objects.using(using).filter(order__created_at__gte=lower, order__created_at__lt=upper)
+        .order_by().annotate(day=TruncDate('order__created_at'))
+        .values('day', 'order__status', 'product__category')
+        .annotate(
+            orders=Count('order_id', distinct=True),
+            line_quantity=Sum('quantity'),
+            line_revenue=_line_total(),
+        )
+    )
+    for row in items:
+        day, status = row['day'], row['order__status']
+        delta.add(day, status, row['product__category'],
+                  orders=row['orders'], quantity=row['line_quantity'], revenue=row['line_revenue'])
+        delta.add(day, status, ALL, quantity=row['line_quantity'])
+
+    with transaction.atomic(using=using):
+        DailySalesRollup.objects.using(using).filter(day__gte=start, day__lte=end).delete()
+        objs = DailySalesRollup.objects.using(using).bulk_create(delta.to_objects(), batch_size=1000)
+    return len(objs)
+
+
+def backfill(start=None, end=None, chunk_days=7, using=DEFAULT_DB_ALIAS, progress=None):
+    """
+    chunk_days씩 나눠서 백필 - 트랜잭션 / 메모리 크기가 전체 데이터 양과 무관
+    start / end 생략 시 주문이 있는 첫날 ~ 마지막 날
+    """
+    from django.db.models import Max, Min
+
+    from market.models import Order
+
+    if start is None or end is None:
+        bounds = Order.objects.using(using).aggregate(first=Min('created_at'), last=Max('created_at'))
+        if bounds['first'] is None:
+            return 0
+        start = start or _local_date(bounds['first'])
+        end = end or _local_date(bounds['last'])
+
+    created = 0
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+        created += backfill_range(chunk_start, chunk_end, using=using)
+        if progress:
+            progress(chunk_start, chunk_end, created)
+        chunk_start = chunk_end + timedelta(days=1)
+    return created
+
+
+# ============================================================================
+# 조회 - 하루에 최대 1행
+# ============================================================================
+
+def daily_sales(start, end, status=ALL, category=ALL):
+    """[start, end] 날짜별 {day, order_count, item_quantity, revenue} (매출 없는 날은 빠짐)"""
+    from market.models import DailySalesRollup
+
+    return list(
+        DailySalesRollup.objects
+        .filter(day__gte=start, day__lte=end, status=status, category=category)
+        .order_by('day')
+        .values('day', 'order_count', 'item_quantity', 'revenue')
+    )
+
+
+def sales_totals(start, end, status=ALL, category=ALL):
+    from market.models import DailySalesRollup
+
+    totals = DailySalesRollup.objects.filter(
+        day__gte=start, day__lte=end, status=status, category=category,
+    ).aggregate(order_count=Sum('order_count'), item_quantity=Sum('item_quantity'), revenue=Sum('revenue'))
+    return {key: value or 0 for key, value in totals.items()}
@@ -0,0 +1,240 @@
+"""
+캐시 값 직렬화 - 스키마 기반 바이너리 코덱 + 크기 기반 압축
+
+django_redis 기본 직렬화(pickle)는 dict 키 이름과 타입 정보를
+값마다 반복 저장함 → 주문 항목이 많을수록 Redis 메모리/네트워크 증가
+
+CompactSerializer:
+    - 자주 캐시하는 모양(product, order_full, 상품 목록)은 키 이름 없이
+      필드 순서대로 varint / 길이+UTF-8 / float64로 기록
+    - 그 외 값은 pickle로 기록
+    - COMPRESS_MIN_SIZE 바이트 이상이면 zlib 압축
+
+저장 형식:
+    [0x80 ...]                      기존 pickle 값 (그대로 읽힘)
+    [버전][플래그][본문 ...]         플래그: 압축 여부 / 본문 종류(compact|pickle)
+
+settings.CACHES['default']['OPTIONS']:
+    "SERIALIZER": "market.serializers.CompactSerializer",
+    "COMPRESS_MIN_SIZE": 1024,
+"""
+import pickle
+import struct
+import zlib
+
+from django_redis.serializers.base import BaseSerializer
+
+
+FORMAT_VERSION = 1
+
+FLAG_COMPRESSED = 0x01
+FLAG_PICKLE = 0x02
+
+_PICKLE_MARKER = 0x80  # pickle 프로토콜 2 이상의 첫 바이트
+
+_DOUBLE = struct.Struct('<d')
+
+
+# ----------------------------------------------------------------------
+# 기본 타입 인코딩
+# ----------------------------------------------------------------------
+
+def _write_uvarint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_uvarint(buf, pos):
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _write_int(out, n):
+    _write_uvarint(out, (n << 1) ^ (n >> 63))  # zigzag → 음수도 짧게
+
+
+def _read_int(buf, pos):
+    n, pos = _read_uvarint(buf, pos)
+    return (n >> 1) ^ -(n & 1), pos
+
+
+def _write_str(out, s):
+    data = s.encode('utf-8')
+    _write_uvarint(out, len(data))
+    out += data
+
+
+def _read_str(buf, pos):
+    length, pos = _read_uvarint(buf, pos)
+    end = pos + length
+    return bytes(buf[pos:end]).decode('utf-8'), end
+
+
+def _write_float(out, f):
+    out += _DOUBLE.pack(f)
+
+
+def _read_float(buf, pos):
+    return _DOUBLE.unpack_from(buf, pos)[0], pos + _DOUBLE.size
+
+
+_SCALARS = {
+    int: (_write_int, _read_int),
+    str: (_write_str, _read_str),
+    float: (_write_float, _read_float),
+}
+
+
+# ----------------------------------------------------------------------
+# 스키마
+# ----------------------------------------------------------------------
+
+class Record:
+    """필드 순서가 고정된 dict"""
+
+    def __init__(self, *fields):
+        self.fields = fields  # (이름, 타입) - 타입은 int/str/float/Record/ListOf
+        self.keys = frozenset(name for name, _ in fields)
+
+    def matches(self, value):
+        if type(value) is not dict or value.keys() != self.keys:
+            return False
+        return all(_matches(kind, value[name]) for name, kind in self.fields)
+
+    def write(self, out, value):
+        for name, kind in self.fields:
+            _write(kind, out, value[name])
+
+    def read(self, buf, pos):
+        value = {}
+        for name, kind in self.fields:
+            value[name], pos = _read(kind, buf, pos)
+        return value, pos
+
+
+class ListOf:
+    def __init__(self, item):
+        self.item = item
+
+    def matches(self, value):
+        return type(value) is list and all(_matches(self.item, v) for v in value)
+
+    def write(self, out, value):
+        _write_uvarint(out, len(value))
+        for v in value:
+            _write(self.item, out, v)
+
+    def read(self, buf, pos):
+        length, pos = _read_uvarint(buf, pos)
+        items = []
+        for _ in range(length):
+            v, pos = _read(self.item, buf, pos)
+            items.append(v)
+        return items, pos
+
+
+def _matches(kind, value):
+    if kind is int:
+        return type(value) is int and -(1 << 63) <= value < (1 << 63)
+    if kind in _SCALARS:
+        return type(value) is kind
+    return kind.matches(value)
+
+
+def _write(kind, out, value):
+    if kind in _SCALARS:
+        _SCALARS[kind][0](out, value)
+    else:
+        kind.write(out, value)
+
+
+def _read(kind, buf, pos):
+    if kind in _SCALARS:
+        return _SCALARS[kind][1](buf, pos)
+    return kind.read(buf, pos)
+
+
+# 스키마 ID는 저장된 값에 기록되므로 절대 재사용/변경 금지 (추가만 가능)
+SCHEMAS = {
+    # CacheAsidePattern.get_product / market.product_cache
+    1: Record(('id', int), ('name', str), ('price', float), ('category', str)),
+
+    # CacheAsidePattern.get_order_with_items (order_full:{id})
+    2: Record(
+        ('id', int),
+        ('user', Record(('id', int), ('username', str))),
+        ('total_amount', float),
+        ('items', ListOf(Record(('product_name', str), ('quantity', int), ('price', float)))),
+    ),
+
+    # 상품 목록 (product_list:*, products_by_category:*)
+    3: ListOf(Record(('id', int), ('name', str), ('price', float))),
+}
+
+
+def encode_compact(value):
+    """스키마에 맞으면 바이너리 본문, 아니면 None"""
+    for schema_id, schema in SCHEMAS.items():
+        if schema.matches(value):
+            out = bytearray([schema_id])
+            schema.write(out, value)
+            return bytes(out)
+    return None
+
+
+def decode_compact(body):
+    schema_id = body[0]
+    value, _ = SCHEMAS[schema_id].read(body, 1)
+    return value
+
+
+# ----------------------------------------------------------------------
+# django_redis 직렬화기
+# ----------------------------------------------------------------------
+
+class CompactSerializer(BaseSerializer):
+
+    def __init__(self, options):
+        self.compress_min_size = int(options.get('COMPRESS_MIN_SIZE', 1024))
+        self.compress_level = int(options.get('COMPRESS_LEVEL', 6))
+        super().__init__(options=options)
+
+    def dumps(self, value):
+        flags = 0
+        body = encode_compact(value)
+        if body is None:
+            flags |= FLAG_PICKLE
+            body = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        if len(body) >= self.compress_min_size:
+            compressed = zlib.compress(body, self.compress_level)
+            if len(compressed) < len(body):
+                flags |= FLAG_COMPRESSED
+                body = compressed
+
+        return bytes([FORMAT_VERSION, flags]) + body
+
+    def loads(self, value):
+        if value[0] == _PICKLE_MARKER:
+            # 코덱 도입 이전에 저장된 값
+            return pickle.loads(value)
+
+        version, flags = value[0], value[1]
+        if version != FORMAT_VERSION:
+            raise ValueError(f'unknown cache codec version: {version}')
+
+        body = value[2:]
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        if flags & FLAG_PICKLE:
+            return pickle.loads(body)
+        return decode_compact(body)
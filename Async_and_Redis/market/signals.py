@@ -0,0 +1,121 @@
+"""
+상품 변경 시 캐시 무효화 시그널
+
+MarketConfig.ready()에서 import되어 모든 Worker에 등록됨.
+무효화는 market.invalidation을 통해 커밋 이후 한 번에 전송됨.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from market import order_totals, sales_rollup
+from market.bloom import product_bloom
+from market.invalidation import invalidate_products, invalidate_tags, record_writes, user_orders_tag
+from market.models import Order, OrderItem, Product
+from market.order_stats import order_stats
+from market.request_memo import MEMO_MODELS, forget_instance
+from market.stock import reset_stock_counters, stock_counters
+
+
+@receiver(post_save, sender=Product)  # 상품이 저장될때 해당 함수를 자동실행 하도록 함.
+def invalidate_product_cache_on_save(sender, instance, using, created=False, **kwargs):
+    rows = [(instance.id, instance.category)]
+    loaded = getattr(instance, '_loaded_category', None)
+    moved = created or loaded != instance.category
+    if loaded is not None and moved:
+        rows.append((instance.id, loaded))  # 이전 카테고리 목록에서도 빠짐
+
+    # ABSENT 표시도 함께 지워짐
+    invalidate_products(rows, using=using, moved={category for _, category in rows} if moved else ())
+    instance._loaded_category = instance.category
+
+    # 재고를 직접 저장 → Redis 재고 카운터도 DB 기준으로 (market.stock)
+    loaded_stock = getattr(instance, '_loaded_stock', None)
+    if loaded_stock is not None and loaded_stock != instance.stock:
+        reset_stock_counters([instance.id], using=using)
+    instance._loaded_stock = instance.stock
+
+    if created and product_bloom.enabled:
+        transaction.on_commit(lambda: product_bloom.add(instance.id), using=using)
+
+
+@receiver(post_delete, sender=Product)  # 상품이 삭제될때 해당 함수를 자동실행 하도록 함.
+def invalidate_product_cache_on_delete(sender, instance, using, **kwargs):
+    invalidate_products([(instance.id, instance.category)], using=using, moved=[instance.category])
+
+    product_id = instance.id
+    transaction.on_commit(lambda: stock_counters.discard([product_id]), using=using)
+
+    if product_bloom.enabled:
+        transaction.on_commit(_record_bloom_delete, using=using)
+
+
+def _record_bloom_delete():
+    from market.cache_lock import RedisLock
+
+    if not product_bloom.record_delete():
+        return
+
+    # 삭제가 누적되어 오탐률 증가 → 한 Worker만 재구축
+    lock = RedisLock('bloom:products:rebuild', timeout=300)
+    if lock.acquire():
+        try:
+            product_bloom.rebuild()
+        finally:
+            lock.release()
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def on_order_change(sender, instance, using, **kwargs):
+    # 주문이 자주 바뀌면 statistics / order_full: TTL이 짧아짐
+    record_writes('market.order', using=using)
+    # 사용자별 주문 목록 응답 캐시 (market.views.my_orders)
+    invalidate_tags(user_orders_tag(instance.user_id), using=using)
+
+
+@receiver(post_save, sender=Order)
+def update_order_aggregates_on_save(sender, instance, using, created=False, **kwargs):
+    previous = getattr(instance, '_loaded_stats', None)  # 저장 전 (status, total_amount)
+    # 누적 주문 통계 (커밋 이후 HINCRBY) - 전체 집계 없이 O(1) 조회
+    order_stats.record_saved(instance, created, previous, using=using)
+    # 일별 매출 집계 (같은 트랜잭션)
+    sales_rollup.order_saved(instance, created, previous, using=using)
+    instance._loaded_stats = (instance.status, instance.total_amount)
+
+
+@receiver(pre_delete, sender=Order)
+def update_sales_rollup_before_order_delete(sender, instance, using, **kwargs):
+    # 항목이 CASCADE로 지워지기 전에 주문 전체를 한 번에 뺌 → 이어지는 항목 삭제 시그널은 무시
+    sales_rollup.order_deleting(instance, getattr(instance, '_loaded_stats', None), using=using)
+    order_totals.mark_deleting(instance.pk)
+
+
+@receiver(post_delete, sender=Order)
+def update_order_aggregates_on_delete(sender, instance, using, **kwargs):
+    order_stats.record_deleted(instance, getattr(instance, '_loaded_stats', None), using=using)
+    order_totals.unmark_deleting(instance.pk)
+
+
+@receiver(post_save, sender=OrderItem)
+def update_order_on_item_save(sender, instance, using, created=False, **kwargs):
+    previous = getattr(instance, '_loaded_line', None)  # 저장 전 (order_id, product_id, quantity, price)
+    # 주문의 item_count / items_total + 일별 매출 집계 (같은 트랜잭션)
+    order_totals.item_saved(instance, created, previous, using=using)
+    sales_rollup.item_saved(instance, created, previous, using=using)
+    instance._loaded_line = (instance.order_id, instance.product_id, instance.quantity, instance.price)
+
+
+@receiver(post_delete, sender=OrderItem)
+def update_order_on_item_delete(sender, instance, using, **kwargs):
+    previous = getattr(instance, '_loaded_line', None)
+    order_totals.item_deleted(instance, previous, using=using)
+    sales_rollup.item_deleted(instance, previous, using=using)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def forget_memoized_instance(sender, instance, **kwargs):
+    """요청 메모에 남은 이전 인스턴스 제거"""
+    if sender in MEMO_MODELS:
+        forget_instance(sender, instance.pk)
@@ -0,0 +1,383 @@
+"""
+재고 write-behind 카운터
+
+이전 방식:
+    주문마다 UPDATE products SET stock = stock - 1 WHERE id = ...
+    - 인기 상품 1개에 요청이 몰리면 같은 행 락에서 줄을 섬 (SQLite는 DB 파일 전체)
+    - Worker가 늘어도 처리량은 그대로, 대기 시간만 늘어남
+
+현재 방식:
+    1. 차감: Redis에서 원자적으로 (DECRBY + 미반영 델타 HINCRBY를 MULTI 1번)
+            결과가 음수면 즉시 되돌리고 OutOfStock → 초과 판매 없음
+    2. 반영: 백그라운드 flusher가 STOCK_FLUSH_INTERVAL마다 누적된 델타를
+            UPDATE products SET stock = stock + CASE id WHEN .. THEN .. END 1번으로 DB에 반영
+    3. 복구: 반영 중인 배치는 stock:flushing:<번호>로 이름을 바꿔 둠
+            → 프로세스가 죽어도 Redis에 남아 있고, 다음 flush가 이어서 반영
+            → DB에 배치 번호(StockFlush)를 같은 트랜잭션으로 기록하므로 두 번 반영되지 않음
+            (배치 번호는 무작위 63비트 - Redis가 재시작되거나 프로세스마다 Redis가 따로여도 겹치지 않음)
+
+Redis 키 (캐시와 다른 논리 DB - cache.clear()에 지워지지 않도록):
+    stock:<id>              현재 재고 (DB 재고 + 미반영 델타)
+    stock:pending           {id: 미반영 델타}
+    stock:flushing:<번호>   반영 중인 배치
+
+DB 재고를 직접 바꾸면 (save / update / bulk_update) 커밋 이후 카운터도 DB 기준으로 다시 맞춤.
+어긋났는지 확인 / 수정:
+    python manage.py reconcile_stock [--fix]
+
+settings:
+    STOCK_REDIS_DB = 2            # 카운터를 둘 Redis 논리 DB
+    STOCK_FLUSH_INTERVAL = 1.0    # 초
+"""
+import atexit
+import logging
+import secrets
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'stock:pending'
+FLUSHING_PREFIX = 'stock:flushing:'
+
+FLUSH_CHUNK = 300       # UPDATE 1번에 담는 상품 수 (SQLite 파라미터 수 제한)
+LOCK_WAIT = 5.0
+
+
+class OutOfStock(Exception):
+    """재고 부족 - product_ids: 부족한 상품 id"""
+
+    def __init__(self, product_ids):
+        self.product_ids = list(product_ids)
+        super().__init__(f'재고 부족: {self.product_ids}')
+
+
+def counter_key(product_id):
+    return f'stock:{product_id}'
+
+
+def _with_db(url, db):
+    parts = urlsplit(url)
+    if parts.scheme == 'unix':
+        query = dict(parse_qsl(parts.query))
+        query['db'] = str(db)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+    return urlunsplit(parts._replace(path=f'/{db}'))
+
+
+def _connect():
+    import redis
+
+    from market.local_redis import server_url
+
+    location = settings.CACHES['default']['LOCATION']
+    location = location[0] if isinstance(location, (list, tuple)) else location.split(',')[0]
+    db = getattr(settings, 'STOCK_REDIS_DB', 2)
+    url = server_url(location, db=db) if location.startswith('local://') else _with_db(location, db)
+    return redis.Redis.from_url(url)
+
+
+class StockCounters:
+
+    def __init__(self, flush_interval=1.0):
+        self.flush_interval = flush_interval
+        self._redis = None
+        self._flusher = None
+        self._lock = threading.Lock()
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            with self._lock:
+                if self._redis is None:
+                    self._redis = _connect()
+        return self._redis
+
+    def _flush_lock(self):
+        from market.cache_lock import RedisLock
+        return RedisLock('stock:flush', timeout=30)
+
+    def _acquire(self, lock, wait=LOCK_WAIT):
+        deadline = time.monotonic() + wait
+        while not lock.acquire():
+            if time.monotonic() >= deadline:
+                raise TimeoutError('stock:flush 락 대기 시간 초과')
+            time.sleep(0.005)
+
+    # ------------------------------------------------------------------
+    # 카운터 초기화 (DB 재고 + 미반영 델타)
+    # ------------------------------------------------------------------
+
+    def _load(self, product_ids, only_existing=False):
+        """
+        flush 락 안에서 카운터를 DB 기준으로 설정
+        (DB 재고와 미반영 델타를 같은 시점에 읽기 위해 flush와 겹치지 않도록)
+        """
+        from redis.exceptions import WatchError
+
+        from market.models import Product
+
+        keys = [counter_key(pk) for pk in product_ids]
+        lock = self._flush_lock()
+        self._acquire(lock)
+        try:
+            self._recover()
+            while True:
+                with self.redis.pipeline() as pipe:
+                    try:
+                        pipe.watch(PENDING_KEY, *keys)
+                        exists = [pipe.exists(key) for key in keys]
+                        targets = [
+                            pk for pk, found in zip(product_ids, exists)
+                            if bool(found) == only_existing
+                        ]
+                        if not targets:
+                            pipe.unwatch()
+                            return
+                        pending = dict(zip(targets, pipe.hmget(PENDING_KEY, targets)))
+                        db_stock = dict(Product.objects.filter(pk__in=targets).values_list('id', 'stock'))
+
+                        pipe.multi()
+                        for pk, stock in db_stock.items():
+                            pipe.set(counter_key(pk), stock + int(pending[pk] or 0))
+                        pipe.execute()
+                        return
+                    except WatchError:
+                        continue  # 그 사이 차감됨 → 다시 읽음
+        finally:
+            lock.release()
+
+    def tracked(self, product_ids):
+        """카운터가 있는 상품 id (EXISTS 파이프라인 1번)"""
+        product_ids = list(product_ids)
+        with self.redis.pipeline(transaction=False) as pipe:
+            for pk in product_ids:
+                pipe.exists(counter_key(pk))
+            return {pk for pk, found in zip(product_ids, pipe.execute()) if found}
+
+    def _ensure(self, product_ids):
+        """카운터가 없는 상품만 DB에서 초기화 (보통은 EXISTS 1번으로 끝남)"""
+        tracked = self.tracked(product_ids)
+        missing = [pk for pk in product_ids if pk not in tracked]
+
+        if missing:
+            from market.models import Product
+
+            self._load(missing)
+            if Product.objects.filter(pk__in=missing).count() != len(missing):
+                raise Product.DoesNotExist(f'상품 없음: {missing}')
+
+    def reset(self, product_ids):
+        """DB 재고를 직접 바꾼 상품 - 이미 있는 카운터만 DB 기준으로 다시 맞춤"""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        # 카운터를 쓰지 않는 상품이면 락 없이 끝
+        if self.redis.exists(*(counter_key(pk) for pk in product_ids)):
+            self._load(product_ids, only_existing=True)
+
+    def discard(self, product_ids):
+        """삭제된 상품의 카운터 / 미반영 델타 제거"""
+        if not product_ids:
+            return
+        with self.redis.pipeline() as pipe:
+            pipe.delete(*(counter_key(pk) for pk in product_ids))
+            pipe.hdel(PENDING_KEY, *product_ids)
+            pipe.execute()
+
+    # ------------------------------------------------------------------
+    # 조회 / 차감 / 증가 (요청 경로 - DB 쓰기 없음)
+    # ------------------------------------------------------------------
+
+    def available(self, product_id):
+        self._ensure([product_id])
+        return int(self.redis.get(counter_key(product_id)) or 0)
+
+    def available_many(self, product_ids):
+        product_ids = list(dict.fromkeys(product_ids))
+        self._ensure(product_ids)
+        values = self.redis.mget([counter_key(pk) for pk in product_ids])
+        return {pk: int(value or 0) for pk, value in zip(product_ids, values)}
+
+    def _apply(self, quantities, sign):
+        with self.redis.pipeline() as pipe:
+            for pk, quantity in quantities.items():
+                pipe.incrby(counter_key(pk), sign * quantity)
+                pipe.hincrby(PENDING_KEY, pk, sign * quantity)
+            return pipe.execute()[::2]
+
+    def decrement_many(self, quantities):
+        """
+        {product_id: 수량} 전부 차감 또는 전부 실패 (OutOfStock)
+
+        DECRBY 결과가 음수인 상품이 하나라도 있으면 모두 되돌림
+        (WATCH 재시도 대신 보상 → 인기 상품에 요청이 몰려도 재시도 폭주 없음)
+        """
+        quantities = {pk: quantity for pk, quantity in quantities.items() if quantity}
+        if not quantities:
+            return {}
+        if any(quantity < 0 for quantity in quantities.values()):
+            raise ValueError('차감 수량은 0 이상이어야 합니다.')
+
+        self._ensure(list(quantities))
+        remaining = dict(zip(quantities, self._apply(quantities, -1)))
+
+        short = [pk for pk, value in remaining.items() if value < 0]
+        if short:
+            self._apply(quantities, +1)
+            raise OutOfStock(short)
+
+        self._start_flusher()
+        return remaining
+
+    def release_many(self, quantities):
+        """decrement_many로 차감한 수량을 되돌림 (주문 실패 시 보상)"""
+        quantities = {pk: quantity for pk, quantity in quantities.items() if quantity}
+        if quantities:
+            self._apply(quantities, +1)
+            self._start_flusher()
+
+    def decrement(self, product_id, quantity=1):
+        return self.decrement_many({product_id: quantity})[product_id]
+
+    def increment(self, product_id, quantity=1):
+        """입고 / 주문 취소"""
+        self._ensure([product_id])
+        value = self._apply({product_id: quantity}, +1)[0]
+        self._start_flusher()
+        return value
+
+    # ------------------------------------------------------------------
+    # DB 반영
+    # ------------------------------------------------------------------
+
+    def _write_batch(self, batch, key):
+        """배치 하나를 DB에 반영 - 이미 반영된 배치면 키만 지움"""
+        from market.models import Product, StockFlush
+
+        deltas = {int(pk): int(delta) for pk, delta in self.redis.hgetall(key).items() if int(delta)}
+        items = list(deltas.items())
+        try:
+            with transaction.atomic():
+                # 배치 번호가 PK → 같은 배치를 두 번 반영하면 IntegrityError로 전체 롤백
+                StockFlush.objects.create(id=batch, products=len(items))
+                for start in range(0, len(items), FLUSH_CHUNK):
+                    Product.objects.apply_stock_deltas(dict(items[start:start + FLUSH_CHUNK]))
+        except IntegrityError:
+            # 이미 반영된 배치 (반영 직후 프로세스가 죽음)인지 확인 - 아니면 키를 남겨 두고 다음 flush에서 재시도
+            if not StockFlush.objects.filter(pk=batch).exists():
+                raise
+            items = []
+        self.redis.delete(key)
+        return len(items)
+
+    def _recover(self):
+        """이전 flush가 남긴 배치 반영 (flush 락 안에서 호출)"""
+        written = 0
+        for key in self.redis.scan_iter(match=f'{FLUSHING_PREFIX}*'):
+            key = key.decode()
+            written += self._write_batch(int(key.removeprefix(FLUSHING_PREFIX)), key)
+        return written
+
+    def flush(self):
+        """미반영 델타를 DB에 반영하고 반영한 상품 수를 반환 (다른 프로세스가 반영 중이면 0)"""
+        from redis.exceptions import ResponseError
+
+        lock = self._flush_lock()
+        if not lock.acquire():
+            return 0
+        try:
+            written = self._recover()
+            batch = secrets.randbits(63)  # BigIntegerField 범위
+            key = f'{FLUSHING_PREFIX}{batch}'
+            try:
+                # 이후 차감은 새 stock:pending에 쌓임
+                self.redis.rename(PENDING_KEY, key)
+            except ResponseError:
+                return written  # 미반영 델타 없음
+            return written + self._write_batch(batch, key)
+        finally:
+            lock.release()
+
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name='stock-flusher', daemon=True)
+            self._flusher.start()
+            atexit.register(self._flush_quietly)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self._flush_quietly()
+
+    def _flush_quietly(self):
+        from django.db import close_old_connections
+
+        try:
+            self.flush()
+        except Exception:
+            # 델타는 Redis에 남아 있음 → 다음 주기에 다시 시도
+            logger.warning('stock flush failed', exc_info=True)
+        finally:
+            close_old_connections()
+
+    # ------------------------------------------------------------------
+    # 점검
+    # ------------------------------------------------------------------
+
+    def reconcile(self, fix=False, chunk_size=1000):
+        """
+        카운터 ≠ DB 재고 + 미반영 델타 인 상품 목록
+        fix=True면 DB 기준으로 카운터를 다시 맞춤
+
+        카운터가 예상보다 낮으면 DB 쪽이 틀렸을 가능성이 큼
+        (이전 값을 들고 있던 저장이 flush된 차감을 덮어씀) → 카운터를 올리면 그만큼 초과 판매되므로
+        suspect='db'로 표시만 하고 fix=True여도 고치지 않음
+        """
+        from market.models import Product
+
+        lock = self._flush_lock()
+        self._acquire(lock)
+        try:
+            self._recover()
+            pending = {int(pk): int(delta) for pk, delta in self.redis.hgetall(PENDING_KEY).items()}
+            drift = []
+            rows = Product.objects.values_list('id', 'stock').order_by('id').iterator(chunk_size=chunk_size)
+            while chunk := [row for _, row in zip(range(chunk_size), rows)]:
+                counters = self.redis.mget([counter_key(pk) for pk, _ in chunk])
+                for (pk, stock), counter in zip(chunk, counters):
+                    expected = stock + pending.get(pk, 0)
+                    if counter is not None and int(counter) != expected:
+                        drift.append({
+                            'id': pk, 'counter': int(counter), 'expected': expected,
+                            'suspect': 'db' if int(counter) < expected else 'counter',
+                        })
+
+            existing = set(Product.objects.filter(pk__in=list(pending)).values_list('id', flat=True))
+            orphans = [pk for pk in pending if pk not in existing]
+        finally:
+            lock.release()
+
+        if fix:
+            self.reset([entry['id'] for entry in drift if entry['suspect'] == 'counter'])
+            self.discard(orphans)
+        return {'drift': drift, 'orphans': orphans}
+
+
+def reset_stock_counters(product_ids, using=None):
+    """DB 재고를 직접 바꿈 → 커밋 이후 카운터를 DB 기준으로 다시 맞춤"""
+    product_ids = list(product_ids)
+    if product_ids:
+        transaction.on_commit(lambda: stock_counters.reset(product_ids), using=using)
+
+
+stock_counters = StockCounters(flush_interval=getattr(settings, 'STOCK_FLUSH_INTERVAL', 1.0))
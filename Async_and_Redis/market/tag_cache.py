@@ -0,0 +1,130 @@
+"""
+다중 태그 버전 캐시 - 조회 1번 왕복
+
+이전 방식:
+    get_tag_version (GET) → 없으면 SET → cache.get(versioned_key)
+    = 순차 왕복 2~3번, 항목당 태그 1개
+    invalidate_tag = GET 후 SET (읽기-수정-쓰기 경쟁)
+
+현재 방식:
+    값과 함께 저장 시점의 태그 버전을 보관
+        product_list:electronics → {'tags': {'products': 3, 'category:electronics': 7}, 'data': ...}
+
+    조회 = MGET [tag_version:products, tag_version:category:electronics, product_list:electronics]
+        → 저장된 버전과 현재 버전이 하나라도 다르면 미스
+    무효화 = INCR tag_version:<tag> (원자적, MULTI로 여러 태그 동시)
+            + 같은 MULTI에서 전역 세대(tag_generation) INCR
+            → 값을 만드는 동안 어떤 태그든 무효화됐는지 확인할 때 사용 (market.response_cache)
+
+요청 범위 안에서는 태그 버전을 메모해 두어 반복 조회를 생략함. (market.request_memo)
+"""
+from django.core.cache import cache
+
+from market.hot_keys import hot_keys
+from market.request_memo import current_memo
+from market.ttl_policy import ttl_for
+
+
+_MISSING = object()
+
+TAG_GENERATION_KEY = 'tag_generation'
+
+
+def tag_version_key(tag):
+    return f'tag_version:{tag}'
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def fetch_tag_versions(tags, extra_keys=()):
+    """메모에 없는 태그 버전 + extra_keys를 MGET 1번으로 가져옴"""
+    memo = current_memo()
+    versions = {}
+    if memo is not None:
+        for tag in tags:
+            version = memo.get('tag_version', tag, _MISSING)
+            if version is not _MISSING:
+                versions[tag] = version
+    missing = [tag for tag in tags if tag not in versions]
+
+    keys = [tag_version_key(tag) for tag in missing] + list(extra_keys)
+    fetched = cache.get_many(keys) if keys else {}
+
+    for tag in missing:
+        versions[tag] = int(fetched.get(tag_version_key(tag), 0))
+        if memo is not None:
+            memo.set('tag_version', tag, versions[tag])
+
+    return versions, fetched
+
+
+def tag_generation():
+    """
+    전역 무효화 세대 - 태그 무효화마다 1씩 증가
+    요청 메모 / 핫 키 복제본을 거치지 않고 Redis에서 바로 읽음 (항상 최신 값이어야 함)
+    """
+    return int(_redis().get(cache.make_key(TAG_GENERATION_KEY)) or 0)
+
+
+class TagBasedCache:
+    """다중 태그 기반 캐시 관리"""
+
+    @staticmethod
+    def get_tag_versions(tags):
+        """태그 버전 조회 (메모 우선, 없는 태그는 0)"""
+        versions, _ = fetch_tag_versions(tags)
+        return versions
+
+    @staticmethod
+    def get_tag_version(tag):
+        return TagBasedCache.get_tag_versions([tag])[tag]
+
+    @staticmethod
+    def invalidate_tags(*tags):
+        """태그 버전 원자적 증가 → 관련 캐시 모두 무효화"""
+        if not tags:
+            return {}
+
+        with _redis().pipeline(transaction=True) as pipe:
+            for tag in tags:
+                pipe.incr(cache.make_key(tag_version_key(tag)))
+            pipe.incr(cache.make_key(TAG_GENERATION_KEY))
+            new_versions = dict(zip(tags, pipe.execute()))
+
+        # raw INCR은 캐시 백엔드를 거치지 않음 → 핫 키로 복제된 태그 버전은 직접 제거 (+ 다른 Worker에 방송)
+        hot_keys.forget([tag_version_key(tag) for tag in tags])
+
+        memo = current_memo()
+        if memo is not None:
+            for tag, version in new_versions.items():
+                memo.set('tag_version', tag, version)
+
+        return new_versions
+
+    @staticmethod
+    def invalidate_tag(tag):
+        return TagBasedCache.invalidate_tags(tag)[tag]
+
+    @staticmethod
+    def get_cached_data(cache_key, tags, fetch_func, ttl=None):
+        """
+        태그 버전 + 값을 MGET 1번으로 조회
+        (태그 버전이 모두 메모되어 있으면 GET 1번)
+        """
+        if isinstance(tags, str):
+            tags = [tags]
+
+        versions, fetched = fetch_tag_versions(tags, extra_keys=[cache_key])
+
+        entry = fetched.get(cache_key)
+        if entry is not None and entry['tags'] == versions:
+            return entry['data']
+
+        # 미스 또는 태그 버전 불일치 → 다시 가져와서 현재 버전과 함께 저장
+        data = fetch_func()
+        ttl = ttl_for(cache_key) if ttl is None else ttl
+        cache.set(cache_key, {'tags': versions, 'data': data}, ttl)
+        return data
@@ -0,0 +1,299 @@
+"""
+2단계 캐시: 프로세스 내 LRU(L1) + Redis(L2)
+
+    요청 → L1 (프로세스 메모리, 0.001ms)
+             │ (미스)
+             ▼
+           L2 (Redis, 네트워크 왕복)
+             │ (미스)
+             ▼
+           DB
+
+무효화는 Redis pub/sub 채널로 방송하여
+모든 gunicorn Worker가 자신의 L1 항목을 버리도록 함.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+INVALIDATION_CHANNEL = 'cache:invalidate'
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    크기 제한 + TTL을 가진 프로세스 내 LRU 캐시
+
+    generation: delete/clear마다 1씩 증가
+        L2에서 읽은 값으로 채우기 전에 읽어 두고 set(..., generation=)에 넘기면
+        그 사이 무효화가 처리됐을 때 채우기를 건너뜀 (무효화 이전 값이 다시 들어가지 않도록)
+    """
+
+    def __init__(self, maxsize=5000, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)  # 최근 사용으로 갱신
+            return value
+
+    def set(self, key, value, ttl=None, generation=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+
+            # 크기 초과 시 가장 오래 사용하지 않은 항목부터 제거
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TierStats:
+    """계층별 히트/미스 및 지연 시간 집계"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.elapsed = 0.0
+
+    def record(self, hit, elapsed):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.elapsed += elapsed
+
+    def as_dict(self):
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / calls if calls else 0.0,
+            'avg_latency_ms': (self.elapsed / calls) * 1000 if calls else 0.0,
+        }
+
+
+class TieredCache:
+    """L1(LocalLRUCache) → L2(django cache) 순서로 조회하는 Cache-Aside 래퍼"""
+
+    def __init__(self, maxsize=5000, local_ttl=30, channel=INVALIDATION_CHANNEL):
+        self.local = LocalLRUCache(maxsize=maxsize, ttl=local_ttl)
+        self.channel = channel
+        self.l1_stats = TierStats()
+        self.l2_stats = TierStats()
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+
+    def get(self, key, default=None):
+        self._ensure_listener()
+
+        start = time.perf_counter()
+        value = self.local.get(key)
+        self.l1_stats.record(value is not _MISSING, time.perf_counter() - start)
+        if value is not _MISSING:
+            return value
+
+        generation = self.local.generation
+        start = time.perf_counter()
+        value = cache.get(key, _MISSING)
+        self.l2_stats.record(value is not _MISSING, time.perf_counter() - start)
+        if value is _MISSING:
+            return default
+
+        # L2 히트 → L1 채우기 (읽는 동안 무효화가 처리됐으면 건너뜀)
+        self.local.set(key, value, generation=generation)
+        return value
+
+    def get_many(self, keys):
+        """L1에서 찾고, 나머지만 Redis MGET 1번"""
+        self._ensure_listener()
+
+        found = {}
+        remaining = []
+
+        start = time.perf_counter()
+        for key in keys:
+            value = self.local.get(key)
+            if value is _MISSING:
+                remaining.append(key)
+            else:
+                found[key] = value
+        elapsed = time.perf_counter() - start
+        for key in keys:
+            self.l1_stats.record(key in found, elapsed / len(keys))
+
+        if remaining:
+            generation = self.local.generation
+            start = time.perf_counter()
+            fetched = cache.get_many(remaining)
+            elapsed = time.perf_counter() - start
+            for key in remaining:
+                self.l2_stats.record(key in fetched, elapsed / len(remaining))
+
+            for key, value in fetched.items():
+                if not self.local.set(key, value, generation=generation):
+                    break  # 무효화가 끼어듦 → 나머지도 채우지 않음
+            found.update(fetched)
+
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT):
+        """Redis에는 파이프라인 1번으로 저장 (timeout 생략 시 키마다 TTL 정책 + 지터)"""
+        from market.ttl_policy import set_many_with_policy
+
+        if timeout is DEFAULT_TIMEOUT:
+            timeouts = set_many_with_policy(data)
+        else:
+            cache.set_many(data, timeout)
+            timeouts = dict.fromkeys(data, timeout)
+
+        for key, value in data.items():
+            timeout = timeouts[key]
+            local_ttl = self.local.ttl if timeout is None else min(self.local.ttl, timeout)
+            self.local.set(key, value, local_ttl)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        from market.ttl_policy import ttl_for
+
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = ttl_for(key)
+        cache.set(key, value, timeout)
+
+        # L1 TTL은 L2 TTL보다 길어지면 안 됨
+        local_ttl = self.local.ttl if timeout is None else min(self.local.ttl, timeout)
+        self.local.set(key, value, local_ttl)
+
+    def invalidate(self, *keys):
+        """L2 삭제 + 모든 Worker의 L1 삭제를 방송"""
+        if not keys:
+            return
+
+        cache.delete_many(keys)
+        for key in keys:
+            self.local.delete(key)
+
+        self.publish(keys)
+
+    # ------------------------------------------------------------------
+    # pub/sub 무효화
+    # ------------------------------------------------------------------
+
+    def publish(self, keys):
+        from django_redis import get_redis_connection
+
+        try:
+            get_redis_connection('default').publish(self.channel, json.dumps(list(keys)))
+        except NotImplementedError:
+            # Redis가 아닌 백엔드 → 단일 프로세스이므로 방송 불필요
+            pass
+
+    def _ensure_listener(self):
+        """Worker 프로세스마다 한 번 구독 스레드를 띄움 (fork 이후 재시작)"""
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+
+        with self._listener_lock:
+            if self._listener_pid == pid:
+                return
+
+            # fork 이전 부모 프로세스의 L1은 신뢰할 수 없음
+            self.local.clear()
+            self._listener_pid = pid
+
+            thread = threading.Thread(
+                target=self._listen,
+                name=f'tiered-cache-listener-{pid}',
+                daemon=True,
+            )
+            thread.start()
+
+    def _listen(self):
+        from django_redis import get_redis_connection
+        from market.hot_keys import hot_keys
+
+        while True:
+            try:
+                pubsub = get_redis_connection('default').pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+
+                for message in pubsub.listen():
+                    if message['type'] != 'message':
+                        continue
+                    for key in json.loads(message['data']):
+                        self.local.delete(key)
+                        hot_keys.replica.delete(key)  # 핫 키 복제본도 함께
+
+            except NotImplementedError:
+                return
+
+            except Exception:
+                # 연결이 끊긴 동안 놓친 무효화가 있을 수 있으므로 L1 비움
+                self.local.clear()
+                hot_keys.replica.clear()
+                time.sleep(1)
+
+    # ------------------------------------------------------------------
+    # 측정
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        l1 = self.l1_stats.as_dict()
+        l2 = self.l2_stats.as_dict()
+        return {
+            'l1': l1,
+            'l2': l2,
+            'l1_size': len(self.local),
+            'redis_calls_saved': l1['hits'],
+        }
+
+    def reset_stats(self):
+        self.l1_stats = TierStats()
+        self.l2_stats = TierStats()
+
+
+product_cache = TieredCache(
+    maxsize=getattr(settings, 'L1_CACHE_MAXSIZE', 5000),
+    local_ttl=getattr(settings, 'L1_CACHE_TTL', 30),
+)
@@ -0,0 +1,166 @@
+"""
+TTL 정책 - 키 접두사별 기본값 + 지터 + (선택) 쓰기 빈도 기반 적응형 TTL
+
+문제:
+    300, 60, 10 같은 TTL이 코드 곳곳에 하드코딩
+    워밍처럼 한꺼번에 쓴 키들은 한꺼번에 만료 → 동시 미스 폭주
+
+    ttl_for('product:12')      → 300 ± 10%  (키마다 다르게)
+    ttl_for('statistics')      → 60 ± 10%
+
+적응형 (policy에 'model' 지정 시):
+    해당 모델의 최근 분당 쓰기 수가 reference_rate를 넘으면 TTL을 비례해서 줄임
+        ttl = base × reference_rate / max(쓰기율, reference_rate)   (min_ttl 이상)
+    → 자주 바뀌는 데이터는 짧게, 거의 안 바뀌는 데이터는 길게
+
+settings.CACHE_TTL_POLICIES로 접두사별 값을 덮어쓸 수 있음.
+"""
+import random
+import time
+
+from django.conf import settings
+
+
+DEFAULT_POLICIES = {
+    'product:': {'ttl': 300, 'model': 'market.product'},
+    'product_ttl:': {'ttl': 300},
+    'product_detail:': {'ttl': 300, 'model': 'market.product'},
+    'product_list:': {'ttl': 300, 'model': 'market.product'},
+    'products_by_category:': {'ttl': 300, 'model': 'market.product'},
+    'order_full:': {'ttl': 300, 'model': 'market.order'},
+    'absent:': {'ttl': 30},  # 네거티브 캐시 (존재하지 않는 id)
+    'statistics': {'ttl': 60, 'model': 'market.order'},
+    'hot_products': {'ttl': 10},
+    'response:': {'ttl': 600},  # 태그로 무효화되므로 길게 (market.response_cache)
+}
+
+DEFAULT_TTL = 300
+DEFAULT_JITTER = 0.1
+
+WRITE_RATE_WINDOW = 5       # 분 단위 - 최근 N분 평균 쓰기율
+RATE_CACHE_SECONDS = 10     # 쓰기율을 Redis에서 다시 읽는 주기
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+class TTLPolicy:
+
+    def __init__(self, policies=None, jitter=DEFAULT_JITTER):
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.jitter = jitter
+        self._rates = {}  # model -> (조회 시각, 분당 쓰기 수)
+
+        # 가장 긴 접두사부터 매칭
+        self._prefixes = sorted(self.policies, key=len, reverse=True)
+
+    def policy_for(self, key):
+        for prefix in self._prefixes:
+            if key.startswith(prefix):
+                return self.policies[prefix]
+        return {'ttl': DEFAULT_TTL}
+
+    def ttl_for(self, key, jitter=True):
+        policy = self.policy_for(key)
+        ttl = policy['ttl']
+        if ttl is None:
+            return None
+
+        model = policy.get('model')
+        if model and policy.get('adaptive', True):
+            ttl = self._adapt(ttl, model, policy)
+
+        spread = policy.get('jitter', self.jitter) if jitter else 0
+        if spread:
+            ttl = random.uniform(ttl * (1 - spread), ttl * (1 + spread))
+
+        return max(1, int(ttl))
+
+    def _adapt(self, ttl, model, policy):
+        reference_rate = policy.get('reference_rate', 10)  # 분당 쓰기
+        rate = self.write_rate(model)
+        if rate <= reference_rate:
+            return ttl
+        return max(policy.get('min_ttl', 5), ttl * reference_rate / rate)
+
+    # ------------------------------------------------------------------
+    # 쓰기율 추적 (분 단위 버킷 카운터)
+    # ------------------------------------------------------------------
+
+    def _bucket_key(self, model, minute):
+        return f'ttl_policy:writes:{model}:{minute}'
+
+    def record_write(self, model, count=1):
+        self.record_writes({model: count})
+
+    def record_writes(self, counts):
+        """모델별 쓰기 수를 파이프라인 1번으로 기록 ({model: count})"""
+        counts = {model: count for model, count in counts.items() if count}
+        if not counts:
+            return
+        minute = int(time.time() // 60)
+        try:
+            with _redis().pipeline(transaction=False) as pipe:
+                for model, count in counts.items():
+                    key = self._bucket_key(model, minute)
+                    pipe.incrby(key, count)
+                    pipe.expire(key, (WRITE_RATE_WINDOW + 1) * 60)
+                pipe.execute()
+        except NotImplementedError:
+            pass
+
+    def write_rate(self, model):
+        """최근 WRITE_RATE_WINDOW분 평균 분당 쓰기 수 (프로세스 내 캐시)"""
+        now = time.monotonic()
+        cached = self._rates.get(model)
+        if cached and now - cached[0] < RATE_CACHE_SECONDS:
+            return cached[1]
+
+        minute = int(time.time() // 60)
+        keys = [self._bucket_key(model, minute - i) for i in range(WRITE_RATE_WINDOW)]
+        try:
+            counts = _redis().mget(keys)
+        except NotImplementedError:
+            counts = []
+        rate = sum(int(c) for c in counts if c) / WRITE_RATE_WINDOW
+
+        self._rates[model] = (now, rate)
+        return rate
+
+    def tracked_models(self):
+        return {p['model'] for p in self.policies.values() if p.get('model') and p.get('adaptive', True)}
+
+
+ttl_policy = TTLPolicy(
+    policies=getattr(settings, 'CACHE_TTL_POLICIES', None),
+    jitter=getattr(settings, 'CACHE_TTL_JITTER', DEFAULT_JITTER),
+)
+
+
+def ttl_for(key, jitter=True):
+    return ttl_policy.ttl_for(key, jitter=jitter)
+
+
+def set_many_with_policy(data):
+    """
+    키마다 다른 TTL로 파이프라인 1번에 저장 (cache.set_many는 TTL이 하나뿐)
+
+    반환: {key: 적용한 TTL}
+    """
+    from django.core.cache import cache
+
+    timeouts = {key: ttl_for(key) for key in data}
+
+    if not hasattr(cache, 'client'):
+        for key, value in data.items():
+            cache.set(key, value, timeouts[key])
+        return timeouts
+
+    with cache.client.get_client(write=True).pipeline() as pipe:
+        for key, value in data.items():
+            cache.set(key, value, timeouts[key], client=pipe)
+        pipe.execute()
+    return timeouts
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from market import views
+
+
+app_name = 'market'
+
+urlpatterns = [
+    path('cache-metrics/', views.cache_metrics_view, name='cache-metrics'),
+    path('products/', views.product_list, name='product-list'),
+    path('products/<int:pk>/', views.product_detail, name='product-detail'),
+    path('orders/', views.place_order_view, name='order-create'),
+    path('orders/mine/', views.my_orders, name='my-orders'),
+    path('sales/daily/', views.sales_daily_view, name='sales-daily'),
+    path('api-logs/', views.api_logs_view, name='api-logs'),
+]
@@ -1,3 +1,192 @@
-from django.shortcuts import render
+import json
+from datetime import date, timedelta
 
-# Create your views here.
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from market.cache_metrics import collect_metrics
+from market.checkout import place_order
+from market.hot_keys import hot_keys
+from market.invalidation import product_tag, user_orders_tag
+from market.pagination import InvalidCursor, KeysetPaginator
+from market.models import APILog, Order, Product
+from market.product_cache import category_tags
+from market.request_memo import get_product
+from market.response_cache import cache_response, tag_response
+from market.sales_rollup import ALL, daily_sales, sales_totals
+from market.stock import OutOfStock
+
+
+PRODUCT_PAGE_SIZE = 20
+ORDER_PAGE_SIZE = 50
+API_LOG_PAGE_SIZE = 100
+
+
+@staff_member_required
+def cache_metrics_view(request):
+    """접두사별 캐시 통계 + 핫 키 (JSON)"""
+    metrics = collect_metrics()
+    if hot_keys.backend is not None:
+        metrics['hot_keys'] = hot_keys.report()
+    return JsonResponse(metrics)
+
+
+@staff_member_required
+def sales_daily_view(request):
+    """
+    일별 매출 (market.sales_rollup) - 기간과 무관하게 하루에 최대 1행
+    ?start=YYYY-MM-DD&end=YYYY-MM-DD&status=completed&category=books
+    """
+    try:
+        end = date.fromisoformat(request.GET['end']) if 'end' in request.GET else timezone.localdate()
+        start = date.fromisoformat(request.GET['start']) if 'start' in request.GET else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({'error': '날짜 형식은 YYYY-MM-DD 입니다.'}, status=400)
+
+    status = request.GET.get('status', ALL)
+    category = request.GET.get('category', ALL)
+    return JsonResponse({
+        'start': start,
+        'end': end,
+        'totals': sales_totals(start, end, status, category),
+        'days': daily_sales(start, end, status, category),
+    })
+
+
+def _product_list_tags(request):
+    # 구성이 바뀌는 경우(생성/삭제/카테고리 이동)에만 증가하는 태그
+    category = request.GET.get('category')
+    return category_tags(category) if category else ['products']
+
+
+@cache_response(tags=_product_list_tags, query_params=('category', 'page'))
+def product_list(request):
+    """상품 목록 - 담긴 상품 중 하나가 수정되면 이 페이지만 무효화"""
+    products = Product.objects.only('id', 'name', 'price', 'category').order_by('id')
+    category = request.GET.get('category')
+    if category:
+        products = products.filter(category=category)
+
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    offset = (page - 1) * PRODUCT_PAGE_SIZE
+    products = list(products[offset:offset + PRODUCT_PAGE_SIZE])
+
+    response = JsonResponse({
+        'page': page,
+        'products': [
+            {'id': p.id, 'name': p.name, 'price': float(p.price), 'category': p.category}
+            for p in products
+        ],
+    })
+    return tag_response(response, *(product_tag(p.id) for p in products))
+
+
+@cache_response(tags=lambda request, pk: [product_tag(pk)])
+def product_detail(request, pk):
+    # 같은 요청에서 이미 읽은 상품이면 DB 조회 없음 (market.request_memo)
+    try:
+        product = get_product(pk)
+    except Product.DoesNotExist:
+        raise Http404('상품이 없습니다.')
+    return JsonResponse({
+        'id': product.id,
+        'name': product.name,
+        'description': product.description,
+        'price': float(product.price),
+        'stock': product.stock,
+        'category': product.category,
+    })
+
+
+def _order_row(order):
+    return {
+        'id': order.id,
+        'status': order.status,
+        'total_amount': float(order.total_amount),
+        'item_count': order.item_count,  # 비정규화 컬럼 - 집계 쿼리 없음
+        'items_total': float(order.items_total),
+        'created_at': order.created_at.isoformat(),
+    }
+
+
+def _keyset_page(request, queryset, per_page):
+    """?cursor= 로 페이지 조회 - 잘못된 커서면 None"""
+    try:
+        return KeysetPaginator(queryset, per_page=per_page).page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return None
+
+
+def _invalid_cursor():
+    return JsonResponse({'error': '잘못된 커서입니다.'}, status=400)
+
+
+@login_required
+@cache_response(tags=lambda request: [user_orders_tag(request.user.pk)], query_params=('cursor',), per_user=True)
+def my_orders(request):
+    """로그인한 사용자의 주문 목록 - 사용자별 캐시, 키셋 페이지네이션 (?cursor=)"""
+    page = _keyset_page(request, Order.objects.filter(user=request.user), ORDER_PAGE_SIZE)
+    if page is None:
+        return _invalid_cursor()
+    return JsonResponse({
+        'orders': [_order_row(o) for o in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@staff_member_required
+def api_logs_view(request):
+    """
+    API 호출 로그 (최신순) - 키셋 페이지네이션이라 몇 번째 페이지든 같은 비용
+    ?cursor=...&endpoint=/api/...
+    """
+    logs = APILog.objects.all()
+    endpoint = request.GET.get('endpoint')
+    if endpoint:
+        logs = logs.filter(endpoint=endpoint)
+
+    page = _keyset_page(request, logs, API_LOG_PAGE_SIZE)
+    if page is None:
+        return _invalid_cursor()
+    return JsonResponse({
+        'logs': [
+            {
+                'id': log.id,
+                'endpoint': log.endpoint,
+                'method': log.method,
+                'status_code': log.status_code,
+                'response_time': log.response_time,
+                'created_at': log.created_at.isoformat(),
+            }
+            for log in page
+        ],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@login_required
+@require_POST
+def place_order_view(request):
+    """
+    장바구니 일괄 주문 (market.checkout) - 장바구니 크기와 무관하게 쿼리 수 일정
+    POST {"items": [{"product_id": 1, "quantity": 2}, ...]}
+    """
+    try:
+        lines = json.loads(request.body)['items']
+        order = place_order(request.user, [(line['product_id'], line['quantity']) for line in lines])
+    except Product.DoesNotExist as e:
+        return JsonResponse({'error': str(e)}, status=404)
+    except OutOfStock as e:
+        return JsonResponse({'error': '재고가 부족합니다.', 'product_ids': e.product_ids}, status=409)
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'error': f'잘못된 요청입니다: {e}'}, status=400)
+
+    return JsonResponse(_order_row(order), status=201)